@@ -1,16 +1,25 @@
 from flask import Flask, render_template, Response, jsonify, send_from_directory, request
 import cv2
-import mediapipe as mp
 import numpy as np
-import pandas as pd
-import joblib
 import time
-from sklearn.neighbors import KNeighborsClassifier
-from mediapipe.tasks import python
-from mediapipe.tasks.python import vision
-from mediapipe.tasks.python import vision
+import threading
+import queue
 import os
-import pyttsx3
+import itertools
+from pipeline import FramePipeline, IdleThrottle
+from encoder import (FrameEncoder, LandmarkEncoder, JPEG_QUALITY, STREAM_SCALE,
+                     STREAM_MAX_FPS, STREAM_ADAPTIVE, LANDMARK_MAX_FPS)
+from features import NUM_FEATURES, landmarks_to_array, pack_landmarks, predict_best, predict_best_proba
+from classifier_engine import DEFAULT_BACKEND, load_engine
+import translation
+from phrase_index import PhraseIndex
+import events
+import metrics
+from metrics import (STAGE_SECONDS, PARSE_SENTENCE_SECONDS, FRAMES_PROCESSED, HANDS_DETECTED,
+                     LETTERS_COMMITTED, WORDS_COMPLETED, PREDICTION_CACHE, PREDICTION_CACHE_SAVED_SECONDS)
+import tts
+from recognition import (RecognitionSession, DetectionInput, LandmarkerPool, LiveStreamDetector, create_landmarker,
+                         draw_hand, draw_overlays, overlay_state, to_mp_image)
 
 basedir = os.path.abspath(os.path.dirname(__file__))
 app = Flask(__name__, 
@@ -20,19 +29,46 @@ app = Flask(__name__,
 
 # --- Global Variables for Prediction ---
 model = None
-scaler = None
-current_prediction = ""
-landmarker = None
+landmarker = None   # webcam HandLandmarker (VIDEO mode) or LiveStreamDetector
+landmarker_pool = None
 
-# Sentence Building Globals
-stored_sentence = ""
-last_valid_prediction = None
-stability_start_time = 0.0
-is_sentence_appended = False
+# Webcam landmarker mode: 'video' detects each frame synchronously in the
+# process stage; 'live_stream' runs detect_async at MediaPipe's own rate
+# while frames stream at camera rate (frames it cannot keep up with are
+# dropped) and classifies in its result callback
+LANDMARKER_MODE = os.environ.get('SIGNBRIDGE_LANDMARKER_MODE', 'video').lower()
+live_result = ([], np.empty((0, NUM_FEATURES), dtype=np.float32), None)   # newest (hands, features, prediction)
+
+# Sentence Building State for the server webcam (/video_feed)
+camera_session = RecognitionSession()
+
+# Browser Ingestion Sessions (/ingest/<session_id>), one per signer
+ingest_sessions = {}
+ingest_sessions_lock = threading.Lock()
+INGEST_SESSION_TTL = 120.0   # seconds without frames before a session is dropped
+INGEST_MAX_SESSIONS = int(os.environ.get('SIGNBRIDGE_INGEST_MAX_SESSIONS', 100))
+INGEST_WORKERS = int(os.environ.get('SIGNBRIDGE_INGEST_WORKERS', 2))
+
+# ISL video vocabulary (trie rebuilt when the isl/ folder changes)
+phrase_index = PhraseIndex(os.path.join(basedir, 'isl'))
+phrase_index.refresh()
+
+# Server-Sent Events: prediction and history changes pushed to /events
+event_hub = events.EventHub()
+
+def publish_session(session):
+    """Push a session's word/sentence to its subscribers (no-op if unchanged)."""
+    if session.channel:
+        event_hub.publish(session.channel, 'prediction', session.snapshot())
+
+publish_session(camera_session)
 
 # Conversation History (stores last 10 completed sentences)
 conversation_history = []
 
+def publish_history():
+    event_hub.publish('history', 'history', {'history': list(reversed(conversation_history))})
+
 def add_to_history(sentence):
     """Add a sentence to history, keeping only the last 10 entries."""
     global conversation_history
@@ -41,57 +77,163 @@ def add_to_history(sentence):
         conversation_history.append(sentence)
         if len(conversation_history) > 10:
             conversation_history = conversation_history[-10:]
+        publish_history()
 
-# TTS and Debug Globals
-engine = None
-try:
-    engine = pyttsx3.init()
-except Exception as e:
-    print(f"Warning: Could not initialize TTS engine: {e}")
+publish_history()
 
-feedback_duration = 1.0
+# Text-to-Speech: synthesized off the frame loop, cached as WAV, played by the browser
+TTS_CACHE_DIR = os.environ.get('SIGNBRIDGE_TTS_CACHE_DIR', os.path.join(basedir, 'tts_cache'))
+speech = tts.SpeechWorker(tts.SpeechCache(TTS_CACHE_DIR))
+speech_ids = itertools.count(1)
+
+def speak_for_session(session):
+    """Queue the session's sentence for speech; the audio URL is pushed as a 'speech' event."""
+    if not session.channel:
+        return
+    channel = session.channel
+
+    def on_ready(text, filename):
+        event_hub.publish(channel, 'speech', {'id': next(speech_ids), 'text': text, 'url': f'/tts/{filename}'},
+                          remember=False)
+
+    speech.speak(session.sentence, on_ready)
+
+# Frame Pipeline Settings (queue depth per stage; 1 = always newest frame)
+PIPELINE_QUEUE_SIZE = int(os.environ.get('SIGNBRIDGE_PIPELINE_QUEUE_SIZE', 1))
+active_pipelines = {}   # FramePipeline -> its FrameEncoder / LandmarkEncoder
+
+# Idle power mode for the webcam: after IDLE_AFTER seconds without a hand (0 = never),
+# detect IDLE_PROBE_FPS frames a second (> 0) and stream IDLE_STREAM_FPS
+# (0 = only the probe frames)
+IDLE_AFTER = float(os.environ.get('SIGNBRIDGE_IDLE_AFTER', 5.0))
+IDLE_PROBE_FPS = float(os.environ.get('SIGNBRIDGE_IDLE_PROBE_FPS', 4.0))
+IDLE_STREAM_FPS = float(os.environ.get('SIGNBRIDGE_IDLE_STREAM_FPS', 5.0))
+finished_pipeline_drops = 0   # frames dropped by streams that have ended
+
+# Classifier engine backend: auto, sklearn, kdtree, balltree, linear or mlp
+ENGINE_BACKEND = DEFAULT_BACKEND
+
+# Warm-up: 1 = load the model and landmarkers on a background thread at
+# startup, 0 = on the first request that needs them. Pages are served
+# right away either way; /readyz says when recognition is hot.
+WARMUP_AT_STARTUP = os.environ.get('SIGNBRIDGE_WARMUP', '1') != '0'
+WARMUP_WAIT = 30.0   # seconds a recognition request waits for the warm-up
+process_started_at = time.time()
+resources_ready = threading.Event()
+warmup_finished = threading.Event()   # set after success or failure
+warmup_lock = threading.Lock()
+warmup_state = {'status': 'not_started', 'step': None, 'error': None, 'seconds': None, 'steps_ms': {}}
 
 # --- Initialization ---
 def load_resources():
-    global model, landmarker
+    """Load the model and landmarkers, then run one dummy frame through them."""
+    global model, landmarker, landmarker_pool
+    steps = warmup_state['steps_ms']
+
+    def step(name, fn):
+        warmup_state['step'] = name
+        start = time.perf_counter()
+        result = fn()
+        steps[name] = round((time.perf_counter() - start) * 1000, 1)
+        return result
+
     print("Loading model...")
-    try:
-        model = joblib.load(os.path.join(basedir, 'isl_model.pkl'))
-        print("Model loaded.")
-    except Exception as e:
-        print(f"Error loading model: {e}")
-        return
+    # Normalization and scaling are part of the engine, self-checked on load
+    engine = step('model', lambda: load_engine(basedir, ENGINE_BACKEND))
+    print(f"Model loaded ({engine.backend} engine, {engine.normalization} normalization).")
 
     # Initialize MediaPipe Hands
-    BaseOptions = mp.tasks.BaseOptions
-    HandLandmarker = mp.tasks.vision.HandLandmarker
-    HandLandmarkerOptions = mp.tasks.vision.HandLandmarkerOptions
-    VisionRunningMode = mp.tasks.vision.RunningMode
-
-    options = HandLandmarkerOptions(
-        base_options=BaseOptions(model_asset_path=os.path.join(basedir, 'hand_landmarker.task')),
-        running_mode=VisionRunningMode.VIDEO,
-        num_hands=2
-    )
-    
+    landmarker_path = os.path.join(basedir, 'hand_landmarker.task')
+
     # Create the landmarker (we'll keep it open)
-    landmarker = HandLandmarker.create_from_options(options)
+    if LANDMARKER_MODE == 'live_stream':
+        video_landmarker = step('landmarker', lambda: LiveStreamDetector(landmarker_path, on_live_result, num_hands=2))
+    else:
+        video_landmarker = step('landmarker', lambda: create_landmarker(landmarker_path, 'VIDEO', num_hands=2))
+    # IMAGE-mode landmarkers for browser ingestion are created on demand
+    pool = LandmarkerPool(landmarker_path, size=INGEST_WORKERS, num_hands=2)
     print("MediaPipe Landmarker initialized.")
 
-load_resources()
+    # First calls allocate buffers and (for trees) touch the index; pay that
+    # here rather than on a signer's first frame. Timestamp 0 keeps the real
+    # camera timestamps (wall-clock ms) strictly increasing after it.
+    blank = np.zeros((240, 320, 3), dtype=np.uint8)
+    if LANDMARKER_MODE == 'live_stream':
+        step('dummy_detect', lambda: (video_landmarker.submit(blank, 0), video_landmarker.wait(10)))
+    else:
+        step('dummy_detect', lambda: video_landmarker.detect_for_video(to_mp_image(blank), 0))
+    step('dummy_ingest_detect', lambda: pool.detect(blank))
+    step('dummy_inference', lambda: predict_best(engine, np.zeros((1, NUM_FEATURES), dtype=np.float32)))
+
+    model, landmarker, landmarker_pool = engine, video_landmarker, pool
+
+def warm_up():
+    start = time.perf_counter()
+    try:
+        load_resources()
+    except Exception as e:
+        warmup_state.update(status='failed', error=str(e))
+        print(f"Error loading model: {e}")
+        warmup_finished.set()
+        return
+    warmup_state.update(status='ready', step=None, seconds=round(time.perf_counter() - start, 3))
+    resources_ready.set()
+    warmup_finished.set()
+    print(f"Recognition ready after {warmup_state['seconds']} s "
+          f"({time.time() - process_started_at:.2f} s since startup).")
+
+def start_warmup():
+    """Start the background warm-up once; later calls are no-ops."""
+    with warmup_lock:
+        if warmup_state['status'] != 'not_started':
+            return
+        warmup_state['status'] = 'loading'
+    threading.Thread(target=warm_up, name='warmup', daemon=True).start()
+
+def wait_until_ready(timeout=WARMUP_WAIT):
+    """Start the warm-up if needed and wait for it; True once recognition is hot."""
+    start_warmup()
+    warmup_finished.wait(timeout)
+    return resources_ready.is_set()
+
+if WARMUP_AT_STARTUP:
+    start_warmup()
+
+def classify_hands(features, cache=None):
+    """Return (best_prediction, max_confidence, probability row) for an (n_hands, 63) feature array.
+
+    With a session's PredictionCache, a near-identical repeat of the last
+    classified landmarks reuses its result instead of running the model.
+    """
+    if not model:
+        return None, -1.0, None
+    try:
+        with STAGE_SECONDS.labels('classify').time():
+            if cache is None:
+                return predict_best_proba(model, features)
+            result = cache.predict(model, features)
+        if cache.last_hit:
+            PREDICTION_CACHE.labels('hit').inc()
+            PREDICTION_CACHE_SAVED_SECONDS.inc(cache.mean_inference_seconds())
+        elif len(features):
+            PREDICTION_CACHE.labels('miss').inc()
+        return result
+    except Exception as e:
+        print(f"Prediction Error: {e}")
+        return None, -1.0, None
+
+def run_camera(process, encoder):
+    """Run the webcam through process -> encoder.encode and yield the encoded outputs."""
+    global finished_pipeline_drops, live_result
+    if not wait_until_ready():
+        print(f"Camera stream not started: recognition is not ready ({warmup_state['status']}).")
+        return
 
-def generate_frames():
-    global current_prediction, stored_sentence, scaler
-    
     # Local Session State (Resets on page refresh/new connection)
-    last_valid_prediction = None
-    stability_start_time = 0.0
-    is_sentence_appended = False
-    last_detected_time = time.time()
-    space_added = False
-    has_new_char = False
-    feedback_start_time = 0
-    feedback_duration = 1.0
+    camera_session.reset_tracking()
+    live_result = ([], np.empty((0, NUM_FEATURES), dtype=np.float32), None)
+    # Before the camera opens, so a bad SIGNBRIDGE_IDLE_* setting leaves it closed
+    throttle = IdleThrottle(lambda: camera_session.last_detected_time, IDLE_AFTER, IDLE_PROBE_FPS, IDLE_STREAM_FPS)
 
     cap = cv2.VideoCapture(0)
     
@@ -99,177 +241,160 @@ def generate_frames():
         print("Error: Could not open webcam.")
         return
 
-    while True:
-        success, frame = cap.read()
-        if not success:
-            break
+    # Capture, detection/classification and encoding each run on their own
+    # thread, so FPS is set by the slowest stage rather than by their sum.
+    pipeline = FramePipeline(
+        read_frame=cap.read,
+        process_frame=process,
+        encode_frame=lambda item: timed_encode(encoder, item),
+        queue_size=PIPELINE_QUEUE_SIZE,
+        throttle=throttle,
+        grab_frame=cap.grab
+    )
+    # Drops on the output queue tell the encoder the viewer is falling behind
+    encoder.watch(pipeline.queues['output'])
+    pipeline.start()
+    active_pipelines[pipeline] = encoder
 
-        # Flip and convert
-        frame = cv2.flip(frame, 1)
-        rgb_frame = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-        mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=rgb_frame)
+    try:
+        yield from pipeline.outputs()
+    finally:
+        active_pipelines.pop(pipeline, None)
+        finished_pipeline_drops += sum(q.dropped for q in pipeline.queues.values())
+        pipeline.stop()
+        pipeline.join()
+        cap.release()
+
+def timed_encode(encoder, item):
+    with STAGE_SECONDS.labels('encode').time():
+        return encoder.encode(*item)
+
+def generate_frames(encoder):
+    for frame_bytes in run_camera(process_frame, encoder):
+        yield (b'--frame\r\n'
+               b'Content-Type: image/jpeg\r\n\r\n' + frame_bytes + b'\r\n')
 
-        # Detect
-        timestamp_ms = int(time.time() * 1000)
-        detection_result = landmarker.detect_for_video(mp_image, timestamp_ms)
-
-        # Process result
-        best_prediction = None
-        max_confidence = -1.0
-
-        if detection_result.hand_landmarks:
-            # Hand detected
-            for hand_landmarks in detection_result.hand_landmarks:
-                # Extract features
-                features = []
-                for landmark in hand_landmarks:
-                    features.extend([landmark.x, landmark.y, landmark.z])
-                
-                # Predict probabilities
-                if model:
-                    try:
-                        # Normalize if scaler exists
-                        if scaler:
-                            features_scaled = scaler.transform([features])
-                            proba = model.predict_proba(features_scaled)[0]
-                        else:
-                            proba = model.predict_proba([features])[0]
-                            
-                        confidence = np.max(proba)
-                        predicted_idx = np.argmax(proba)
-                        prediction = model.classes_[predicted_idx]
-                        
-                        # Keep the one with highest confidence
-                        if confidence > max_confidence:
-                            max_confidence = confidence
-                            best_prediction = prediction
-                    except Exception as e:
-                        print(f"Prediction Error: {e}")
-                
-                # Draw landmarks (Red dots)
-                for landmark in hand_landmarks:
-                    h, w, _ = frame.shape
-                    cx, cy = int(landmark.x * w), int(landmark.y * h)
-                    cv2.circle(frame, (cx, cy), 5, (0, 0, 255), -1)
-
-                # Manually define hand connections (bones)
-                HAND_CONNECTIONS = [
-                    (0, 1), (1, 2), (2, 3), (3, 4),   # Thumb
-                    (0, 5), (5, 6), (6, 7), (7, 8),   # Index
-                    (0, 9), (9, 10), (10, 11), (11, 12), # Middle
-                    (0, 13), (13, 14), (14, 15), (15, 16), # Ring
-                    (0, 17), (17, 18), (18, 19), (19, 20)  # Pinky
-                ]
-
-                # Draw connections using OpenCV
-                for connection in HAND_CONNECTIONS:
-                    start_idx = connection[0]
-                    end_idx = connection[1]
-                    
-                    start_point = hand_landmarks[start_idx]
-                    end_point = hand_landmarks[end_idx]
-                    
-                    # Convert normalized coordinates to pixel coordinates
-                    h, w, _ = frame.shape
-                    start_x, start_y = int(start_point.x * w), int(start_point.y * h)
-                    end_x, end_y = int(end_point.x * w), int(end_point.y * h)
-                    
-                    # Draw green line with thickness 2
-                    cv2.line(frame, (start_x, start_y), (end_x, end_y), (0, 255, 0), 2)
-            
-            # --- Hand Detected Update ---
-            last_detected_time = time.time()
-            space_added = False
-            
-            # Update prediction state
-            if best_prediction:
-                current_prediction = best_prediction
-                
-                # Dwell Time Logic
-                if best_prediction == last_valid_prediction:
-                    # Same prediction as before, check duration
-                    duration = time.time() - stability_start_time
-                    if duration > 1 and not is_sentence_appended:
-                        stored_sentence += best_prediction
-                        print(f"Sentence updated: {stored_sentence}")
-                        is_sentence_appended = True
-                        has_new_char = True # Enable space addition
-                else:
-                    # New prediction, reset timer
-                    last_valid_prediction = best_prediction
-                    stability_start_time = time.time()
-                    is_sentence_appended = False
-                
-                # Display
-                display_text = f"Prediction: {best_prediction}"
-                cv2.putText(frame, display_text, (50, 50), 
-                            cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2, cv2.LINE_AA)
-        
-        else:
-            # No hand detected
-            last_valid_prediction = None
-            is_sentence_appended = False
-            current_prediction = "" # Clear display if no hand
-            
-            # Timeout Logic for Space/TTS
-            if (time.time() - last_detected_time > 2.0) and not space_added and has_new_char:
-                # Add completed word/sentence to history before adding space
-                add_to_history(stored_sentence)
-                stored_sentence += " "
-                space_added = True
-                has_new_char = False # Reset flag so we don't add multiple spaces
-                
-                # Trigger feedback
-                feedback_start_time = time.time()
-                
-                if engine:
-                    print(f"Speaking: {stored_sentence}")
-                    try:
-                        engine.say(stored_sentence)
-                        engine.runAndWait()
-                    except Exception as e:
-                        print(f"TTS Error: {e}")
+detection_inputs = threading.local()
 
-        # --- Overlays ---
-        # Debug Status
-        time_diff = time.time() - last_detected_time
-        if detection_result.hand_landmarks:
-            status_text = "Status: Hand Detected"
-            status_color = (0, 255, 0) # Green
-        else:
-            status_text = f"Status: No Hand ({time_diff:.1f}s)"
-            status_color = (0, 0, 255) # Red
-            
-        cv2.putText(frame, status_text, (10, 30), 
-                   cv2.FONT_HERSHEY_SIMPLEX, 0.7, status_color, 2, cv2.LINE_AA)
-
-        # Feedback Overlay "SPACE ADDED"
-        if time.time() - feedback_start_time < feedback_duration:
-            text = "SPACE ADDED"
-            font = cv2.FONT_HERSHEY_SIMPLEX
-            font_scale = 2
-            thickness = 3
-            text_size = cv2.getTextSize(text, font, font_scale, thickness)[0]
-            text_x = (frame.shape[1] - text_size[0]) // 2
-            text_y = (frame.shape[0] + text_size[1]) // 2
-            
-            cv2.putText(frame, text, (text_x, text_y), 
-                       font, font_scale, (0, 255, 255), thickness, cv2.LINE_AA)
+def detection_input():
+    """This thread's DetectionInput; each stream's process stage reuses its own buffers."""
+    prepared = getattr(detection_inputs, 'value', None)
+    if prepared is None:
+        prepared = detection_inputs.value = DetectionInput()
+    return prepared
 
-        # Encode frame
-        ret, buffer = cv2.imencode('.jpg', frame)
-        frame_bytes = buffer.tobytes()
-        yield (b'--frame\r\n'
-               b'Content-Type: image/jpeg\r\n\r\n' + frame_bytes + b'\r\n')
+def recognize_frame(frame, timestamp_ms, detect=True):
+    """Flip, detect and classify one camera frame and advance the webcam session.
+
+    With detect=False (idle mode between probes) the frame is only
+    flipped and counts as a frame without a hand.
+    Returns (flipped_frame, hand_landmarks, features, best_prediction).
+    """
+    if LANDMARKER_MODE == 'live_stream':
+        return recognize_frame_async(frame, timestamp_ms, detect)
+
+    hand_landmarks_list = []
+    if detect:
+        # Flip in place; convert (and downscale) into reused buffers
+        mp_image = to_mp_image(detection_input().prepare(frame))
+
+        # Detect
+        with STAGE_SECONDS.labels('detect').time():
+            detection_result = landmarker.detect_for_video(mp_image, timestamp_ms)
+        hand_landmarks_list = detection_result.hand_landmarks
+        FRAMES_PROCESSED.labels('camera').inc()
+    else:
+        cv2.flip(frame, 1, dst=frame)
+    features, best_prediction = handle_camera_hands(hand_landmarks_list)
+    return frame, hand_landmarks_list, features, best_prediction
+
+def handle_camera_hands(hand_landmarks_list):
+    """Classify the webcam's detected hands and advance its session; returns (features, best_prediction)."""
+    # Process result (one batched prediction for all hands)
+    features = landmarks_to_array(hand_landmarks_list)
+    HANDS_DETECTED.inc(len(features))
+    best_prediction, _, proba = classify_hands(features, camera_session.prediction_cache)
+
+    completed = advance_session(camera_session, best_prediction, bool(hand_landmarks_list), proba)
+    if completed is not None:
+        # Never blocks: synthesis runs on the TTS worker thread
+        speak_for_session(camera_session)
+    return features, best_prediction
+
+def recognize_frame_async(frame, timestamp_ms, detect=True):
+    """LIVE_STREAM counterpart of recognize_frame: never waits for detection.
+
+    The frame goes to the landmarker only if it is free (otherwise it is
+    dropped for detection but still streamed). The landmarks and
+    prediction returned are the newest ones the callback produced.
+    """
+    if detect and landmarker.accepting():
+        landmarker.submit(detection_input().prepare(frame), timestamp_ms)
+    else:
+        cv2.flip(frame, 1, dst=frame)
+    hand_landmarks_list, features, best_prediction = live_result
+    return frame, hand_landmarks_list, features, best_prediction
+
+def on_live_result(result, timestamp_ms, latency_s):
+    """LiveStreamDetector callback (MediaPipe's thread): classify and advance the webcam session."""
+    global live_result
+    STAGE_SECONDS.labels('detect').observe(latency_s)
+    FRAMES_PROCESSED.labels('camera').inc()
+    features, best_prediction = handle_camera_hands(result.hand_landmarks)
+    live_result = (result.hand_landmarks, features, best_prediction)
+
+def advance_session(session, best_prediction, hand_detected, proba=None):
+    """Feed one frame's result to a session, then record history, metrics and push updates.
+
+    Returns the completed text, or None.
+    """
+    sentence_length = len(session.sentence)
+    completed = session.update(best_prediction, hand_detected, proba=proba,
+                               classes=model.classes_ if model else None)
+    if completed is not None:
+        WORDS_COMPLETED.inc()
+        # Add completed word/sentence to history before adding space
+        add_to_history(completed)
+    elif len(session.sentence) > sentence_length:
+        LETTERS_COMMITTED.inc()
+    publish_session(session)
+    return completed
+
+def process_frame(frame, timestamp_ms, detect=True):
+    """Detect, classify and annotate one camera frame (pipeline 'process' stage).
+
+    Returns (frame, overlay_state) for the encoder.
+    """
+    frame, hand_landmarks_list, _, best_prediction = recognize_frame(frame, timestamp_ms, detect)
+
+    with STAGE_SECONDS.labels('draw').time():
+        for hand_landmarks in hand_landmarks_list:
+            draw_hand(frame, hand_landmarks)
 
-    cap.release()
+        # --- Overlays ---
+        overlay = draw_overlays(frame, camera_session, bool(hand_landmarks_list), best_prediction)
+    return frame, overlay
+
+def process_landmarks(frame, timestamp_ms, detect=True):
+    """Detect and classify one camera frame without drawing (/landmark_feed 'process' stage).
+
+    Returns a one-element tuple holding the payload for LandmarkEncoder.
+    """
+    _, hand_landmarks_list, features, best_prediction = recognize_frame(frame, timestamp_ms, detect)
+    prediction, no_hand_s, feedback = overlay_state(camera_session, bool(hand_landmarks_list), best_prediction)
+    return ({
+        'hands': pack_landmarks(features),
+        'prediction': prediction,
+        'no_hand_s': no_hand_s,
+        'feedback': feedback
+    },)
 
 # ===== PAGE ROUTES =====
-import requests
 
 @app.route('/translate_to_english', methods=['POST'])
 def translate_to_english():
     """Translate text from any language to English (for ISL gesture display)."""
+    text = ''
     try:
         data = request.get_json()
         print(f"DEBUG: /translate_to_english called with data: {data}")
@@ -286,51 +411,27 @@ def translate_to_english():
             print("DEBUG: Text is already English, skipping translation")
             return jsonify({'translated_text': text})
             
-        # Google Translate API to translate to English
-        url = "https://translate.googleapis.com/translate_a/single"
-        params = {
-            'client': 'gtx',
-            'sl': source_lang,  # Source language (auto-detect or specified)
-            'tl': 'en',  # Target language is always English
-            'dt': 't',
-            'q': text
-        }
-        
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-        
+        # Target language is always English (cached, see translation.py)
         print(f"Translating '{text}' to English...")
-        response = requests.get(url, params=params, headers=headers, timeout=5)
+        translated_text, detected_source = translation.translate(text, source_lang, 'en')
         
-        print(f"DEBUG: Translation API URL: {response.url}")
-        
-        if response.status_code == 200:
-            result = response.json()
-            print(f"DEBUG: API Raw Result: {result}")
-            
-            if result and isinstance(result, list) and len(result) > 0:
-                translated_text = ""
-                for sentence in result[0]:
-                    if sentence and isinstance(sentence, list) and len(sentence) > 0:
-                        translated_text += sentence[0]
-                
-                print(f"DEBUG: Translated to English: {translated_text}")
-                return jsonify({
-                    'translated_text': translated_text,
-                    'original_text': text,
-                    'detected_source': result[2] if len(result) > 2 else source_lang
-                })
-        
-        print(f"DEBUG: Translation API Request Failed {response.status_code}: {response.text}")
-        return jsonify({'translated_text': text, 'error': 'Translation failed, using original'})
-
+        print(f"DEBUG: Translated to English: {translated_text}")
+        return jsonify({
+            'translated_text': translated_text,
+            'original_text': text,
+            'detected_source': detected_source or source_lang
+        })
+
+    except translation.TranslationError as e:
+        print(f"DEBUG: Translation API Request Failed: {e}")
+        return jsonify({'translated_text': text, 'fallback': True, 'error': 'Translation failed, using original'})
     except Exception as e:
         print(f"Translation to English Error: {e}")
         return jsonify({'translated_text': text, 'error': str(e)})
 
 @app.route('/translate', methods=['POST'])
 def translate_text():
+    text = ''
     try:
         data = request.get_json()
         print(f"DEBUG: /translate called with data: {data}")
@@ -342,56 +443,58 @@ def translate_text():
             print("DEBUG: Text is empty")
             return jsonify({'translated_text': ''})
             
-        # Official Google Translate API (Single)
-        # dt=t means "translate"
-        # sl=auto means "source language auto-detect"
-        # tl=target_lang means "target language"
-        # q=text means "query text"
-        url = "https://translate.googleapis.com/translate_a/single"
-        params = {
-            'client': 'gtx',
-            'sl': 'en',  # Enforce English source since ISL model outputs English
-            'tl': target_lang,
-            'dt': 't',
-            'q': text
-        }
-        
-        # Add User-Agent to avoid being blocked/throttled by Google
-        headers = {
-            'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
-        }
-        
+        # Enforce English source since ISL model outputs English
         print(f"Translating '{text}' to '{target_lang}'...")
-        response = requests.get(url, params=params, headers=headers, timeout=5)
-        
-        print(f"DEBUG: Translating '{text}' to '{target_lang}' used URL: {response.url}")
+        translated_text, detected_source = translation.translate(text, 'en', target_lang)
         
-        if response.status_code == 200:
-            # Response format: [[["translated_text", "source_text", null, null, 1]], ...]
-            result = response.json()
-            print(f"DEBUG: API Raw Result: {result}")
-            
-            if result and isinstance(result, list) and len(result) > 0:
-                translated_text = ""
-                # Sometimes it splits into multiple sentences
-                for sentence in result[0]:
-                    if sentence and isinstance(sentence, list) and len(sentence) > 0:
-                        translated_text += sentence[0]
-                
-                print(f"DEBUG: Final Translated Text: {translated_text}")
-                return jsonify({
-                    'translated_text': translated_text,
-                    'src': result[2] if len(result) > 2 else 'auto',
-                    'dest': target_lang
-                })
-        
-        print(f"DEBUG: API Request Failed {response.status_code}: {response.text}")
-        return jsonify({'error': 'Translation failed'}), 500
-
+        print(f"DEBUG: Final Translated Text: {translated_text}")
+        return jsonify({
+            'translated_text': translated_text,
+            'src': detected_source or 'auto',
+            'dest': target_lang
+        })
+
+    except translation.TranslationError as e:
+        # Slow or failing provider: fall back to the original text
+        print(f"DEBUG: API Request Failed: {e}")
+        return jsonify({
+            'translated_text': text,
+            'src': 'en',
+            'dest': 'en',
+            'fallback': True,
+            'error': 'Translation unavailable, showing original text'
+        })
     except Exception as e:
         print(f"Translation Error: {e}")
         return jsonify({'error': str(e)}), 500
 
+@app.route('/translate_batch', methods=['POST'])
+def translate_batch():
+    """Translate a list of strings in order: {"texts": [...], "lang": "hi", "source_lang": "en"}."""
+    data = request.get_json(silent=True) or {}
+    texts = data.get('texts')
+    if not isinstance(texts, list):
+        return jsonify({'error': "'texts' must be a list of strings"}), 400
+
+    texts = [str(text).strip() for text in texts]
+    target_lang = data.get('lang', 'en')
+    source_lang = data.get('source_lang', 'en')
+
+    print(f"Translating {len(texts)} strings to '{target_lang}'...")
+    results = translation.translate_batch(texts, source_lang, target_lang)
+    return jsonify({
+        'translations': [
+            {'text': text, 'translated_text': translated, 'fallback': not ok}
+            for text, (translated, ok) in zip(texts, results)
+        ],
+        'dest': target_lang
+    })
+
+@app.route('/translation_stats')
+def translation_stats():
+    """Return translation cache hit/miss counters."""
+    return jsonify(translation.cache.get_stats())
+
 @app.route('/')
 def index():
     return render_template('index.html')
@@ -410,20 +513,12 @@ def tutorial():
     alphabet = [chr(i) for i in range(ord('A'), ord('Z') + 1)]
     
     # List of ISL videos
-    videos = []
-    isl_folder = os.path.join(basedir, 'isl')
-    video_extensions = ('.mp4', '.avi')
-    
-    if os.path.exists(isl_folder):
-        for f in sorted(os.listdir(isl_folder)):
-            if f.lower().endswith(video_extensions):
-                name_without_ext = os.path.splitext(f)[0]
-                # Capitalize for display (e.g., "hello" -> "Hello")
-                display_name = name_without_ext.capitalize()
-                videos.append({
-                    'filename': f,
-                    'label': display_name
-                })
+    phrase_index.refresh()
+    videos = [{
+        'filename': f,
+        # Capitalize for display (e.g., "hello" -> "Hello")
+        'label': os.path.splitext(f)[0].capitalize()
+    } for f in phrase_index.videos]
     
     return render_template('tutorial.html', alphabet=alphabet, videos=videos)
 
@@ -435,27 +530,196 @@ def isl_keyboard():
 
 @app.route('/video_feed')
 def video_feed():
-    return Response(generate_frames(), mimetype='multipart/x-mixed-replace; boundary=frame')
+    """MJPEG stream; ?quality=, ?scale=, ?fps= and ?adaptive=0 override the encoder defaults."""
+    encoder = FrameEncoder(
+        quality=request.args.get('quality', JPEG_QUALITY, type=int),
+        scale=request.args.get('scale', STREAM_SCALE, type=float),
+        max_fps=request.args.get('fps', STREAM_MAX_FPS, type=float),
+        adaptive=request.args.get('adaptive', '1' if STREAM_ADAPTIVE else '0') != '0'
+    )
+    return Response(generate_frames(encoder), mimetype='multipart/x-mixed-replace; boundary=frame')
+
+metrics.Gauge('signbridge_video_streams_active', 'Open /video_feed and /landmark_feed streams.',
+              lambda: len(active_pipelines))
+metrics.Gauge('signbridge_frames_dropped_total', 'Frames dropped between pipeline stages (stale frames skipped).',
+              lambda: finished_pipeline_drops + sum(q.dropped for p in list(active_pipelines)
+                                                    for q in p.queues.values()),
+              kind='counter')
+metrics.Gauge('signbridge_live_frames_dropped_total',
+              'Webcam frames not detected because the LIVE_STREAM landmarker was still busy.',
+              lambda: landmarker.dropped if LANDMARKER_MODE == 'live_stream' and landmarker else 0,
+              kind='counter')
+metrics.Gauge('signbridge_video_streams_idle', 'Webcam streams currently in idle power mode.',
+              lambda: sum(1 for p in list(active_pipelines) if p.throttle and p.throttle.idle))
+metrics.Gauge('signbridge_ingest_sessions_active', 'Browser ingestion sessions currently tracked.',
+              lambda: len(ingest_sessions))
+metrics.Gauge('signbridge_event_subscribers', 'Open /events Server-Sent Events connections.',
+              lambda: event_hub.get_stats()['subscribers'])
+
+metrics.Gauge('signbridge_ready', '1 once the model and landmarkers are loaded and warmed up.',
+              lambda: int(resources_ready.is_set()))
+
+@app.route('/healthz')
+def healthz():
+    """Liveness: the process is up and serving pages (recognition may still be loading)."""
+    return jsonify({'status': 'ok', 'uptime_s': round(time.time() - process_started_at, 1)})
+
+@app.route('/readyz')
+def readyz():
+    """Readiness: 200 once recognition is warmed up, 503 while loading or after a failed load."""
+    body = dict(warmup_state, ready=resources_ready.is_set(), steps_ms=dict(warmup_state['steps_ms']))
+    return jsonify(body), 200 if body['ready'] else 503
+
+@app.route('/metrics')
+def metrics_endpoint():
+    """Prometheus text-format metrics: stage latency histograms and frame/letter counters."""
+    return Response(metrics.render(), mimetype='text/plain; version=0.0.4')
+
+@app.route('/landmark_feed')
+def landmark_feed():
+    """Server-Sent Events of webcam hand landmarks and overlay state, for a browser-drawn preview."""
+    encoder = LandmarkEncoder(max_fps=request.args.get('fps', LANDMARK_MAX_FPS, type=float))
+    return Response(run_camera(process_landmarks, encoder), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+@app.route('/pipeline_stats')
+def pipeline_stats():
+    """Return queue depths, drop counts, FPS and encoder stats for every active video stream."""
+    return jsonify({'pipelines': [
+        dict(p.stats(), encoder=e.stats()) for p, e in list(active_pipelines.items())
+    ], 'prediction_cache': camera_session.prediction_cache.stats(),
+       'live_stream': landmarker.stats() if LANDMARKER_MODE == 'live_stream' and landmarker else None})
+
+@app.route('/events')
+def event_stream():
+    """Server-Sent Events: 'prediction' for the webcam (or ?session=) and 'history' changes.
+
+    ?topics=history limits the stream to history updates.
+    """
+    topics = request.args.get('topics', 'prediction,history').split(',')
+    session_id = request.args.get('session')
+    channels = []
+    if 'prediction' in topics:
+        channels.append(ingest_channel(session_id) if session_id else camera_session.channel)
+    if 'history' in topics:
+        channels.append('history')
+
+    subscription = event_hub.subscribe(channels)
+    return Response(events.stream(event_hub, subscription), mimetype='text/event-stream',
+                    headers={'Cache-Control': 'no-cache', 'X-Accel-Buffering': 'no'})
+
+@app.route('/event_stats')
+def event_stats():
+    """Return subscriber and published/suppressed event counts."""
+    return jsonify(event_hub.get_stats())
 
 @app.route('/get_word')
 def get_word():
     # Return both current word and stored sentence
+    session = session_for_request()
     return jsonify({
-        'word': current_prediction,
-        'sentence': stored_sentence
+        'word': session.current_prediction,
+        'sentence': session.sentence
     })
 
 @app.route('/clear_sentence', methods=['POST'])
 def clear_sentence():
-    global stored_sentence
-    stored_sentence = ""
-    return jsonify({'status': 'cleared', 'sentence': stored_sentence})
+    session = session_for_request()
+    session.clear()
+    publish_session(session)
+    return jsonify({'status': 'cleared', 'sentence': session.sentence})
 
 @app.route('/backspace_sentence', methods=['POST'])
 def backspace_sentence():
-    global stored_sentence
-    stored_sentence = stored_sentence[:-1]
-    return jsonify({'status': 'backspaced', 'sentence': stored_sentence})
+    session = session_for_request()
+    session.backspace()
+    publish_session(session)
+    return jsonify({'status': 'backspaced', 'sentence': session.sentence})
+
+def get_ingest_session(session_id, create=True):
+    """Look up (or start) a browser ingestion session, expiring idle ones."""
+    now = time.time()
+    with ingest_sessions_lock:
+        # Drop sessions whose browser stopped sending frames
+        expired = [sid for sid, s in ingest_sessions.items() if now - s.last_seen > INGEST_SESSION_TTL]
+        for sid in expired:
+            del ingest_sessions[sid]
+            event_hub.forget(ingest_channel(sid))
+
+        session = ingest_sessions.get(session_id)
+        if session is None and create and len(ingest_sessions) < INGEST_MAX_SESSIONS:
+            session = ingest_sessions[session_id] = RecognitionSession(channel=ingest_channel(session_id))
+        return session
+
+def ingest_channel(session_id):
+    return f'ingest:{session_id}'
+
+def session_for_request():
+    """Return the ingestion session named by ?session= / {"session": ...}, else the webcam session."""
+    session_id = request.args.get('session')
+    if not session_id and request.is_json:
+        data = request.get_json(silent=True)
+        session_id = data.get('session') if isinstance(data, dict) else None
+    if session_id:
+        return get_ingest_session(session_id, create=False) or RecognitionSession(channel=None)
+    return camera_session
+
+@app.route('/ingest/<session_id>', methods=['POST'])
+def ingest_frame(session_id):
+    """Recognize one browser frame: a JPEG body or JSON {"landmarks": [[[x, y, z] * 21], ...]}."""
+    session = get_ingest_session(session_id)
+    if session is None:
+        return jsonify({'error': 'Too many active sessions'}), 503
+
+    if not wait_until_ready():
+        return jsonify({'error': 'Recognition model not loaded', 'status': warmup_state['status']}), 503
+
+    if request.is_json:
+        # Landmarks already extracted in the browser (normalized, mirrored like the webcam feed)
+        data = request.get_json(silent=True)
+        if not isinstance(data, dict):
+            return jsonify({'error': 'Expected a JSON object with a "landmarks" list'}), 400
+        try:
+            features = np.asarray(data.get('landmarks') or [], dtype=np.float32).reshape(-1, NUM_FEATURES)
+        except (ValueError, TypeError):
+            return jsonify({'error': 'Each hand must be 21 landmarks of [x, y, z]'}), 400
+        if not np.isfinite(features).all():
+            return jsonify({'error': 'Landmark coordinates must be finite numbers'}), 400
+    else:
+        buffer = np.frombuffer(request.get_data(), dtype=np.uint8)
+        frame = cv2.imdecode(buffer, cv2.IMREAD_COLOR) if buffer.size else None
+        if frame is None:
+            return jsonify({'error': 'Could not decode JPEG frame'}), 400
+
+        # Mirrored like the webcam path so landmarks match the training data
+        try:
+            with STAGE_SECONDS.labels('detect').time():
+                detection_result = landmarker_pool.detect(frame, timeout=5)
+        except queue.Empty:
+            return jsonify({'error': 'Server busy'}), 503
+        features = landmarks_to_array(detection_result.hand_landmarks)
+
+    FRAMES_PROCESSED.labels('ingest').inc()
+    HANDS_DETECTED.inc(len(features))
+    best_prediction, confidence, proba = classify_hands(features, session.prediction_cache)
+    completed = advance_session(session, best_prediction, len(features) > 0, proba)
+
+    return jsonify({
+        'word': session.current_prediction,
+        'sentence': session.sentence,
+        'confidence': float(confidence) if best_prediction else 0.0,
+        'hands': len(features),
+        'landmarks': pack_landmarks(features),
+        'word_completed': completed is not None
+    })
+
+@app.route('/ingest/<session_id>', methods=['DELETE'])
+def end_ingest_session(session_id):
+    """Forget a browser ingestion session."""
+    with ingest_sessions_lock:
+        ingest_sessions.pop(session_id, None)
+    event_hub.forget(ingest_channel(session_id))
+    return jsonify({'status': 'ended'})
 
 @app.route('/get_history')
 def get_history():
@@ -467,8 +731,21 @@ def clear_history():
     """Clear all conversation history."""
     global conversation_history
     conversation_history = []
+    publish_history()
     return jsonify({'status': 'cleared'})
 
+@app.route('/tts/<path:filename>')
+def serve_speech(filename):
+    """Serve synthesized speech from the TTS cache, typed by its real format (WAV, or AIFF if not converted)."""
+    path = os.path.join(TTS_CACHE_DIR, os.path.basename(filename))
+    kind = tts.audio_format(path) if os.path.isfile(path) else None
+    return send_from_directory(TTS_CACHE_DIR, filename, mimetype=tts.MIMETYPES.get(kind, 'audio/wav'))
+
+@app.route('/tts_stats')
+def tts_stats():
+    """Return TTS queue, cache hit and cache size counters."""
+    return jsonify(speech.get_stats())
+
 @app.route('/images/<path:filename>')
 def serve_image(filename):
     """Serve ISL gesture images from the images folder."""
@@ -491,51 +768,9 @@ def parse_sentence():
     # Add to conversation history (Text/Speech → ISL)
     add_to_history(sentence)
     
-    isl_folder = os.path.join(basedir, 'isl')
-    
-    # Get all available video names (without extension) - supports .mp4 and .avi
-    available_videos = {}
-    video_extensions = ('.mp4', '.avi')
-    for f in os.listdir(isl_folder):
-        if f.lower().endswith(video_extensions):
-            # Get name without extension
-            name_without_ext = os.path.splitext(f)[0].lower()
-            available_videos[name_without_ext] = f
-    
-    # Split sentence into words
-    words = sentence.split()
-    segments = []
-    i = 0
-    
-    while i < len(words):
-        matched = False
-        
-        # Try to match longest phrase first (up to 5 words)
-        for phrase_len in range(min(5, len(words) - i), 0, -1):
-            phrase = ' '.join(words[i:i+phrase_len])
-            phrase_lower = phrase.lower()
-            
-            if phrase_lower in available_videos:
-                segments.append({
-                    'type': 'video',
-                    'filename': available_videos[phrase_lower],
-                    'text': phrase
-                })
-                i += phrase_len
-                matched = True
-                break
-        
-        if not matched:
-            # No video match, add as letters
-            word = words[i]
-            letters = [c.upper() for c in word if c.isalpha()]
-            if letters:
-                segments.append({
-                    'type': 'letters',
-                    'letters': letters,
-                    'text': word
-                })
-            i += 1
+    # Longest-match segmentation over the prebuilt phrase trie
+    with PARSE_SENTENCE_SECONDS.time():
+        segments = phrase_index.segment(sentence)
     
     return jsonify({'segments': segments})
 
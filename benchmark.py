@@ -0,0 +1,553 @@
+import argparse
+import glob
+import json
+import os
+import platform
+import subprocess
+import sys
+import time
+
+import cv2
+import numpy as np
+
+from classifier_engine import BACKENDS, DEFAULT_BACKEND, load_engine
+from encoder import CHANGE_THRESHOLD, FrameEncoder, LandmarkEncoder
+from decision import DECIDERS
+from features import PredictionCache, landmarks_to_array, pack_landmarks, predict_best
+from recognition import (DETECT_WIDTH, DetectionInput, RecognitionSession, create_landmarker, draw_hand,
+                         draw_overlays, overlay_state, to_mp_image)
+
+basedir = os.path.abspath(os.path.dirname(__file__))
+
+# Stages of app.process_frame + the encoder, in order
+STAGES = ('read', 'preprocess', 'detect', 'features', 'predict', 'session', 'draw', 'encode')
+
+# Run in a fresh interpreter by measure_cold_start(); prints one JSON line
+COLD_START_SCRIPT = '''
+import json, time
+start = time.perf_counter()
+import app
+imported = time.perf_counter()
+status = app.app.test_client().get('/tutorial').status_code
+first_page = time.perf_counter()
+app.warmup_finished.wait(%(timeout)s)
+ready = time.perf_counter()
+print('COLD_START ' + json.dumps({
+    'import_s': imported - start,
+    'first_page_s': first_page - start,
+    'first_page_status': status,
+    'ready_s': ready - start if app.resources_ready.is_set() else None,
+    'status': app.warmup_state['status'],
+    'error': app.warmup_state['error'],
+    'steps_ms': app.warmup_state['steps_ms'],
+}))
+'''
+
+
+def peak_rss_mb():
+    """Peak resident memory of this process, or None where it cannot be read."""
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports kilobytes, macOS bytes
+    return round(peak / (1024 * 1024 if sys.platform == 'darwin' else 1024), 1)
+
+
+def summarize(values):
+    """Percentiles and mean of `values`; None when there are none to summarize."""
+    if not len(values):
+        return None
+    values = np.asarray(values, dtype=np.float64)
+    return {
+        'p50': round(float(np.percentile(values, 50)), 3),
+        'p95': round(float(np.percentile(values, 95)), 3),
+        'p99': round(float(np.percentile(values, 99)), 3),
+        'mean': round(float(values.mean()), 3),
+    }
+
+
+def stat(summary, key):
+    """`summary[key]` for printing, 'n/a' when there was nothing to summarize."""
+    return 'n/a' if summary is None or summary.get(key) is None else summary[key]
+
+
+class StageTimer:
+    """Collects per-stage wall times in milliseconds."""
+
+    def __init__(self, stages=STAGES):
+        self.samples = {name: [] for name in stages}
+        self.samples['total'] = []
+        self._frame_start = None
+        self._last = None
+
+    def start_frame(self):
+        self._frame_start = self._last = time.perf_counter()
+
+    def mark(self, stage):
+        now = time.perf_counter()
+        self.samples[stage].append((now - self._last) * 1000)
+        self._last = now
+
+    def end_frame(self):
+        self.samples['total'].append((self._last - self._frame_start) * 1000)
+
+    def report(self):
+        """Summaries per stage; stages that never ran are left out."""
+        return {name: summarize(values) for name, values in self.samples.items() if values}
+
+
+def benchmark_video(path, landmarker, model, encoder, timer, timestamp_offset_ms, max_frames=None, trace=None,
+                    cache=None, detect_width=DETECT_WIDTH):
+    """Push one video through the /video_feed path, timing every stage.
+
+    The clip's own timeline drives detect_for_video and the letter/space
+    timers, so the sentence built is the same however fast the machine is.
+    With a `trace` dict, each frame's time, hand flag and probability row
+    are appended to it for replay_decisions(). A `cache` (PredictionCache)
+    is used for classification as in the app, and keeps its hit counts.
+    Returns (frames, last_timestamp_ms, sentence, bytes_out).
+    """
+    cap = cv2.VideoCapture(path)
+    fps = cap.get(cv2.CAP_PROP_FPS) or 30.0
+    session = RecognitionSession()
+    prepared = DetectionInput(detect_width)
+    if cache is not None:
+        cache.clear()
+        session.prediction_cache = cache
+    landmark_mode = isinstance(encoder, LandmarkEncoder)
+    frames = 0
+    bytes_out = 0
+    timestamp_ms = timestamp_offset_ms
+
+    while max_frames is None or frames < max_frames:
+        timer.start_frame()
+        success, frame = cap.read()
+        if not success:
+            break
+        timer.mark('read')
+
+        timestamp_ms = timestamp_offset_ms + int(frames * 1000 / fps) + 1
+        now = timestamp_ms / 1000.0
+
+        mp_image = to_mp_image(prepared.prepare(frame))
+        timer.mark('preprocess')
+
+        detection_result = landmarker.detect_for_video(mp_image, timestamp_ms)
+        hand_detected = bool(detection_result.hand_landmarks)
+        timer.mark('detect')
+
+        features = landmarks_to_array(detection_result.hand_landmarks)
+        timer.mark('features')
+
+        if model is None:
+            best_prediction, _, proba = None, -1.0, None
+        else:
+            best_prediction, _, proba = session.prediction_cache.predict(model, features)
+        timer.mark('predict')
+
+        session.update(best_prediction, hand_detected, now=now, proba=proba,
+                       classes=model.classes_ if model is not None else None)
+        timer.mark('session')
+
+        if trace is not None:
+            trace['t'].append(now)
+            trace['hand'].append(hand_detected)
+            trace['proba'].append(proba if proba is not None else np.zeros(len(model.classes_), dtype=np.float32))
+
+        if landmark_mode:
+            prediction, no_hand_s, feedback = overlay_state(session, hand_detected, best_prediction, now)
+            item = ({'hands': pack_landmarks(features), 'prediction': prediction,
+                     'no_hand_s': no_hand_s, 'feedback': feedback},)
+        else:
+            for hand_landmarks in detection_result.hand_landmarks:
+                draw_hand(frame, hand_landmarks)
+            item = (frame, draw_overlays(frame, session, hand_detected, best_prediction, now))
+        timer.mark('draw')
+
+        if encoder is not None:
+            output = encoder.encode(*item, now=now)
+            bytes_out += len(output) if output else 0
+        timer.mark('encode')
+
+        timer.end_frame()
+        frames += 1
+
+    cap.release()
+    return frames, timestamp_ms, session.sentence.strip(), bytes_out
+
+
+def detect_at_width(videos, landmarker_path, model, width, max_frames=None):
+    """Detect (and classify) every frame with the detection input downscaled to `width` (0 = full).
+
+    Returns per-frame detect times (ms, including the resize/convert),
+    feature arrays and top predictions, and the detection image size.
+    """
+    landmarker = create_landmarker(landmarker_path, 'VIDEO', num_hands=2)
+    prepared = DetectionInput(width)
+    times, features_per_frame, predictions = [], [], []
+    size = None
+    timestamp_ms = 0
+    for path in videos:
+        cap = cv2.VideoCapture(path)
+        step_ms = int(1000 / (cap.get(cv2.CAP_PROP_FPS) or 30.0))
+        frames = 0
+        while max_frames is None or frames < max_frames:
+            success, frame = cap.read()
+            if not success:
+                break
+            timestamp_ms += step_ms
+            start = time.perf_counter()
+            rgb_frame = prepared.prepare(frame)
+            result = landmarker.detect_for_video(to_mp_image(rgb_frame), timestamp_ms)
+            times.append((time.perf_counter() - start) * 1000)
+            size = f"{rgb_frame.shape[1]}x{rgb_frame.shape[0]}"
+            features = landmarks_to_array(result.hand_landmarks)
+            # Hands in a fixed (left-to-right) order, so runs can be compared row by row
+            features = features[np.argsort(features[:, 0])]
+            features_per_frame.append(features)
+            predictions.append(predict_best(model, features)[0] if model is not None else None)
+            frames += 1
+        cap.release()
+        timestamp_ms += 1000
+    landmarker.close()
+    return times, features_per_frame, predictions, size
+
+
+def resolution_tradeoff(videos, widths, landmarker_path, model=None, max_frames=None):
+    """Latency/accuracy of each detection width against full-resolution detection.
+
+    Per width: detect latency, how often the number of hands matches full
+    resolution, the mean landmark offset from it (x/y, % of the frame) on
+    frames where it does, and how often the top prediction matches.
+    """
+    reference = detect_at_width(videos, landmarker_path, model, 0, max_frames)
+    rows = []
+    for width in [0] + [w for w in widths if w]:
+        times, features, predictions, size = (reference if width == 0 else
+                                              detect_at_width(videos, landmarker_path, model, width, max_frames))
+        same_hands = [len(f) == len(r) for f, r in zip(features, reference[1])]
+        offsets = [np.abs(f.reshape(-1, 21, 3)[..., :2] - r.reshape(-1, 21, 3)[..., :2]).mean()
+                   for f, r in zip(features, reference[1]) if len(f) == len(r) and len(f)]
+        predicted = [(p, r) for p, r in zip(predictions, reference[2]) if r is not None]
+        rows.append({
+            'width': width or 'full',
+            'input': size,
+            'detect_ms': summarize(times),
+            'hands_agree': round(float(np.mean(same_hands)), 4) if same_hands else None,
+            'landmark_offset_pct': round(float(np.mean(offsets)) * 100, 3) if offsets else None,
+            'prediction_agree': round(float(np.mean([p == r for p, r in predicted])), 4) if predicted else None,
+        })
+
+    print(f"\n{'width':>6}{'input':>11}{'p50 ms':>9}{'p95 ms':>9}{'hands':>8}{'offset %':>10}{'pred':>8}")
+    for row in rows:
+        print(f"{row['width']:>6}{row['input'] or '-':>11}{stat(row['detect_ms'], 'p50'):>9}{stat(row['detect_ms'], 'p95'):>9}"
+              f"{row['hands_agree'] if row['hands_agree'] is not None else '-':>8}"
+              f"{row['landmark_offset_pct'] if row['landmark_offset_pct'] is not None else '-':>10}"
+              f"{row['prediction_agree'] if row['prediction_agree'] is not None else '-':>8}")
+    return rows
+
+
+def replay_decisions(traces, classes, decider):
+    """Replay recorded per-frame probabilities through a fresh session using `decider`.
+
+    Latency-to-commit of a letter is measured from the first frame it was
+    the top prediction (since the hand appeared or the previous commit)
+    to the frame it was appended.
+    Returns {'letters', 'latency_ms', 'sentences'}.
+    """
+    latencies = []
+    sentences = []
+    for trace in traces:
+        session = RecognitionSession(channel=None, decider=decider)
+        first_seen = {}
+        for now, hand, proba in zip(trace['t'], trace['hand'], trace['proba']):
+            now, hand = float(now), bool(hand)
+            prediction = None
+            if hand and proba.any():
+                prediction = classes[int(np.argmax(proba))]
+                first_seen.setdefault(prediction, now)
+            elif not hand:
+                first_seen.clear()
+            before = len(session.sentence)
+            session.update(prediction, hand, now=now, proba=proba if prediction is not None else None,
+                           classes=classes)
+            if hand and len(session.sentence) > before:
+                letter = session.sentence[before:]
+                latencies.append((now - first_seen.get(letter, now)) * 1000)
+                first_seen.clear()
+        sentences.append(session.sentence.strip())
+    return {'letters': len(latencies), 'latency_ms': summarize(latencies), 'sentences': sentences}
+
+
+def decision_report(traces, classes, deciders=tuple(DECIDERS)):
+    report = {name: replay_decisions(traces, classes, name) for name in deciders}
+    for name, result in report.items():
+        print(f"{name:>6}: {result['letters']} letters, latency-to-commit p50 {stat(result['latency_ms'], 'p50')} ms, "
+              f"p95 {stat(result['latency_ms'], 'p95')} ms")
+    return report
+
+
+def save_traces(path, traces, classes, names):
+    arrays = {'classes': np.asarray(classes).astype(str), 'videos': np.asarray(names)}
+    for i, trace in enumerate(traces):
+        arrays[f't{i}'] = np.asarray(trace['t'], dtype=np.float64)
+        arrays[f'hand{i}'] = np.asarray(trace['hand'], dtype=bool)
+        arrays[f'proba{i}'] = np.asarray(trace['proba'], dtype=np.float32).reshape(len(trace['t']), len(classes))
+    np.savez_compressed(path, **arrays)
+
+
+def load_traces(path):
+    """Traces saved with --save-traces: returns (traces, classes, video names)."""
+    with np.load(path, allow_pickle=False) as data:
+        names = [str(name) for name in data['videos']]
+        traces = [{'t': data[f't{i}'], 'hand': data[f'hand{i}'], 'proba': data[f'proba{i}']}
+                  for i in range(len(names))]
+        return traces, data['classes'], names
+
+
+def make_encoder(kind, quality, scale, skip_unchanged):
+    if kind == 'jpeg':
+        # Encode every frame unless asked otherwise, so 'encode' measures the encoder
+        return FrameEncoder(quality=quality, scale=scale, max_fps=0, adaptive=False,
+                            change_threshold=CHANGE_THRESHOLD if skip_unchanged else 0)
+    if kind == 'landmarks':
+        return LandmarkEncoder(max_fps=0)
+    return None
+
+
+def run_benchmark(videos, backend='auto', model_dir=basedir, landmarker_path=None,
+                  encoder_kind='jpeg', quality=80, scale=1.0, skip_unchanged=False,
+                  max_frames=None, warmup=5, traces=None, cache_tolerance=None, detect_width=DETECT_WIDTH):
+    """Benchmark every video in turn and return the JSON-ready report.
+
+    A `traces` list collects one recorded trace per video (needs a model).
+    `cache_tolerance` overrides the prediction cache tolerance (0 disables it).
+    """
+    landmarker_path = landmarker_path or os.path.join(model_dir, 'hand_landmarker.task')
+    try:
+        model = load_engine(model_dir, backend)
+    except (FileNotFoundError, ValueError) as e:
+        print(f"Warning: {e}; benchmarking without classification.")
+        model = None
+    landmarker = create_landmarker(landmarker_path, 'VIDEO', num_hands=2)
+
+    encoder = make_encoder(encoder_kind, quality, scale, skip_unchanged)
+    timestamp_ms = 0
+
+    # Warm-up frames (first inference allocates buffers) are not reported
+    if warmup and videos:
+        _, timestamp_ms, _, _ = benchmark_video(videos[0], landmarker, model,
+                                                make_encoder(encoder_kind, quality, scale, skip_unchanged),
+                                                StageTimer(), timestamp_ms, max_frames=warmup, detect_width=detect_width)
+
+    cache = PredictionCache() if cache_tolerance is None else PredictionCache(tolerance=cache_tolerance)
+    timer = StageTimer()
+    results = []
+    bytes_out = 0
+    start = time.perf_counter()
+    for path in videos:
+        trace = {'t': [], 'hand': [], 'proba': []} if traces is not None and model is not None else None
+        frames, timestamp_ms, sentence, video_bytes = benchmark_video(
+            path, landmarker, model, encoder, timer, timestamp_ms + 1000, max_frames, trace, cache, detect_width)
+        if trace is not None:
+            traces.append(trace)
+        bytes_out += video_bytes
+        results.append({'video': os.path.basename(path), 'frames': frames, 'sentence': sentence})
+        print(f"{os.path.basename(path)}: {frames} frames, sentence '{sentence}'")
+    elapsed = time.perf_counter() - start
+    landmarker.close()
+
+    stages = timer.report()
+    total_frames = sum(r['frames'] for r in results)
+    busy_s = sum(timer.samples['total']) / 1000
+    # /video_feed runs capture, process and encode on separate threads, so
+    # its frame rate is bounded by the slowest of the three groups.
+    def mean(stage):
+        return stages[stage]['mean'] if stage in stages else 0.0
+    groups = {
+        'capture': mean('read'),
+        'process': sum(mean(s) for s in ('preprocess', 'detect', 'features', 'predict', 'session', 'draw')),
+        'encode': mean('encode'),
+    }
+    slowest = max(groups.values())
+
+    return {
+        'config': {
+            'backend': getattr(model, 'backend', None),
+            'classes': [str(c) for c in model.classes_] if model is not None else None,
+            'encoder': encoder_kind,
+            'quality': quality,
+            'scale': scale,
+            'skip_unchanged': skip_unchanged,
+            'cache_tolerance': cache.tolerance,
+            'detect_width': detect_width,
+            'max_frames': max_frames,
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+        },
+        'videos': len(results),
+        'frames': total_frames,
+        'elapsed_s': round(elapsed, 3),
+        'fps': round(total_frames / busy_s, 1) if busy_s else 0.0,
+        'pipelined_fps': round(1000 / slowest, 1) if slowest else 0.0,
+        'bytes_out': bytes_out,
+        'peak_rss_mb': peak_rss_mb(),
+        'stages_ms': stages,
+        'prediction_cache': cache.stats(),
+        'results': results,
+    }
+
+
+def measure_cold_start(runs=3, timeout=120):
+    """Start the app in fresh interpreters; time to import, first page and warmed-up recognition.
+
+    Returns the medians over `runs`, plus the warm-up steps of the last run.
+    """
+    samples = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        result = subprocess.run([sys.executable, '-c', COLD_START_SCRIPT % {'timeout': timeout}],
+                                cwd=basedir, capture_output=True, text=True, timeout=timeout + 30,
+                                env=dict(os.environ, SIGNBRIDGE_WARMUP='1'))
+        wall = time.perf_counter() - start
+        line = next((l for l in result.stdout.splitlines() if l.startswith('COLD_START ')), None)
+        if line is None:
+            print(f"Cold start run failed:\n{result.stderr[-2000:]}")
+            return None
+        sample = json.loads(line[len('COLD_START '):])
+        sample['process_s'] = wall
+        samples.append(sample)
+
+    def median(key):
+        values = [s[key] for s in samples if s[key] is not None]
+        return round(float(np.median(values)), 3) if values else None
+
+    last = samples[-1]
+    return {
+        'runs': runs,
+        'process_s': median('process_s'),   # includes interpreter start-up and exit
+        'import_s': median('import_s'),
+        'first_page_s': median('first_page_s'),
+        'ready_s': median('ready_s'),
+        'status': last['status'],
+        'error': last['error'],
+        'steps_ms': last['steps_ms'],
+    }
+
+
+def compare_reports(baseline, report, tolerance=0.2):
+    """Print p50/p95 changes per stage; returns the stages slower than `tolerance` allows."""
+    regressions = []
+    print(f"\n{'stage':>12}{'p50 before':>12}{'p50 after':>12}{'p95 before':>12}{'p95 after':>12}")
+    stages_before, stages_after = baseline.get('stages_ms') or {}, report.get('stages_ms') or {}
+    for stage in dict.fromkeys([*stages_after, *stages_before]):
+        before, after = stages_before.get(stage), stages_after.get(stage)
+        print(f"{stage:>12}{stat(before, 'p50'):>12}{stat(after, 'p50'):>12}"
+              f"{stat(before, 'p95'):>12}{stat(after, 'p95'):>12}")
+        # Sub-0.05 ms stages are timer noise, not regressions
+        for key in ('p50', 'p95'):
+            if 'n/a' in (stat(before, key), stat(after, key)):
+                continue
+            if after[key] > 0.05 and after[key] > before[key] * (1 + tolerance):
+                regressions.append(f"{stage} {key}")
+    if 'fps' in report:
+        print(f"{'fps':>12}{baseline.get('fps', 'n/a'):>12}{report['fps']:>12}")
+
+    before, after = baseline.get('cold_start') or {}, report.get('cold_start') or {}
+    for key in ('first_page_s', 'ready_s'):
+        if before.get(key) is None and after.get(key) is None:
+            continue
+        print(f"{key:>12}{stat(before, key):>12}{stat(after, key):>12}")
+        if 'n/a' not in (stat(before, key), stat(after, key)):
+            # Sub-50 ms differences are process start-up noise
+            if after[key] - before[key] > 0.05 and after[key] > before[key] * (1 + tolerance):
+                regressions.append(f"cold start {key}")
+    return sorted(set(regressions))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the recognition pipeline on recorded videos, no webcam or display needed.")
+    parser.add_argument('videos', nargs='*', help="video files (default: isl/*.mp4)")
+    parser.add_argument('--engine', choices=BACKENDS, default=DEFAULT_BACKEND)
+    parser.add_argument('--landmarker', help="path to hand_landmarker.task")
+    parser.add_argument('--encoder', choices=('jpeg', 'landmarks', 'none'), default='jpeg')
+    parser.add_argument('--quality', type=int, default=80, help="JPEG quality")
+    parser.add_argument('--scale', type=float, default=1.0, help="JPEG output scale")
+    parser.add_argument('--skip-unchanged', action='store_true', help="let the encoder skip unchanged frames")
+    parser.add_argument('--max-frames', type=int, help="frames per video")
+    parser.add_argument('--cache-tolerance', type=float,
+                        help="prediction cache tolerance (default: SIGNBRIDGE_PREDICTION_CACHE_TOLERANCE; 0 disables)")
+    parser.add_argument('--detect-width', type=int, default=DETECT_WIDTH,
+                        help="downscale the detection input to this width (0 = full resolution)")
+    parser.add_argument('--detect-widths', type=int, nargs='+',
+                        help="also compare detection latency/accuracy at these widths against full resolution")
+    parser.add_argument('--cold-start', action='store_true',
+                        help="time app start-up (import, first page, warmed-up recognition) in fresh processes")
+    parser.add_argument('--cold-start-runs', type=int, default=3)
+    parser.add_argument('--decisions', action='store_true',
+                        help="replay each video's predictions through every letter decider and report latency-to-commit")
+    parser.add_argument('--save-traces', help="save the per-frame predictions of the videos (.npz) for --traces")
+    parser.add_argument('--traces', help="replay saved traces through the deciders; no videos, model or landmarker needed")
+    parser.add_argument('--output', help="write the JSON report to this file")
+    parser.add_argument('--compare', help="baseline JSON report; exit 1 if any stage got slower")
+    parser.add_argument('--tolerance', type=float, default=0.2, help="allowed slowdown for --compare (0.2 = 20%%)")
+    args = parser.parse_args()
+
+    # --cold-start / --traces on their own skip the video run; name videos to run both
+    standalone = args.cold_start or args.traces
+    videos = args.videos or ([] if standalone else sorted(glob.glob(os.path.join(basedir, 'isl', '*.mp4'))))
+    if not videos and not standalone:
+        print("Error: no videos to benchmark.")
+        return 1
+
+    report = {}
+    if args.cold_start:
+        # Before the video run, so this process's imports don't warm the OS file cache for it
+        report['cold_start'] = measure_cold_start(args.cold_start_runs)
+    if args.traces:
+        traces, classes, _ = load_traces(args.traces)
+        report['decisions'] = decision_report(traces, classes)
+    if videos:
+        traces = [] if args.decisions or args.save_traces else None
+        report.update(run_benchmark(videos, backend=args.engine, landmarker_path=args.landmarker,
+                                    encoder_kind=args.encoder, quality=args.quality, scale=args.scale,
+                                    skip_unchanged=args.skip_unchanged, max_frames=args.max_frames,
+                                    traces=traces, cache_tolerance=args.cache_tolerance,
+                                    detect_width=args.detect_width))
+        classes = report['config']['classes']
+        if traces and args.save_traces:
+            save_traces(args.save_traces, traces, classes, [r['video'] for r in report['results']])
+            print(f"Traces saved to '{args.save_traces}'.")
+        if traces and args.decisions:
+            report['decisions'] = decision_report(traces, np.asarray(classes))
+        if args.detect_widths:
+            try:
+                model = load_engine(basedir, args.engine)
+            except (FileNotFoundError, ValueError):
+                model = None
+            report['resolutions'] = resolution_tradeoff(
+                videos, args.detect_widths, args.landmarker or os.path.join(basedir, 'hand_landmarker.task'),
+                model, args.max_frames)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Report saved to '{args.output}'.")
+    else:
+        print(json.dumps(report, indent=2))
+
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        regressions = compare_reports(baseline, report, args.tolerance)
+        if regressions:
+            print(f"\nRegressions beyond {args.tolerance:.0%}: {', '.join(regressions)}")
+            return 1
+        print("\nNo regressions.")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,299 @@
+import json
+import os
+
+import numpy as np
+
+from features import NORMALIZERS, NUM_FEATURES
+
+# scikit-learn and joblib are imported where they are needed: importing
+# sklearn alone takes ~2 s, and a linear/MLP artifact never needs it.
+
+# Backends selectable at load time (SIGNBRIDGE_ENGINE / train_model(backend=...))
+BACKENDS = ('auto', 'sklearn', 'kdtree', 'balltree', 'linear', 'mlp')
+# The one default for the app, the trainer and the benchmark
+DEFAULT_BACKEND = os.environ.get('SIGNBRIDGE_ENGINE', 'auto')
+
+MODEL_FILE = 'isl_model.pkl'     # plain scikit-learn model (always written)
+ENGINE_FILE = 'isl_engine.pkl'   # prebuilt engine pickle from older trainings (still loaded)
+ARTIFACT_FILE = 'isl_model.npz'  # fused normalization + classifier (train_models.py)
+ARTIFACT_VERSION = 1
+META_FILE = 'isl_model.json'     # human-readable sidecar of the artifact
+
+
+class SklearnEngine:
+    """Pass-through to a fitted scikit-learn classifier."""
+
+    backend = 'sklearn'
+
+    def __init__(self, model):
+        self.model = model
+        self.classes_ = model.classes_
+
+    def predict_proba(self, X):
+        return self.model.predict_proba(X)
+
+
+class TreeEngine:
+    """k-nearest-neighbour voting over a prebuilt KD-tree or ball-tree index.
+
+    Gives the same probabilities as KNeighborsClassifier with uniform
+    weights, but the index is built once at training time instead of
+    falling back to a brute-force scan (scikit-learn's 'auto' choice for
+    63 features). Queries arrive as float32 from the feature extractor;
+    scikit-learn's trees compute the distances in float64.
+    """
+
+    def __init__(self, X, y, n_neighbors=5, kind='kdtree', leaf_size=40):
+        self.backend = kind
+        self.n_neighbors = n_neighbors
+        from sklearn.neighbors import BallTree, KDTree
+        self.classes_, self._labels = np.unique(np.asarray(y), return_inverse=True)
+        tree_cls = KDTree if kind == 'kdtree' else BallTree
+        self.tree = tree_cls(np.asarray(X, dtype=np.float32), leaf_size=leaf_size)
+
+    def predict_proba(self, X):
+        X = np.asarray(X, dtype=np.float32).reshape(-1, self.tree.data.shape[1])
+        k = min(self.n_neighbors, self.tree.data.shape[0])
+        idx = self.tree.query(X, k=k, return_distance=False)
+        votes = self._labels[idx]
+        # Count the neighbours' labels per row -> (n_samples, n_classes)
+        proba = np.zeros((len(X), len(self.classes_)), dtype=np.float32)
+        rows = np.arange(len(X))
+        for column in votes.T:
+            proba[rows, column] += 1.0
+        return proba / k
+
+    @classmethod
+    def from_knn(cls, knn, kind='kdtree'):
+        return cls(knn._fit_X, knn.classes_[knn._y], n_neighbors=knn.n_neighbors, kind=kind)
+
+
+class NumpyMLPEngine:
+    """Dense network evaluated as contiguous float32 matrix products.
+
+    With no hidden layers this is plain softmax (logistic) regression, so
+    the same class serves the 'linear' and 'mlp' backends.
+    """
+
+    ACTIVATIONS = {
+        'relu': lambda h: np.maximum(h, 0, out=h),
+        'tanh': np.tanh,
+        'logistic': lambda h: 1.0 / (1.0 + np.exp(-h)),
+        'identity': lambda h: h,
+    }
+
+    def __init__(self, weights, biases, classes, activation='relu', backend='mlp'):
+        self.backend = backend
+        self.weights = [np.ascontiguousarray(w, dtype=np.float32) for w in weights]
+        self.biases = [np.ascontiguousarray(b, dtype=np.float32) for b in biases]
+        self.classes_ = np.asarray(classes)
+        self.activation = activation
+
+    def predict_proba(self, X):
+        h = np.asarray(X, dtype=np.float32).reshape(-1, self.weights[0].shape[0])
+        activate = self.ACTIVATIONS[self.activation]
+        for W, b in zip(self.weights[:-1], self.biases[:-1]):
+            h = activate(h @ W + b)
+        logits = h @ self.weights[-1] + self.biases[-1]
+        if logits.shape[1] == 1:
+            # Binary models output one logit for the positive class
+            logits = np.hstack([np.zeros_like(logits), logits])
+        logits -= logits.max(axis=1, keepdims=True)
+        proba = np.exp(logits)
+        return proba / proba.sum(axis=1, keepdims=True)
+
+    @classmethod
+    def from_sklearn(cls, model):
+        if hasattr(model, 'coefs_'):  # MLPClassifier
+            return cls(model.coefs_, model.intercepts_, model.classes_,
+                       activation=model.activation,
+                       backend='mlp' if len(model.coefs_) > 1 else 'linear')
+        # LogisticRegression and other linear models
+        return cls([model.coef_.T], [model.intercept_], model.classes_, backend='linear')
+
+
+def train_engine(X, y, backend='kdtree', knn=None):
+    """Fit the model for a backend and return it wrapped as an engine."""
+    if backend in ('kdtree', 'balltree'):
+        return TreeEngine(X, y, n_neighbors=knn.n_neighbors if knn else 5, kind=backend)
+    if backend == 'linear':
+        from sklearn.linear_model import LogisticRegression
+        return NumpyMLPEngine.from_sklearn(LogisticRegression(max_iter=1000).fit(X, y))
+    if backend == 'mlp':
+        from sklearn.neural_network import MLPClassifier
+        mlp = MLPClassifier(hidden_layer_sizes=(64,), max_iter=500, random_state=42)
+        return NumpyMLPEngine.from_sklearn(mlp.fit(X, y))
+    from sklearn.neighbors import KNeighborsClassifier
+    return SklearnEngine(knn or KNeighborsClassifier(n_neighbors=5).fit(X, y))
+
+
+def engine_from_model(model, backend='auto'):
+    """Wrap an already-fitted scikit-learn model in the requested engine."""
+    from sklearn.neighbors import KNeighborsClassifier
+    if backend == 'auto':
+        if isinstance(model, KNeighborsClassifier):
+            backend = 'kdtree'
+        elif hasattr(model, 'coefs_') or hasattr(model, 'coef_'):
+            backend = 'linear'
+        else:
+            backend = 'sklearn'
+
+    if backend in ('kdtree', 'balltree') and isinstance(model, KNeighborsClassifier):
+        return TreeEngine.from_knn(model, kind=backend)
+    if backend in ('linear', 'mlp') and (hasattr(model, 'coefs_') or hasattr(model, 'coef_')):
+        return NumpyMLPEngine.from_sklearn(model)
+    if backend != 'sklearn':
+        print(f"Warning: {type(model).__name__} cannot run on the '{backend}' engine, using sklearn.")
+    return SklearnEngine(model)
+
+
+class FusedEngine:
+    """Feature normalization, scaling and an engine as one predict_proba call.
+
+    A StandardScaler in front of a linear/MLP engine is folded into its
+    first layer (W' = W / s, b' = b - (m / s) W); in front of a tree
+    engine it is kept as one float32 multiply-add on the query. The path
+    is fixed when the engine is built, so no per-frame check decides
+    whether to scale.
+    """
+
+    def __init__(self, engine, normalization='none', input_scale=None, input_offset=None):
+        if normalization not in NORMALIZERS:
+            raise ValueError(f"Unknown normalization '{normalization}', expected one of {tuple(NORMALIZERS)}")
+        self.engine = engine
+        self.backend = engine.backend
+        self.classes_ = engine.classes_
+        self.normalization = normalization
+        self.normalize = NORMALIZERS[normalization]
+        self.input_scale = None if input_scale is None else np.asarray(input_scale, dtype=np.float32)
+        self.input_offset = None if input_offset is None else np.asarray(input_offset, dtype=np.float32)
+        self.predict_proba = self._predict if self.input_scale is None else self._predict_scaled
+
+    def _predict(self, X):
+        return self.engine.predict_proba(self.normalize(X))
+
+    def _predict_scaled(self, X):
+        return self.engine.predict_proba(self.normalize(X) * self.input_scale + self.input_offset)
+
+    @classmethod
+    def with_scaler(cls, engine, normalization='none', mean=None, scale=None):
+        """Fuse a StandardScaler's mean_/scale_ (None for unscaled input) into the engine."""
+        if mean is None:
+            return cls(engine, normalization)
+        mean = np.asarray(mean, dtype=np.float64)
+        scale = np.asarray(scale, dtype=np.float64)
+        if isinstance(engine, NumpyMLPEngine):
+            W = engine.weights[0].astype(np.float64)
+            weights = [W / scale[:, None]] + engine.weights[1:]
+            biases = [engine.biases[0] - (mean / scale) @ W] + engine.biases[1:]
+            folded = NumpyMLPEngine(weights, biases, engine.classes_, engine.activation, engine.backend)
+            return cls(folded, normalization)
+        return cls(engine, normalization, 1.0 / scale, -mean / scale)
+
+
+def save_artifact(fused, target, check_input):
+    """Write a FusedEngine as a versioned .npz artifact (a path or a binary file object).
+
+    `check_input` rows and the probabilities they produce now are stored
+    with it; load_artifact() refuses the file if they no longer match.
+    """
+    engine = fused.engine
+    arrays = {
+        'version': np.int32(ARTIFACT_VERSION),
+        'num_features': np.int32(NUM_FEATURES),
+        'backend': np.str_(fused.backend),
+        'normalization': np.str_(fused.normalization),
+        'classes': np.asarray(fused.classes_).astype(str),
+    }
+    if isinstance(engine, NumpyMLPEngine):
+        arrays['activation'] = np.str_(engine.activation)
+        arrays['layers'] = np.int32(len(engine.weights))
+        for i, (W, b) in enumerate(zip(engine.weights, engine.biases)):
+            arrays[f'W{i}'], arrays[f'b{i}'] = W, b
+    elif isinstance(engine, TreeEngine):
+        arrays['reference'] = np.asarray(engine.tree.data, dtype=np.float32)
+        arrays['labels'] = engine._labels.astype(np.int32)
+        arrays['n_neighbors'] = np.int32(engine.n_neighbors)
+    else:
+        raise ValueError(f"The '{fused.backend}' engine cannot be saved as an artifact")
+    if fused.input_scale is not None:
+        arrays['input_scale'], arrays['input_offset'] = fused.input_scale, fused.input_offset
+
+    check_input = np.asarray(check_input, dtype=np.float32).reshape(-1, NUM_FEATURES)
+    arrays['check_input'] = check_input
+    arrays['check_proba'] = np.asarray(fused.predict_proba(check_input), dtype=np.float32)
+
+    if hasattr(target, 'write'):
+        np.savez(target, **arrays)
+        return
+    # Write then rename, so a running app never sees half an artifact
+    with open(target + '.part', 'wb') as f:
+        np.savez(f, **arrays)
+    os.replace(target + '.part', target)
+
+
+def load_artifact(source):
+    """Load a FusedEngine from save_artifact() output and run its self-check."""
+    with np.load(source, allow_pickle=False) as data:
+        version = int(data['version'])
+        if version != ARTIFACT_VERSION:
+            raise ValueError(f"Artifact format {version} is not supported (expected {ARTIFACT_VERSION})")
+        if int(data['num_features']) != NUM_FEATURES:
+            raise ValueError(f"Artifact expects {int(data['num_features'])} features, not {NUM_FEATURES}")
+
+        backend = str(data['backend'])
+        classes = data['classes']
+        if backend in ('linear', 'mlp'):
+            layers = int(data['layers'])
+            engine = NumpyMLPEngine([data[f'W{i}'] for i in range(layers)], [data[f'b{i}'] for i in range(layers)],
+                                    classes, activation=str(data['activation']), backend=backend)
+        else:
+            engine = TreeEngine(data['reference'], classes[data['labels']],
+                                n_neighbors=int(data['n_neighbors']), kind=backend)
+        fused = FusedEngine(engine, str(data['normalization']),
+                            data['input_scale'] if 'input_scale' in data else None,
+                            data['input_offset'] if 'input_offset' in data else None)
+
+        proba = fused.predict_proba(data['check_input'])
+        if proba.shape != data['check_proba'].shape or not np.allclose(proba, data['check_proba'], atol=1e-4):
+            raise ValueError("Artifact failed its self-check: predictions differ from the ones saved with it")
+    return fused
+
+
+def load_metadata(model_dir):
+    """The training sidecar (feature layout, scaler, metrics), or None if absent."""
+    path = os.path.join(model_dir, META_FILE)
+    if not os.path.exists(path):
+        return None
+    with open(path) as f:
+        return json.load(f)
+
+
+def load_engine(model_dir, backend='auto'):
+    """Load the inference engine for `backend`, always as a FusedEngine.
+
+    isl_model.npz takes precedence and must match the request (any backend
+    does for 'auto'): its normalization lives in the artifact, so falling
+    back to the raw-landmark pickles would silently change the features.
+    Without it a prebuilt isl_engine.pkl is used, else isl_model.pkl is
+    loaded and converted.
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown engine backend '{backend}', expected one of {BACKENDS}")
+
+    artifact_path = os.path.join(model_dir, ARTIFACT_FILE)
+    if os.path.exists(artifact_path):
+        fused = load_artifact(artifact_path)
+        if backend not in ('auto', fused.backend):
+            raise ValueError(f"'{ARTIFACT_FILE}' holds a {fused.backend} engine but backend '{backend}' "
+                             f"was requested; use 'auto' (SIGNBRIDGE_ENGINE=auto) or retrain for that backend")
+        return fused
+
+    import joblib
+    engine_path = os.path.join(model_dir, ENGINE_FILE)
+    if backend != 'sklearn' and os.path.exists(engine_path):
+        engine = joblib.load(engine_path)
+        if backend in ('auto', engine.backend):
+            return FusedEngine(engine)
+
+    return FusedEngine(engine_from_model(joblib.load(os.path.join(model_dir, MODEL_FILE)), backend))
@@ -1,12 +1,29 @@
 import pandas as pd
 import numpy as np
 import string
+import os
+import argparse
+from landmark_store import CSV_PATH, STORE_PATH, LandmarkWriter, check_store_covers_csv, iter_chunks, load_dataset
+
+VALID_LABELS = list(string.ascii_uppercase)
 
 def clean_and_balance():
     print("Loading dataset...")
+    use_store = os.path.exists(STORE_PATH)
+    try:
+        check_store_covers_csv()
+    except ValueError as e:
+        print(f"Error: {e}")
+        exit()
     try:
-        # Load dataset without header
-        df = pd.read_csv('dataset.csv', header=None)
+        if use_store:
+            # Binary store: 63 feature columns + label, same layout as the CSV
+            X, y = load_dataset(STORE_PATH)
+            df = pd.DataFrame(X)
+            df[X.shape[1]] = y
+        else:
+            # Load dataset without header
+            df = pd.read_csv(CSV_PATH, header=None)
     except FileNotFoundError:
         print("Error: dataset.csv not found!")
         exit()
@@ -47,7 +64,7 @@ def clean_and_balance():
     
     df[last_col_idx] = df[last_col_idx].str.upper()
     
-    valid_labels = list(string.ascii_uppercase)
+    valid_labels = VALID_LABELS
     
     # Filter
     df_clean = df[df[last_col_idx].isin(valid_labels)]
@@ -89,9 +106,120 @@ def clean_and_balance():
     print("\nFinal counts per letter:")
     print(df_balanced.groupby(last_col_idx).size())
     
-    # Save
-    df_balanced.to_csv('balanced_dataset.csv', header=False, index=False)
-    print(f"\nSaved balanced dataset to 'balanced_dataset.csv' with {len(df_balanced)} rows.")
+    save_balanced(df_balanced, use_store)
+
+def read_chunks(use_store, chunk_rows):
+    """Yield DataFrames of at most chunk_rows rows (63 features + uppercased label column)."""
+    if use_store:
+        for X, y in iter_chunks(STORE_PATH, chunk_rows):
+            chunk = pd.DataFrame(X)
+            chunk[X.shape[1]] = pd.Series(y).str.upper()
+            yield chunk
+        return
+    for chunk in pd.read_csv(CSV_PATH, header=None, chunksize=chunk_rows):
+        last_col_idx = chunk.columns[-1]
+        chunk[last_col_idx] = chunk[last_col_idx].astype(str).str.upper()
+        yield chunk
+
+def clean_and_balance_streaming(chunk_rows=100000):
+    """Same output as clean_and_balance(), reading the input in two chunked passes.
+
+    Pass 1 only counts labels. Knowing each label's size, pass 2 picks
+    exactly the rows group.sample(n=target, random_state=42) would pick
+    (RandomState(42).permutation(size)[:target]) and the final shuffle is
+    the same permutation as sample(frac=1, random_state=42). Memory holds
+    the chosen rows and their indices, never the whole input.
+    """
+    use_store = os.path.exists(STORE_PATH)
+    try:
+        check_store_covers_csv()
+    except ValueError as e:
+        print(f"Error: {e}")
+        exit()
+    if not use_store and not os.path.exists(CSV_PATH):
+        print("Error: dataset.csv not found!")
+        exit()
+
+    # Pass 1: count rows per label
+    print("Pass 1: counting labels...")
+    total_rows = 0
+    counts = pd.Series(dtype=np.int64)
+    for chunk in read_chunks(use_store, chunk_rows):
+        total_rows += len(chunk)
+        labels = chunk[chunk.columns[-1]]
+        counts = counts.add(labels[labels.isin(VALID_LABELS)].value_counts(), fill_value=0)
+    counts = counts.astype(np.int64).sort_index()
+
+    print(f"Original row count: {total_rows}")
+    print(f"Rows removed (non-A-Z): {total_rows - counts.sum()}")
+    print(f"Cleaned row count: {counts.sum()}")
+    print("\nCounts per letter before balancing:")
+    print(counts)
+
+    if counts.empty:
+        print("Error: No data left after cleaning!")
+        return
+
+    target_count = int(counts.min())
+    print(f"\nTarget count per letter: {target_count}")
+
+    # For each label: the chosen positions within the label (sorted, for
+    # searchsorted) and where each lands in the concatenated balanced frame
+    selection = {}
+    for offset, letter in enumerate(counts.index):
+        chosen = np.random.RandomState(42).permutation(counts[letter])[:target_count]
+        order = np.argsort(chosen)
+        selection[letter] = (chosen[order], offset * target_count + order)
+
+    # Pass 2: keep the chosen rows, tagged with their slot
+    print("Pass 2: sampling...")
+    seen = dict.fromkeys(counts.index, 0)
+    kept, slots = [], []
+    for chunk in read_chunks(use_store, chunk_rows):
+        labels = chunk[chunk.columns[-1]]
+        for letter, rows in chunk[labels.isin(VALID_LABELS)].groupby(labels, sort=False):
+            chosen, chosen_slots = selection[letter]
+            positions = seen[letter] + np.arange(len(rows))
+            seen[letter] += len(rows)
+            idx = np.searchsorted(chosen, positions)
+            hit = (idx < len(chosen)) & (chosen[np.minimum(idx, len(chosen) - 1)] == positions)
+            if hit.any():
+                kept.append(rows[hit])
+                slots.append(chosen_slots[idx[hit]])
+
+    df_balanced = pd.concat(kept)
+
+    # Put rows in balanced-concat order, then shuffle with the same
+    # permutation as df.sample(frac=1, random_state=42) - in one take
+    order = np.argsort(np.concatenate(slots))[np.random.RandomState(42).permutation(len(df_balanced))]
+    df_balanced = df_balanced.iloc[order].reset_index(drop=True)
+    df_balanced.columns = range(df_balanced.shape[1])
+
+    print("\nFinal counts per letter:")
+    print(df_balanced.groupby(df_balanced.columns[-1]).size())
+
+    save_balanced(df_balanced, use_store)
+
+def save_balanced(df_balanced, use_store):
+    # Save (in the same format as the input)
+    if use_store:
+        output_path = 'balanced_dataset.lmk'
+        if os.path.exists(output_path):
+            os.remove(output_path)
+        with LandmarkWriter(output_path) as writer:
+            writer.append_many(df_balanced.iloc[:, :-1].values, df_balanced.iloc[:, -1].values)
+    else:
+        output_path = 'balanced_dataset.csv'
+        df_balanced.to_csv(output_path, header=False, index=False)
+    print(f"\nSaved balanced dataset to '{output_path}' with {len(df_balanced)} rows.")
 
 if __name__ == "__main__":
-    clean_and_balance()
+    parser = argparse.ArgumentParser(description="Keep A-Z labels and balance them to the rarest letter's count.")
+    parser.add_argument('--streaming', action='store_true',
+                        help="read the dataset in chunks (bounded memory, for datasets larger than RAM)")
+    parser.add_argument('--chunk-rows', type=int, default=100000)
+    args = parser.parse_args()
+    if args.streaming:
+        clean_and_balance_streaming(args.chunk_rows)
+    else:
+        clean_and_balance()
@@ -0,0 +1,154 @@
+import os
+
+import numpy as np
+
+# How a held sign becomes a letter in the sentence: 'vote' (default) or the
+# original fixed 'dwell' timer
+DECIDER = os.environ.get('SIGNBRIDGE_DECIDER', 'vote')
+
+DWELL_TIME = 1.0       # same letter held this long is appended
+
+# Voting decider settings
+VOTE_WINDOW = int(os.environ.get('SIGNBRIDGE_VOTE_WINDOW', 6))                 # frames in the ring buffer
+VOTE_MIN_VOTES = int(os.environ.get('SIGNBRIDGE_VOTE_MIN_VOTES', 4))           # frames whose top class must agree
+VOTE_FAST_CONFIDENCE = float(os.environ.get('SIGNBRIDGE_VOTE_FAST_CONFIDENCE', 0.8))
+VOTE_MIN_HOLD = float(os.environ.get('SIGNBRIDGE_VOTE_MIN_HOLD', 0.25))       # seconds, for fast commits
+VOTE_CONFIDENCE = float(os.environ.get('SIGNBRIDGE_VOTE_CONFIDENCE', 0.5))    # slower commits after DWELL_TIME
+VOTE_RELEASE = 0.3   # a committed letter can repeat once its mean probability falls below this
+
+
+class DwellDecider:
+    """Original rule: the same top prediction for more than DWELL_TIME commits it.
+
+    Any other prediction, even for one frame, restarts the timer.
+    """
+
+    name = 'dwell'
+
+    def __init__(self, dwell_time=DWELL_TIME):
+        self.dwell_time = dwell_time
+        self.reset()
+
+    def reset(self):
+        self.last_valid_prediction = None
+        self.stability_start_time = 0.0
+        self.is_sentence_appended = False
+
+    def update(self, best_prediction, hand_detected, now, proba=None, classes=None):
+        """Return the letter to append for this frame, or None."""
+        if not hand_detected:
+            self.last_valid_prediction = None
+            self.is_sentence_appended = False
+            return None
+        if not best_prediction:
+            return None
+
+        if best_prediction != self.last_valid_prediction:
+            # New prediction, reset timer
+            self.last_valid_prediction = best_prediction
+            self.stability_start_time = now
+            self.is_sentence_appended = False
+            return None
+        if now - self.stability_start_time > self.dwell_time and not self.is_sentence_appended:
+            self.is_sentence_appended = True
+            return best_prediction
+        return None
+
+
+class VotingDecider:
+    """Confidence-weighted vote over the class probabilities of the last `window` frames.
+
+    The probability rows sit in a fixed (window, n_classes) ring buffer;
+    frames without a hand count as all-zero rows. The leader is the class
+    with the highest mean probability over the window. It is committed
+    once at least `min_votes` frames had it on top and either
+      - its mean probability is >= fast_confidence and it has led for
+        min_hold seconds (a clear sign: a fraction of the dwell time), or
+      - its mean probability is >= confidence and it has led for
+        dwell_time (an unsure sign: the old timing, but flicker-tolerant).
+    Hysteresis: a committed letter is only committed again after its mean
+    probability drops below `release` (hand moved away or changed sign).
+    """
+
+    name = 'vote'
+
+    def __init__(self, window=VOTE_WINDOW, min_votes=VOTE_MIN_VOTES, fast_confidence=VOTE_FAST_CONFIDENCE,
+                 min_hold=VOTE_MIN_HOLD, confidence=VOTE_CONFIDENCE, dwell_time=DWELL_TIME,
+                 release=VOTE_RELEASE):
+        self.window = window
+        self.min_votes = min(min_votes, window)
+        self.fast_confidence = fast_confidence
+        self.min_hold = min_hold
+        self.confidence = confidence
+        self.dwell_time = dwell_time
+        self.release = release
+        self.classes = None
+        self._proba = None
+        self._top = np.full(window, -1, dtype=np.int32)
+        self.reset()
+
+    def reset(self):
+        if self._proba is not None:
+            self._proba.fill(0)
+        self._top.fill(-1)
+        self._pos = 0
+        self._leader = -1
+        self._leader_since = 0.0
+        self._latched = -1
+
+    def _use_classes(self, classes):
+        # Reallocate only when the model (and with it the class list) changes
+        if self.classes is not classes:
+            if self.classes is None or len(self.classes) != len(classes) or np.any(self.classes != classes):
+                self._proba = np.zeros((self.window, len(classes)), dtype=np.float32)
+                self.reset()
+            self.classes = classes
+
+    def update(self, best_prediction, hand_detected, now, proba=None, classes=None):
+        """Push one frame's probability row (None without a hand); return the letter to append, or None."""
+        if classes is not None:
+            self._use_classes(classes)
+        if self._proba is None or (hand_detected and proba is None):
+            return None   # no model output to vote with
+
+        slot = self._pos % self.window
+        self._pos += 1
+        if hand_detected:
+            self._proba[slot] = proba
+            self._top[slot] = int(np.argmax(proba))
+        else:
+            self._proba[slot] = 0.0
+            self._top[slot] = -1
+
+        mean = self._proba.sum(axis=0) / self.window
+        if self._latched >= 0 and mean[self._latched] < self.release:
+            self._latched = -1
+
+        leader = int(np.argmax(mean))
+        score = float(mean[leader])
+        if score <= 0.0:
+            self._leader = -1   # empty window: nobody leads
+            return None
+        if leader != self._leader:
+            self._leader, self._leader_since = leader, now
+        if leader == self._latched or not hand_detected:
+            return None
+
+        held = now - self._leader_since
+        if np.count_nonzero(self._top == leader) < self.min_votes:
+            return None
+        if ((score >= self.fast_confidence and held >= self.min_hold)
+                or (score >= self.confidence and held >= self.dwell_time)):
+            self._latched = leader
+            return self.classes[leader]
+        return None
+
+
+DECIDERS = {'dwell': DwellDecider, 'vote': VotingDecider}
+
+
+def make_decider(name=None):
+    name = name or DECIDER
+    if name not in DECIDERS:
+        raise ValueError(f"Unknown decider '{name}', expected one of {tuple(DECIDERS)}")
+    return DECIDERS[name]()
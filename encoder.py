@@ -0,0 +1,169 @@
+import os
+import time
+
+import cv2
+import numpy as np
+
+from events import format_sse
+
+# Defaults for /video_feed; each viewer can override them with query parameters
+JPEG_QUALITY = int(os.environ.get('SIGNBRIDGE_JPEG_QUALITY', 80))
+STREAM_SCALE = float(os.environ.get('SIGNBRIDGE_STREAM_SCALE', 1.0))
+STREAM_MAX_FPS = float(os.environ.get('SIGNBRIDGE_STREAM_MAX_FPS', 0))   # 0 = camera rate
+STREAM_ADAPTIVE = os.environ.get('SIGNBRIDGE_STREAM_ADAPTIVE', '1') != '0'
+LANDMARK_MAX_FPS = float(os.environ.get('SIGNBRIDGE_LANDMARK_MAX_FPS', 30))
+
+MIN_QUALITY = 35
+QUALITY_STEP_DOWN = 10
+QUALITY_STEP_UP = 5
+RECOVER_FRAMES = 30      # frames without falling behind before quality goes back up
+CHANGE_THRESHOLD = 6     # largest per-cell change (0-255) of the thumbnail that counts as motion
+KEYFRAME_INTERVAL = 1.0  # seconds; an unchanged frame is still sent this often
+THUMB_SIZE = (32, 24)
+FPS_JITTER = 0.9         # a frame up to 10% early still counts as on time for the FPS cap
+
+
+class FrameEncoder:
+    """Per-viewer JPEG encoder for the MJPEG stream.
+
+    encode() returns None for frames that need not be sent: over the FPS
+    cap, or with the same overlay text and (almost) the same pixels as the
+    last frame sent. In adaptive mode the JPEG quality drops whenever the
+    viewer missed frames since the last call (watched through the output
+    queue's drop count) and creeps back up once it keeps up again.
+    """
+
+    def __init__(self, quality=JPEG_QUALITY, scale=STREAM_SCALE, max_fps=STREAM_MAX_FPS,
+                 adaptive=STREAM_ADAPTIVE, change_threshold=CHANGE_THRESHOLD):
+        self.target_quality = min(max(int(quality), MIN_QUALITY), 100)
+        self.quality = self.target_quality
+        self.scale = min(max(float(scale), 0.1), 1.0)
+        self.min_interval = 1.0 / max_fps if max_fps > 0 else 0.0
+        self.adaptive = adaptive
+        self.change_threshold = change_threshold
+
+        self.output_queue = None
+        self._last_dropped = 0
+        self._good_frames = 0
+        self._last_sent_at = 0.0
+        self._last_thumb = None
+        self._last_overlay = None
+
+        self.started_at = time.time()
+        self.counts = {'encoded': 0, 'skipped_unchanged': 0, 'skipped_rate': 0, 'quality_drops': 0}
+        self.bytes_sent = 0
+
+    def watch(self, output_queue):
+        """Use a DropQueue's drop count as the 'viewer fell behind' signal."""
+        self.output_queue = output_queue
+        self._last_dropped = output_queue.dropped
+
+    def _adapt(self):
+        dropped = self.output_queue.dropped
+        if dropped > self._last_dropped:
+            self._last_dropped = dropped
+            self._good_frames = 0
+            if self.quality > MIN_QUALITY:
+                self.quality = max(MIN_QUALITY, self.quality - QUALITY_STEP_DOWN)
+                self.counts['quality_drops'] += 1
+            return
+        self._good_frames += 1
+        if self._good_frames >= RECOVER_FRAMES and self.quality < self.target_quality:
+            self.quality = min(self.target_quality, self.quality + QUALITY_STEP_UP)
+            self._good_frames = 0
+
+    def encode(self, frame, overlay_state=None, now=None):
+        """Return JPEG bytes for `frame`, or None if it should not be sent."""
+        now = time.time() if now is None else now
+        if self.adaptive and self.output_queue is not None:
+            self._adapt()
+
+        if now - self._last_sent_at < self.min_interval * FPS_JITTER:
+            self.counts['skipped_rate'] += 1
+            return None
+
+        # Each thumbnail cell averages a block of pixels: sensor noise cancels
+        # out, while a moving hand still shifts the cells along its edge.
+        gray = cv2.cvtColor(frame, cv2.COLOR_BGR2GRAY) if frame.ndim == 3 else frame
+        thumb = cv2.resize(gray, THUMB_SIZE, interpolation=cv2.INTER_AREA).astype(np.int16)
+        if (self._last_thumb is not None
+                and overlay_state == self._last_overlay
+                and now - self._last_sent_at < KEYFRAME_INTERVAL
+                and np.abs(thumb - self._last_thumb).max() < self.change_threshold):
+            self.counts['skipped_unchanged'] += 1
+            return None
+
+        if self.scale < 1.0:
+            frame = cv2.resize(frame, None, fx=self.scale, fy=self.scale, interpolation=cv2.INTER_AREA)
+        ret, buffer = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, self.quality])
+        if not ret:
+            return None
+
+        self._last_thumb = thumb
+        self._last_overlay = overlay_state
+        self._last_sent_at = now
+        self.counts['encoded'] += 1
+        self.bytes_sent += len(buffer)
+        return buffer.tobytes()
+
+    def stats(self):
+        elapsed = max(time.time() - self.started_at, 1e-6)
+        return {
+            **self.counts,
+            'quality': self.quality,
+            'target_quality': self.target_quality,
+            'scale': self.scale,
+            'max_fps': round(1.0 / self.min_interval, 2) if self.min_interval else 0,
+            'bytes_sent': self.bytes_sent,
+            'bytes_per_s': round(self.bytes_sent / elapsed),
+        }
+
+
+class LandmarkEncoder:
+    """Turns per-frame recognition results into Server-Sent Events for /landmark_feed.
+
+    The browser shows its own camera preview and draws the hands from
+    these events, so nothing is drawn or JPEG-encoded on the server. A
+    payload identical to the last one sent (typically: no hand in view)
+    is only repeated once per KEYFRAME_INTERVAL.
+    """
+
+    def __init__(self, max_fps=LANDMARK_MAX_FPS):
+        self.min_interval = 1.0 / max_fps if max_fps > 0 else 0.0
+        self.output_queue = None
+        self._last_sent_at = 0.0
+        self._last_payload = None
+
+        self.started_at = time.time()
+        self.counts = {'sent': 0, 'skipped_unchanged': 0, 'skipped_rate': 0}
+        self.bytes_sent = 0
+
+    def watch(self, output_queue):
+        self.output_queue = output_queue
+
+    def encode(self, payload, now=None):
+        """Return the SSE bytes for `payload`, or None if it should not be sent."""
+        now = time.time() if now is None else now
+        if now - self._last_sent_at < self.min_interval * FPS_JITTER:
+            self.counts['skipped_rate'] += 1
+            return None
+        if payload == self._last_payload and now - self._last_sent_at < KEYFRAME_INTERVAL:
+            self.counts['skipped_unchanged'] += 1
+            return None
+
+        self._last_payload = payload
+        self._last_sent_at = now
+        data = format_sse('landmarks', payload).encode('utf-8')
+        self.counts['sent'] += 1
+        self.bytes_sent += len(data)
+        return data
+
+    def stats(self):
+        elapsed = max(time.time() - self.started_at, 1e-6)
+        return {
+            **self.counts,
+            'dropped': self.output_queue.dropped if self.output_queue is not None else 0,
+            'max_fps': round(1.0 / self.min_interval, 2) if self.min_interval else 0,
+            'bytes_sent': self.bytes_sent,
+            'bytes_per_s': round(self.bytes_sent / elapsed),
+        }
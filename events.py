@@ -0,0 +1,140 @@
+import json
+import threading
+import time
+from collections import OrderedDict
+
+KEEPALIVE_INTERVAL = 15.0   # seconds between SSE comments on an idle stream
+
+
+class Subscription:
+    """Pending events for one client, coalesced so only the newest of each kind is kept.
+
+    Every event carries the full state (current word + sentence, whole
+    history), so a slow client that misses intermediate updates loses
+    nothing by skipping straight to the latest one.
+    """
+
+    def __init__(self, channels):
+        self.channels = tuple(channels)
+        self._pending = OrderedDict()   # (channel, event) -> data
+        self._cond = threading.Condition()
+        self._closed = False
+
+    def push(self, channel, event, data):
+        with self._cond:
+            if self._closed:
+                return
+            self._pending.pop((channel, event), None)
+            self._pending[(channel, event)] = data
+            self._cond.notify()
+
+    def get(self, timeout=None):
+        """Return a list of (event, data) pairs; empty on timeout or close."""
+        with self._cond:
+            if not self._pending and not self._closed:
+                self._cond.wait(timeout)
+            items = [(event, data) for (_, event), data in self._pending.items()]
+            self._pending.clear()
+            return items
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    @property
+    def closed(self):
+        return self._closed
+
+
+class EventHub:
+    """Fans state changes out to Server-Sent Events subscribers.
+
+    publish() drops updates identical to the last one on the same channel,
+    so callers can publish on every frame and clients only hear about
+    actual changes. New subscribers start with the latest state.
+    """
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._subscribers = {}   # channel -> set of Subscription
+        self._latest = {}        # (channel, event) -> data
+        self.published = 0
+        self.suppressed = 0
+
+    def publish(self, channel, event, data, remember=True):
+        """Send `data` to every subscriber of `channel`; returns False if nothing changed.
+
+        remember=False is for one-off notifications: they are neither
+        de-duplicated nor replayed to clients that subscribe later.
+        """
+        key = (channel, event)
+        with self._lock:
+            if remember:
+                if self._latest.get(key) == data:
+                    self.suppressed += 1
+                    return False
+                self._latest[key] = data
+            self.published += 1
+            subscribers = list(self._subscribers.get(channel, ()))
+        for subscription in subscribers:
+            subscription.push(channel, event, data)
+        return True
+
+    def subscribe(self, channels):
+        subscription = Subscription(channels)
+        with self._lock:
+            for channel in subscription.channels:
+                self._subscribers.setdefault(channel, set()).add(subscription)
+            latest = [(key, data) for key, data in self._latest.items() if key[0] in subscription.channels]
+        for (channel, event), data in latest:
+            subscription.push(channel, event, data)
+        return subscription
+
+    def unsubscribe(self, subscription):
+        subscription.close()
+        with self._lock:
+            for channel in subscription.channels:
+                subscribers = self._subscribers.get(channel)
+                if subscribers is not None:
+                    subscribers.discard(subscription)
+                    if not subscribers:
+                        del self._subscribers[channel]
+
+    def forget(self, channel):
+        """Drop the remembered state of a channel that no longer exists."""
+        with self._lock:
+            for key in [key for key in self._latest if key[0] == channel]:
+                del self._latest[key]
+
+    def get_stats(self):
+        with self._lock:
+            return {
+                'channels': len(self._subscribers),
+                'subscribers': sum(len(s) for s in self._subscribers.values()),
+                'published': self.published,
+                'suppressed': self.suppressed,
+            }
+
+
+def format_sse(event, data):
+    return f"event: {event}\ndata: {json.dumps(data)}\n\n"
+
+
+def stream(hub, subscription, keepalive=KEEPALIVE_INTERVAL):
+    """Generator of SSE text for a Flask Response; unsubscribes when the client goes away."""
+    try:
+        # Ask the browser to wait a second before reconnecting after a drop
+        yield "retry: 1000\n\n"
+        last_sent = time.time()
+        while not subscription.closed:
+            items = subscription.get(timeout=keepalive)
+            if items:
+                yield ''.join(format_sse(event, data) for event, data in items)
+                last_sent = time.time()
+            elif time.time() - last_sent >= keepalive:
+                # Comment line keeps proxies from timing out and detects dead clients
+                yield ": keepalive\n\n"
+                last_sent = time.time()
+    finally:
+        hub.unsubscribe(subscription)
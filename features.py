@@ -0,0 +1,147 @@
+import os
+import time
+
+import numpy as np
+
+NUM_LANDMARKS = 21
+NUM_FEATURES = NUM_LANDMARKS * 3  # x, y, z per landmark
+MIDDLE_MCP = 9  # middle-finger knuckle, the hand-size reference
+
+# Prediction cache: reuse the last probabilities while no landmark moved more
+# than this (normalized image units, 0 disables) and for at most this many frames
+CACHE_TOLERANCE = float(os.environ.get('SIGNBRIDGE_PREDICTION_CACHE_TOLERANCE', 0.004))
+CACHE_MAX_REUSE = int(os.environ.get('SIGNBRIDGE_PREDICTION_CACHE_MAX_REUSE', 10))
+
+
+def landmarks_to_array(hand_landmarks_list):
+    """Stack MediaPipe hand landmarks into one (n_hands, 63) float32 array.
+
+    Rows are laid out as x0, y0, z0, x1, y1, z1, ... - the same order as
+    the columns of dataset.csv.
+    """
+    if not hand_landmarks_list:
+        return np.empty((0, NUM_FEATURES), dtype=np.float32)
+    return np.array(
+        [[(landmark.x, landmark.y, landmark.z) for landmark in hand] for hand in hand_landmarks_list],
+        dtype=np.float32
+    ).reshape(len(hand_landmarks_list), NUM_FEATURES)
+
+
+def normalize_none(features):
+    return features
+
+
+def normalize_wrist(features):
+    """Wrist-relative, scale-invariant landmarks.
+
+    Every landmark is taken relative to the wrist (landmark 0) and divided
+    by the wrist -> middle-finger knuckle (landmark 9) distance in the
+    image plane, so neither where the hand is in the frame nor how close
+    it is to the camera changes the features.
+    """
+    points = np.asarray(features, dtype=np.float32).reshape(-1, NUM_LANDMARKS, 3)
+    points = points - points[:, :1]
+    size = np.sqrt(np.square(points[:, MIDDLE_MCP, :2]).sum(axis=1))
+    points /= np.maximum(size, 1e-6)[:, None, None]
+    return points.reshape(-1, NUM_FEATURES)
+
+
+# Feature normalizations an inference artifact can bundle
+NORMALIZERS = {'none': normalize_none, 'wrist': normalize_wrist}
+
+
+def predict_best_proba(model, features):
+    """Classify every hand with a single predict_proba call.
+
+    Any feature normalization is done inside the engine (see
+    classifier_engine.FusedEngine). Returns (prediction, confidence,
+    probability row) of the most confident hand, or (None, -1.0, None)
+    when there are no hands.
+    """
+    if len(features) == 0:
+        return None, -1.0, None
+
+    proba = model.predict_proba(features)
+
+    # argmax over the flattened (hands x classes) matrix picks the most
+    # confident hand; ties go to the first hand, as in the per-hand loop.
+    hand_idx, class_idx = np.unravel_index(np.argmax(proba), proba.shape)
+    return model.classes_[class_idx], float(proba[hand_idx, class_idx]), proba[hand_idx]
+
+
+def predict_best(model, features):
+    """(prediction, confidence) of the most confident hand, or (None, -1.0)."""
+    prediction, confidence, _ = predict_best_proba(model, features)
+    return prediction, confidence
+
+
+class PredictionCache:
+    """Per-session memo of the last predict_best_proba() result.
+
+    While a sign is held, consecutive frames give nearly identical
+    landmarks. A frame whose landmarks are all within `tolerance` of the
+    ones last classified (same model, same number of hands) reuses that
+    result. The comparison is against the classified frame, not the
+    previous one, so a slow drift still refreshes it. After `max_reuse`
+    reuses the model is run again anyway.
+    """
+
+    def __init__(self, tolerance=CACHE_TOLERANCE, max_reuse=CACHE_MAX_REUSE):
+        self.tolerance = tolerance
+        self.max_reuse = max_reuse
+        self.hits = 0
+        self.misses = 0
+        self.inference_seconds = 0.0   # spent in the model on misses
+        self.last_hit = False
+        self.clear()
+
+    def clear(self):
+        self._model = None
+        self._features = None
+        self._result = None
+        self._reused = 0
+
+    def predict(self, model, features):
+        """predict_best_proba(model, features), from the cache when the hands barely moved."""
+        if len(features) == 0:
+            self.clear()   # the next hand is always classified afresh
+            self.last_hit = False
+            return None, -1.0, None
+
+        cached = self._features
+        if (cached is not None and model is self._model and cached.shape == features.shape
+                and self._reused < self.max_reuse
+                and float(np.max(np.abs(features - cached))) <= self.tolerance):
+            self._reused += 1
+            self.hits += 1
+            self.last_hit = True
+            return self._result
+
+        start = time.perf_counter()
+        result = predict_best_proba(model, features)
+        self.inference_seconds += time.perf_counter() - start
+        self.misses += 1
+        self.last_hit = False
+        if self.tolerance > 0:
+            self._model, self._features, self._result = model, np.array(features, dtype=np.float32), result
+            self._reused = 0
+        return result
+
+    def mean_inference_seconds(self):
+        return self.inference_seconds / self.misses if self.misses else 0.0
+
+    def stats(self):
+        """Hit rate and the model time saved (hits x mean miss time)."""
+        calls = self.hits + self.misses
+        return {
+            'hits': self.hits,
+            'misses': self.misses,
+            'hit_rate': round(self.hits / calls, 4) if calls else 0.0,
+            'inference_ms': round(self.inference_seconds * 1000, 3),
+            'saved_ms': round(self.hits * self.mean_inference_seconds() * 1000, 3)
+        }
+
+
+def pack_landmarks(features):
+    """Compact wire format for the browser: per hand, 63 ints in thousandths of a unit."""
+    return np.rint(np.asarray(features) * 1000).astype(np.int32).tolist()
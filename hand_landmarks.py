@@ -3,8 +3,8 @@ import mediapipe as mp
 import cv2
 import mediapipe as mp
 import time
-import csv
 import os
+from landmark_store import CSV_PATH, LandmarkWriter, STORE_PATH, convert_csv
 from mediapipe.tasks import python
 from mediapipe.tasks.python import vision
 
@@ -30,7 +30,14 @@ def main():
     
     print("✅ Webcam opened! Press 'q' to exit")
     
-    with HandLandmarker.create_from_options(options) as landmarker:
+    # A new store starts from the existing CSV samples, so training on it keeps them
+    if not os.path.exists(STORE_PATH) and os.path.exists(CSV_PATH):
+        rows = convert_csv(CSV_PATH, STORE_PATH)
+        print(f"Imported {rows} samples from '{CSV_PATH}' into '{STORE_PATH}'.")
+
+    # Samples are buffered in memory and appended to dataset.lmk in batches;
+    # the with-block flushes them even on Ctrl-C or an error
+    with LandmarkWriter(STORE_PATH) as writer, HandLandmarker.create_from_options(options) as landmarker:
         while cap.isOpened():
             success, frame = cap.read()
             if not success:
@@ -104,24 +111,13 @@ def main():
                     
                     # Determine label
                     label = chr(key).upper()
-                    row.append(label)
                     
-                    # Save to CSV
-                    file_exists = os.path.isfile('dataset.csv')
-                    with open('dataset.csv', mode='a', newline='') as f:
-                        writer = csv.writer(f)
-                        # Optional: write header if new file, but requirement says just append row
-                        # if not file_exists:
-                        #    header = []
-                        #    for i in range(21):
-                        #        header.extend([f'x{i}', f'y{i}', f'z{i}'])
-                        #    header.append('label')
-                        #    writer.writerow(header)
-                        
-                        writer.writerow(row)
+                    # Save to the landmark store (no file I/O until the buffer fills)
+                    writer.append(row, label)
                     
                     print(f"Saved sample for {label}")
     
+    print(f"{writer.rows_written} samples written to '{STORE_PATH}'.")
     cap.release()
     cv2.destroyAllWindows()
 
@@ -0,0 +1,233 @@
+import argparse
+import os
+import struct
+
+import numpy as np
+
+from features import NUM_FEATURES
+
+# File layout: a 64-byte header, then rows of 64 little-endian float32 values,
+# x0, y0, z0 ... z20 (the dataset.csv column order) and the label's code point.
+MAGIC = b'SBLMK\x00\x01\x00'   # name + format version
+HEADER_SIZE = 64
+ROW_WIDTH = NUM_FEATURES + 1
+ROW_BYTES = ROW_WIDTH * 4
+DTYPE = np.dtype('<f4')
+
+STORE_PATH = 'dataset.lmk'
+CSV_PATH = 'dataset.csv'
+
+
+def _header():
+    return MAGIC + struct.pack('<I', ROW_WIDTH) + b'\x00' * (HEADER_SIZE - len(MAGIC) - 4)
+
+
+def _check_header(f, path):
+    header = f.read(HEADER_SIZE)
+    if len(header) < HEADER_SIZE or header[:len(MAGIC)] != MAGIC:
+        raise ValueError(f"{path} is not a landmark store")
+    (width,) = struct.unpack_from('<I', header, len(MAGIC))
+    if width != ROW_WIDTH:
+        raise ValueError(f"{path} has {width} columns per row, expected {ROW_WIDTH}")
+
+
+def encode_labels(labels):
+    """Single-character labels -> float32 code points for the label column."""
+    labels = [str(label) for label in labels]
+    bad = sorted({label for label in labels if len(label) != 1})
+    if bad:
+        raise ValueError(f"Labels must be single characters, got {bad[:5]}")
+    return np.fromiter((ord(label) for label in labels), dtype=DTYPE, count=len(labels))
+
+
+def decode_labels(codes):
+    """Label column -> array of label strings (decodes each distinct code once)."""
+    unique, inverse = np.unique(np.asarray(codes), return_inverse=True)
+    return np.array([chr(int(code)) for code in unique])[inverse]
+
+
+def open_store(path=STORE_PATH):
+    """Memory-map a store as a read-only (n_rows, 64) float32 array.
+
+    A partially written last row (e.g. after a crash) is ignored.
+    """
+    with open(path, 'rb') as f:
+        _check_header(f, path)
+    n_rows = store_rows(path)
+    if n_rows == 0:
+        return np.empty((0, ROW_WIDTH), dtype=DTYPE)
+    return np.memmap(path, dtype=DTYPE, mode='r', offset=HEADER_SIZE, shape=(n_rows, ROW_WIDTH))
+
+
+def load_store(path=STORE_PATH):
+    """Return (X, y): X is a zero-copy (n, 63) view of the file, y the decoded labels."""
+    rows = open_store(path)
+    return rows[:, :NUM_FEATURES], decode_labels(rows[:, NUM_FEATURES])
+
+
+def store_rows(path=STORE_PATH):
+    return max(0, (os.path.getsize(path) - HEADER_SIZE) // ROW_BYTES)
+
+
+def csv_rows(path=CSV_PATH):
+    """Line count of a headerless CSV, without parsing it."""
+    rows = 0
+    last = b'\n'
+    with open(path, 'rb') as f:
+        for block in iter(lambda: f.read(1 << 20), b''):
+            rows += block.count(b'\n')
+            last = block[-1:]
+    return rows + (last != b'\n')
+
+
+def check_store_covers_csv(store_path=STORE_PATH, csv_path=CSV_PATH):
+    """Refuse a store that holds fewer rows than the CSV next to it.
+
+    That is a store started without the CSV history (older capture runs);
+    training on it would silently drop every CSV sample.
+    """
+    if os.path.exists(store_path) and os.path.exists(csv_path):
+        in_store, in_csv = store_rows(store_path), csv_rows(csv_path)
+        if in_store < in_csv:
+            raise ValueError(f"{store_path} has {in_store} rows but {csv_path} has {in_csv}: it was started "
+                             f"without the CSV samples. Merge the two or remove the one you don't want.")
+
+
+def load_dataset(path=None):
+    """Load (X, y) from a .lmk store or a headerless CSV.
+
+    With no path, dataset.lmk is used when it exists, else dataset.csv.
+    Raises ValueError if dataset.lmk has fewer rows than dataset.csv.
+    """
+    if path is None:
+        check_store_covers_csv()
+        path = STORE_PATH if os.path.exists(STORE_PATH) else CSV_PATH
+    if not path.endswith('.csv'):
+        return load_store(path)
+
+    import pandas as pd
+    df = pd.read_csv(path, header=None)
+    return df.iloc[:, :-1].values.astype(np.float32), df.iloc[:, -1].astype(str).values
+
+
+def iter_chunks(path=STORE_PATH, chunk_rows=65536):
+    """Yield (X, y) blocks of at most chunk_rows rows from a store.
+
+    Reads sequentially instead of through a memory map, so a pass over a
+    store larger than RAM keeps only one block resident.
+    """
+    with open(path, 'rb') as f:
+        _check_header(f, path)
+        while True:
+            block = np.fromfile(f, dtype=DTYPE, count=chunk_rows * ROW_WIDTH)
+            n_rows = len(block) // ROW_WIDTH
+            if n_rows == 0:
+                return
+            block = block[:n_rows * ROW_WIDTH].reshape(n_rows, ROW_WIDTH)
+            yield block[:, :NUM_FEATURES], decode_labels(block[:, NUM_FEATURES])
+
+
+class LandmarkWriter:
+    """Buffered appender for a landmark store.
+
+    append() only copies the row into memory; rows reach the file in one
+    write per `buffer_rows` samples and on flush()/close(), so a capture
+    loop never waits on disk for a keypress.
+    """
+
+    def __init__(self, path=STORE_PATH, buffer_rows=16):
+        self.path = path
+        self._buffer = np.empty((buffer_rows, ROW_WIDTH), dtype=DTYPE)
+        self._pending = 0
+        self.rows_written = 0
+
+        is_new = not os.path.exists(path) or os.path.getsize(path) == 0
+        if not is_new:
+            with open(path, 'rb') as f:
+                _check_header(f, path)
+        self._file = open(path, 'ab')
+        if is_new:
+            self._file.write(_header())
+            self._file.flush()
+        else:
+            # Drop a torn row left by an interrupted write so appends stay aligned
+            torn = (os.path.getsize(path) - HEADER_SIZE) % ROW_BYTES
+            if torn:
+                self._file.truncate(os.path.getsize(path) - torn)
+
+    def append(self, features, label):
+        """Queue one sample: 63 landmark values and a single-character label."""
+        row = self._buffer[self._pending]
+        row[:NUM_FEATURES] = np.asarray(features, dtype=DTYPE).reshape(NUM_FEATURES)
+        row[NUM_FEATURES] = encode_labels([label])[0]
+        self._pending += 1
+        if self._pending == len(self._buffer):
+            self.flush()
+
+    def append_many(self, X, labels):
+        self.flush()
+        block = np.empty((len(X), ROW_WIDTH), dtype=DTYPE)
+        block[:, :NUM_FEATURES] = X
+        block[:, NUM_FEATURES] = encode_labels(labels)
+        self._file.write(block.tobytes())
+        self.rows_written += len(block)
+
+    def flush(self):
+        if self._pending:
+            self._file.write(self._buffer[:self._pending].tobytes())
+            self.rows_written += self._pending
+            self._pending = 0
+        self._file.flush()
+
+    def close(self):
+        if not self._file.closed:
+            self.flush()
+            self._file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+def convert_csv(csv_path=CSV_PATH, store_path=STORE_PATH, chunksize=100000):
+    """One-shot conversion of a headerless landmark CSV into a new store."""
+    import pandas as pd
+
+    if os.path.exists(store_path):
+        raise FileExistsError(f"{store_path} already exists")
+    rows = 0
+    with LandmarkWriter(store_path) as writer:
+        for chunk in pd.read_csv(csv_path, header=None, chunksize=chunksize):
+            if chunk.shape[1] != ROW_WIDTH:
+                raise ValueError(f"{csv_path} has {chunk.shape[1]} columns, expected {ROW_WIDTH}")
+            writer.append_many(chunk.iloc[:, :NUM_FEATURES].values, chunk.iloc[:, -1].astype(str).values)
+            rows += len(chunk)
+    return rows
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Convert a landmark CSV into the binary store (or inspect a store).")
+    parser.add_argument('source', nargs='?', default=CSV_PATH, help="CSV to convert, or a .lmk store to inspect")
+    parser.add_argument('output', nargs='?', default=STORE_PATH)
+    args = parser.parse_args()
+
+    if not args.source.endswith('.csv'):
+        X, y = load_store(args.source)
+        labels, counts = np.unique(y, return_counts=True)
+        print(f"{args.source}: {len(X)} rows")
+        print(', '.join(f"{label}: {count}" for label, count in zip(labels, counts)))
+        return
+
+    try:
+        rows = convert_csv(args.source, args.output)
+    except (FileNotFoundError, FileExistsError, ValueError) as e:
+        print(f"Error: {e}")
+        return
+    print(f"Converted {rows} rows from '{args.source}' to '{args.output}' "
+          f"({os.path.getsize(args.output) / 1024:.1f} KB).")
+
+
+if __name__ == "__main__":
+    main()
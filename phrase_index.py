@@ -0,0 +1,94 @@
+import os
+import threading
+
+VIDEO_EXTENSIONS = ('.mp4', '.avi')
+
+_END = ''  # trie key holding the filename of a phrase that ends at this node
+
+
+class PhraseIndex:
+    """Word-level trie over the ISL video library.
+
+    Built once and rebuilt only when the folder's mtime changes (a file
+    was added, removed or renamed), so each request costs one stat() plus
+    a single left-to-right walk over the sentence.
+    """
+
+    def __init__(self, folder, extensions=VIDEO_EXTENSIONS):
+        self.folder = folder
+        self.extensions = extensions
+        self.videos = []       # sorted filenames, for the tutorial page
+        self._trie = {}
+        self._signature = None
+        self._lock = threading.Lock()
+
+    def _current_signature(self):
+        try:
+            return os.stat(self.folder).st_mtime_ns
+        except OSError:
+            return None
+
+    def refresh(self):
+        """Rebuild the trie if the folder changed since the last build."""
+        signature = self._current_signature()
+        if signature == self._signature and self._signature is not None:
+            return
+        with self._lock:
+            if signature == self._signature and self._signature is not None:
+                return
+            videos = []
+            trie = {}
+            if signature is not None:
+                for f in sorted(os.listdir(self.folder)):
+                    if not f.lower().endswith(self.extensions):
+                        continue
+                    videos.append(f)
+                    # Get name without extension, one trie level per word
+                    node = trie
+                    for word in os.path.splitext(f)[0].lower().split():
+                        node = node.setdefault(word, {})
+                    node[_END] = f
+            self.videos, self._trie, self._signature = videos, trie, signature
+
+    def segment(self, sentence):
+        """Split a sentence into video segments (longest known phrase first) and letter segments."""
+        self.refresh()
+        trie = self._trie
+        words = sentence.split()
+        segments = []
+        i = 0
+
+        while i < len(words):
+            # Walk the trie as far as the words allow, remembering the last full phrase
+            node = trie
+            match_end, filename = None, None
+            j = i
+            while j < len(words):
+                node = node.get(words[j].lower())
+                if node is None:
+                    break
+                j += 1
+                if _END in node:
+                    match_end, filename = j, node[_END]
+
+            if match_end is not None:
+                segments.append({
+                    'type': 'video',
+                    'filename': filename,
+                    'text': ' '.join(words[i:match_end])
+                })
+                i = match_end
+                continue
+
+            # No video match, add as letters
+            word = words[i]
+            letters = [c.upper() for c in word if c.isalpha()]
+            if letters:
+                segments.append({
+                    'type': 'letters',
+                    'letters': letters,
+                    'text': word
+                })
+            i += 1
+
+        return segments
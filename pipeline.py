@@ -0,0 +1,244 @@
+import threading
+import time
+from collections import deque
+
+
+class DropQueue:
+    """Bounded hand-off queue that drops the oldest item instead of blocking the producer."""
+
+    def __init__(self, maxsize=1):
+        self.maxsize = max(1, int(maxsize))
+        self.dropped = 0
+        self._items = deque()
+        self._cond = threading.Condition()
+        self._closed = False
+
+    def put(self, item):
+        with self._cond:
+            if self._closed:
+                return
+            # A stale frame is worth less than a fresh one, so make room by
+            # discarding from the head rather than making the producer wait.
+            while len(self._items) >= self.maxsize:
+                self._items.popleft()
+                self.dropped += 1
+            self._items.append(item)
+            self._cond.notify()
+
+    def get(self, timeout=None):
+        """Return the next item, or None if the queue was closed or the wait timed out."""
+        with self._cond:
+            if not self._items and not self._closed:
+                self._cond.wait(timeout)
+            if self._items:
+                return self._items.popleft()
+            return None
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+
+    @property
+    def closed(self):
+        return self._closed
+
+    def __len__(self):
+        return len(self._items)
+
+
+class IdleThrottle:
+    """Drops the camera to a low frame rate after `idle_after` seconds without a hand.
+
+    `last_active()` returns when a hand was last seen (time.time()). The
+    capture stage asks plan() about every camera frame:
+      - 'process': full detection, drawing and encoding,
+      - 'show': drawn and streamed as a no-hand frame without detection,
+      - 'skip': only grabbed from the camera, never decoded.
+    Active: every frame is 'process'. Idle: one 'process' probe every
+    1/probe_fps seconds, one 'show' frame every 1/stream_fps seconds, the
+    rest 'skip'. The first probe that finds a hand makes it active again.
+    stream_fps 0 streams only the probes; idle_after 0 never goes idle.
+    """
+
+    def __init__(self, last_active, idle_after=5.0, probe_fps=4.0, stream_fps=5.0):
+        if idle_after > 0 and probe_fps <= 0:
+            raise ValueError(f"Idle probe rate must be above 0 fps, got {probe_fps:g} "
+                             f"(set idle_after to 0 to disable idle mode)")
+        self.last_active = last_active
+        self.idle_after = idle_after
+        self.probe_interval = 1.0 / probe_fps if probe_fps > 0 else None
+        # Probes are streamed too, so a stream rate below theirs adds nothing
+        self.stream_interval = 1.0 / max(stream_fps, probe_fps) if stream_fps > 0 else None
+        self.idle_since = None
+        self.idle_seconds = 0.0   # completed idle periods
+        self.idle_periods = 0
+        self.counts = {'process': 0, 'show': 0, 'skip': 0}
+        self._next_probe = 0.0
+        self._next_show = 0.0
+
+    @property
+    def idle(self):
+        return self.idle_since is not None
+
+    def plan(self, now):
+        mode = self._plan(now)
+        self.counts[mode] += 1
+        return mode
+
+    def _plan(self, now):
+        if self.idle_after <= 0 or now - self.last_active() < self.idle_after:
+            if self.idle_since is not None:
+                self.idle_seconds += now - self.idle_since
+                self.idle_since = None
+                print("Idle mode off: hand detected, back to full frame rate.")
+            return 'process'
+
+        if self.idle_since is None:
+            self.idle_since = now
+            self.idle_periods += 1
+            self._next_probe = self._next_show = now
+            print(f"Idle mode on: no hand for {self.idle_after:g} s.")
+        if now >= self._next_probe:
+            self._next_probe = now + self.probe_interval
+            self._next_show = now + (self.stream_interval or 0.0)
+            return 'process'
+        if self.stream_interval is not None and now >= self._next_show:
+            self._next_show = now + self.stream_interval
+            return 'show'
+        return 'skip'
+
+    def stats(self):
+        now = time.time()
+        return {
+            'idle': self.idle,
+            'idle_periods': self.idle_periods,
+            'idle_s': round(self.idle_seconds + (now - self.idle_since if self.idle_since else 0.0), 2),
+            'frames': dict(self.counts),
+        }
+
+
+class FramePipeline:
+    """Runs capture, processing and encoding on their own threads.
+
+    Stages are joined by DropQueues, so throughput is set by the slowest
+    stage and every stage always works on the freshest frame available.
+    With an IdleThrottle, process_frame(frame, timestamp_ms, detect) is
+    told whether to run detection, and frames the throttle skips are
+    only grabbed (`grab_frame`, e.g. cv2.VideoCapture.grab) so the next
+    frame read is a fresh one.
+    """
+
+    STAGES = ('capture', 'process', 'encode')
+
+    def __init__(self, read_frame, process_frame, encode_frame, queue_size=1, throttle=None, grab_frame=None):
+        self.read_frame = read_frame
+        self.process_frame = process_frame
+        self.encode_frame = encode_frame
+        self.throttle = throttle
+        self.grab_frame = grab_frame
+
+        # Queue names match the stage that consumes them; 'output' feeds the client.
+        self.queues = {
+            'process': DropQueue(queue_size),
+            'encode': DropQueue(queue_size),
+            'output': DropQueue(queue_size),
+        }
+        self.frame_counts = dict.fromkeys(self.STAGES, 0)
+        self.started_at = None
+        self._stop = threading.Event()
+        self._threads = []
+
+    # --- Stages ---
+    def _capture_loop(self):
+        last_ts = 0
+        while not self._stop.is_set():
+            mode = self.throttle.plan(time.time()) if self.throttle else 'process'
+            if mode == 'skip':
+                success = self.grab_frame() if self.grab_frame else self.read_frame()[0]
+                if not success:
+                    break
+                continue
+            success, frame = self.read_frame()
+            if not success:
+                break
+            # detect_for_video needs strictly increasing timestamps
+            timestamp_ms = max(int(time.time() * 1000), last_ts + 1)
+            last_ts = timestamp_ms
+            self.frame_counts['capture'] += 1
+            self.queues['process'].put((timestamp_ms, frame, mode == 'process'))
+        # End of input: let the downstream stages drain what is already queued
+        self.queues['process'].close()
+
+    def _process_loop(self):
+        if self.throttle:
+            self._run_stage('process', lambda item: self.process_frame(item[1], item[0], item[2]), 'encode')
+        else:
+            self._run_stage('process', lambda item: self.process_frame(item[1], item[0]), 'encode')
+
+    def _encode_loop(self):
+        self._run_stage('encode', self.encode_frame, 'output')
+
+    def _run_stage(self, name, fn, next_queue):
+        source = self.queues[name]
+        while not self._stop.is_set():
+            item = source.get(timeout=0.5)
+            if item is None:
+                if source.closed:
+                    break
+                continue
+            try:
+                result = fn(item)
+            except Exception as e:
+                print(f"Pipeline {name} error: {e}")
+                continue
+            self.frame_counts[name] += 1
+            if result is not None:
+                self.queues[next_queue].put(result)
+        self.queues[next_queue].close()
+
+    # --- Lifecycle ---
+    def start(self):
+        self.started_at = time.time()
+        for name, target in (('capture', self._capture_loop),
+                             ('process', self._process_loop),
+                             ('encode', self._encode_loop)):
+            thread = threading.Thread(target=target, name=f"pipeline-{name}", daemon=True)
+            thread.start()
+            self._threads.append(thread)
+        return self
+
+    def stop(self):
+        self._stop.set()
+        for queue in self.queues.values():
+            queue.close()
+
+    def join(self, timeout=2.0):
+        for thread in self._threads:
+            if thread is not threading.current_thread():
+                thread.join(timeout)
+
+    def outputs(self):
+        """Yield encoded frames until the pipeline stops."""
+        output = self.queues['output']
+        while True:
+            item = output.get(timeout=0.5)
+            if item is None:
+                if output.closed:
+                    return
+                continue
+            yield item
+
+    def stats(self):
+        """Snapshot of queue depths, drop counts and per-stage FPS."""
+        elapsed = max(time.time() - (self.started_at or time.time()), 1e-6)
+        return {
+            'running': any(thread.is_alive() for thread in self._threads),
+            'uptime_s': round(elapsed, 2),
+            'queue_depth': {name: len(q) for name, q in self.queues.items()},
+            'queue_size': {name: q.maxsize for name, q in self.queues.items()},
+            'dropped': {name: q.dropped for name, q in self.queues.items()},
+            'frames': dict(self.frame_counts),
+            'fps': {name: round(count / elapsed, 1) for name, count in self.frame_counts.items()},
+            'idle': self.throttle.stats() if self.throttle else None,
+        }
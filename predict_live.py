@@ -1,7 +1,5 @@
 import cv2
 import mediapipe as mp
-import numpy as np
-import pandas as pd
 import joblib
 import time
 from sklearn.neighbors import KNeighborsClassifier
@@ -9,28 +7,60 @@ from sklearn.model_selection import train_test_split
 from mediapipe.tasks import python
 from mediapipe.tasks.python import vision
 import pyttsx3
+import os
+from features import landmarks_to_array, predict_best
+from classifier_engine import (ARTIFACT_FILE, DEFAULT_BACKEND, ENGINE_FILE, META_FILE, FusedEngine, SklearnEngine,
+                               engine_from_model, save_artifact, train_engine)
+from prototypes import REDUCED_NEIGHBORS, print_report, reduce_dataset, reduction_report
+from landmark_store import load_dataset
 
-def train_model():
+def train_model(backend=DEFAULT_BACKEND,
+                reduction=os.environ.get('SIGNBRIDGE_REDUCTION')):
     print("Loading dataset...")
     try:
-        df = pd.read_csv('dataset.csv', header=None)
+        # dataset.lmk (memory-mapped) if present, else dataset.csv
+        X, y = load_dataset()
     except FileNotFoundError:
-        print("Error: dataset.csv not found!")
+        print("Error: dataset.lmk / dataset.csv not found!")
+        exit()
+    except ValueError as e:
+        print(f"Error: {e}")
         exit()
 
-    # Features are the first 63 columns, Label is the last column
-    X = df.iloc[:, :-1].values
-    y = df.iloc[:, -1].values
+    n_neighbors = 5
+    if reduction:
+        # Shrink the reference set (enn / cnn / kmeans) and show what it costs
+        print_report(reduction_report(X, y, reduction))
+        X, y = reduce_dataset(X, y, reduction)
+        n_neighbors = REDUCED_NEIGHBORS[reduction]
 
     print(f"Training KNN model with {len(X)} samples...")
     # Train KNN
-    knn = KNeighborsClassifier(n_neighbors=5)
+    knn = KNeighborsClassifier(n_neighbors=n_neighbors)
     knn.fit(X, y)
 
     # Save model
     joblib.dump(knn, 'isl_model.pkl')
     print("Model trained and saved as 'isl_model.pkl'.")
-    return knn
+
+    # Engines from earlier trainings would shadow the new isl_model.pkl in
+    # load_engine(); an artifact written below replaces them
+    for stale in (ARTIFACT_FILE, ENGINE_FILE, META_FILE):
+        if os.path.exists(stale):
+            os.remove(stale)
+            print(f"Removed '{stale}' from an earlier training.")
+
+    # Prebuild the low-latency inference artifact the app loads at startup;
+    # 'auto' builds what load_engine('auto') would convert the KNN into
+    if backend == 'sklearn':
+        return FusedEngine(SklearnEngine(knn))
+    if backend == 'auto':
+        engine = FusedEngine(engine_from_model(knn, 'auto'))
+    else:
+        engine = FusedEngine(train_engine(X, y, backend=backend, knn=knn))
+    save_artifact(engine, ARTIFACT_FILE, X[:16])
+    print(f"{engine.backend} engine saved as '{ARTIFACT_FILE}'.")
+    return engine
 
 def main():
     # step 1: Train the model
@@ -96,24 +126,11 @@ def main():
                 last_detected_time = time.time()
                 space_added = False
 
+                # Extract features for all hands and predict them in one batch
+                features = landmarks_to_array(detection_result.hand_landmarks)
+                best_prediction, max_confidence = predict_best(model, features)
+
                 for hand_landmarks in detection_result.hand_landmarks:
-                    # Extract features
-                    features = []
-                    for landmark in hand_landmarks:
-                        features.extend([landmark.x, landmark.y, landmark.z])
-                    
-                    # Predict probabilities
-                    # returns [[prob_class1, prob_class2, ...]]
-                    proba = model.predict_proba([features])[0]
-                    confidence = np.max(proba)
-                    predicted_idx = np.argmax(proba)
-                    prediction = model.classes_[predicted_idx]
-                    
-                    # Keep the one with highest confidence
-                    if confidence > max_confidence:
-                        max_confidence = confidence
-                        best_prediction = prediction
-                    
                     # Draw landmarks (Red dots)
                     for landmark in hand_landmarks:
                         h, w, _ = frame.shape
@@ -0,0 +1,185 @@
+import argparse
+import json
+import pickle
+import time
+
+import numpy as np
+from sklearn.model_selection import train_test_split
+from sklearn.neighbors import KNeighborsClassifier
+
+from classifier_engine import TreeEngine
+from landmark_store import load_dataset
+
+REDUCTION_METHODS = ('enn', 'cnn', 'kmeans')
+
+# Neighbours used by the reduced model. Condensed and k-means sets keep only
+# boundary points / centroids, so they are queried with fewer neighbours
+# than the 5 used on the full data.
+REDUCED_NEIGHBORS = {'enn': 5, 'cnn': 1, 'kmeans': 3}
+
+
+def _pairwise_sq_dist(A, B):
+    """Squared euclidean distances between rows of A and B (float32 matmul)."""
+    return (np.einsum('ij,ij->i', A, A)[:, None]
+            - 2.0 * A @ B.T
+            + np.einsum('ij,ij->i', B, B)[None, :])
+
+
+def edit(X, y, n_neighbors=3):
+    """Wilson's edited nearest neighbour: drop samples their neighbours disagree with."""
+    knn = KNeighborsClassifier(n_neighbors=n_neighbors + 1).fit(X, y)
+    # First neighbour of each training point is the point itself
+    idx = knn.kneighbors(X, return_distance=False)[:, 1:]
+    neighbour_labels = y[idx]
+    keep = np.array([
+        np.count_nonzero(row == label) * 2 > n_neighbors
+        for row, label in zip(neighbour_labels, y)
+    ])
+    return X[keep], y[keep]
+
+
+def condense(X, y, chunk_size=512, random_state=42, max_passes=10):
+    """Hart's condensed nearest neighbour, processed in chunks.
+
+    Starts from one sample per class and keeps adding samples that the
+    current prototype set misclassifies (1-NN) until a full pass adds
+    nothing.
+    """
+    rng = np.random.default_rng(random_state)
+    X = np.asarray(X, dtype=np.float32)
+    classes = np.unique(y)
+    store = [int(np.flatnonzero(y == label)[0]) for label in classes]
+    in_store = np.zeros(len(X), dtype=bool)
+    in_store[store] = True
+
+    for _ in range(max_passes):
+        added = 0
+        order = rng.permutation(len(X))
+        for start in range(0, len(order), chunk_size):
+            chunk = order[start:start + chunk_size]
+            chunk = chunk[~in_store[chunk]]
+            if len(chunk) == 0:
+                continue
+            nearest = np.argmin(_pairwise_sq_dist(X[chunk], X[store]), axis=1)
+            wrong = chunk[y[np.asarray(store)[nearest]] != y[chunk]]
+            store.extend(int(i) for i in wrong)
+            in_store[wrong] = True
+            added += len(wrong)
+        if added == 0:
+            break
+
+    store = np.asarray(store)
+    return X[store], y[store]
+
+
+def kmeans_prototypes(X, y, per_class=32, random_state=42):
+    """Replace each class by the centroids of `per_class` k-means clusters."""
+    from sklearn.cluster import MiniBatchKMeans
+
+    proto_X, proto_y = [], []
+    for label in np.unique(y):
+        class_X = X[y == label]
+        n_clusters = min(per_class, len(class_X))
+        kmeans = MiniBatchKMeans(n_clusters=n_clusters, random_state=random_state, n_init=3)
+        kmeans.fit(class_X)
+        proto_X.append(kmeans.cluster_centers_)
+        proto_y.append(np.full(n_clusters, label, dtype=y.dtype))
+    return np.vstack(proto_X).astype(np.float32), np.concatenate(proto_y)
+
+
+def reduce_dataset(X, y, method='cnn', per_class=32):
+    """Return a smaller reference set (X, y) for the KNN model."""
+    X = np.asarray(X, dtype=np.float32)
+    y = np.asarray(y)
+    if method == 'enn':
+        return edit(X, y)
+    if method == 'cnn':
+        # Editing first removes label noise that condensation would otherwise keep
+        return condense(*edit(X, y))
+    if method == 'kmeans':
+        return kmeans_prototypes(X, y, per_class=per_class)
+    raise ValueError(f"Unknown reduction method '{method}', expected one of {REDUCTION_METHODS}")
+
+
+def profile_engine(engine, X_test, y_test, n_latency=500):
+    """Accuracy, pickled size and single-sample latency percentiles of an engine."""
+    proba = engine.predict_proba(X_test)
+    accuracy = float(np.mean(engine.classes_[np.argmax(proba, axis=1)] == y_test))
+
+    samples = X_test[np.arange(n_latency) % len(X_test)]
+    latencies = []
+    for row in samples:
+        start = time.perf_counter()
+        engine.predict_proba(row[None, :])
+        latencies.append((time.perf_counter() - start) * 1000)
+
+    return {
+        'reference_rows': int(engine.tree.data.shape[0]) if hasattr(engine, 'tree') else None,
+        'accuracy': round(accuracy, 4),
+        'model_bytes': len(pickle.dumps(engine)),
+        'latency_ms': {
+            'p50': round(float(np.percentile(latencies, 50)), 4),
+            'p99': round(float(np.percentile(latencies, 99)), 4),
+        },
+    }
+
+
+def reduction_report(X, y, method='cnn', per_class=32, test_size=0.2, n_neighbors=5):
+    """Compare the full KNN against the reduced one on a held-out split."""
+    X = np.asarray(X, dtype=np.float32)
+    y = np.asarray(y)
+    X_train, X_test, y_train, y_test = train_test_split(
+        X, y, test_size=test_size, random_state=42, stratify=y)
+
+    start = time.perf_counter()
+    X_red, y_red = reduce_dataset(X_train, y_train, method, per_class)
+    reduce_time = time.perf_counter() - start
+
+    before = profile_engine(TreeEngine(X_train, y_train, n_neighbors=n_neighbors), X_test, y_test)
+    after = profile_engine(TreeEngine(X_red, y_red, n_neighbors=REDUCED_NEIGHBORS[method]), X_test, y_test)
+
+    return {
+        'method': method,
+        'reduction_time_s': round(reduce_time, 2),
+        'before': before,
+        'after': after,
+        'size_ratio': round(after['model_bytes'] / before['model_bytes'], 4),
+    }
+
+
+def print_report(report):
+    before, after = report['before'], report['after']
+    print(f"\nReduction: {report['method']} ({report['reduction_time_s']} s)")
+    print(f"{'':>16}{'before':>14}{'after':>14}")
+    print(f"{'reference rows':>16}{before['reference_rows']:>14}{after['reference_rows']:>14}")
+    print(f"{'accuracy':>16}{before['accuracy']:>14.4f}{after['accuracy']:>14.4f}")
+    print(f"{'model bytes':>16}{before['model_bytes']:>14}{after['model_bytes']:>14}")
+    print(f"{'p99 latency ms':>16}{before['latency_ms']['p99']:>14.4f}{after['latency_ms']['p99']:>14.4f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Shrink the KNN reference set and report the trade-off.")
+    parser.add_argument('dataset', nargs='?', help="dataset.lmk or a CSV (default: dataset.lmk, else dataset.csv)")
+    parser.add_argument('--method', choices=REDUCTION_METHODS, default='cnn')
+    parser.add_argument('--per-class', type=int, default=32, help="prototypes per class for kmeans")
+    parser.add_argument('--output', help="write the JSON report to this file")
+    args = parser.parse_args()
+
+    print("Loading dataset...")
+    try:
+        X, y = load_dataset(args.dataset)
+    except (FileNotFoundError, ValueError) as e:
+        print(f"Error: {e}")
+        return
+
+    report = reduction_report(X, y, args.method, args.per_class)
+    print_report(report)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"\nReport saved to '{args.output}'.")
+
+
+if __name__ == "__main__":
+    main()
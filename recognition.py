@@ -0,0 +1,354 @@
+import os
+import queue
+import threading
+import time
+from contextlib import contextmanager
+
+import cv2
+import numpy as np
+
+from decision import make_decider
+from features import PredictionCache
+
+# Manually define hand connections (bones)
+HAND_CONNECTIONS = [
+    (0, 1), (1, 2), (2, 3), (3, 4),   # Thumb
+    (0, 5), (5, 6), (6, 7), (7, 8),   # Index
+    (0, 9), (9, 10), (10, 11), (11, 12), # Middle
+    (0, 13), (13, 14), (14, 15), (15, 16), # Ring
+    (0, 17), (17, 18), (18, 19), (19, 20)  # Pinky
+]
+
+# Timings for sentence building (seconds); the letter timing is in decision.py
+SPACE_TIMEOUT = 2.0    # no hand this long completes the word
+FEEDBACK_DURATION = 1.0
+
+# Width of the image MediaPipe sees; wider camera frames are downscaled for
+# detection only (0 = full resolution). Landmarks are normalized, so they are
+# still drawn and streamed on the full-size frame.
+DETECT_WIDTH = int(os.environ.get('SIGNBRIDGE_DETECT_WIDTH', 0))
+
+
+def create_landmarker(model_path, running_mode='VIDEO', num_hands=2, result_callback=None):
+    """Create a MediaPipe HandLandmarker in the given running mode.
+
+    LIVE_STREAM mode needs `result_callback(result, output_image, timestamp_ms)`.
+    """
+    # Imported on first use: mediapipe takes ~1 s to import
+    import mediapipe as mp
+    BaseOptions = mp.tasks.BaseOptions
+    HandLandmarker = mp.tasks.vision.HandLandmarker
+    HandLandmarkerOptions = mp.tasks.vision.HandLandmarkerOptions
+    VisionRunningMode = mp.tasks.vision.RunningMode
+
+    options = HandLandmarkerOptions(
+        base_options=BaseOptions(model_asset_path=model_path),
+        running_mode=getattr(VisionRunningMode, running_mode),
+        num_hands=num_hands,
+        result_callback=result_callback
+    )
+    return HandLandmarker.create_from_options(options)
+
+
+def to_mp_image(rgb_frame):
+    """Wrap an RGB frame for MediaPipe (mediapipe is loaded by then, so the import is a lookup)."""
+    import mediapipe as mp
+    return mp.Image(image_format=mp.ImageFormat.SRGB, data=rgb_frame)
+
+
+class DetectionInput:
+    """Turns a BGR camera frame into the landmarker's RGB input, reusing its buffers.
+
+    prepare() mirrors the frame in place (the caller draws on and streams
+    it), then downscales it to `width` if it is wider and converts it to
+    RGB into buffers allocated once per frame size. The returned image is
+    overwritten by the next call, so one instance serves one thread.
+    """
+
+    def __init__(self, width=DETECT_WIDTH):
+        self.width = width
+        self._shape = None
+        self._small = None
+        self._rgb = None
+
+    def _allocate(self, shape):
+        h, w = shape[:2]
+        if self.width and self.width < w:
+            size = (self.width, max(1, round(h * self.width / w)))
+            self._small = np.empty((size[1], size[0], 3), dtype=np.uint8)
+        else:
+            self._small = None
+        self._rgb = np.empty(self._small.shape if self._small is not None else (h, w, 3), dtype=np.uint8)
+        self._shape = shape
+
+    def prepare(self, frame):
+        """Mirror `frame` in place; return the RGB detection image."""
+        if frame.shape != self._shape:
+            self._allocate(frame.shape)
+        cv2.flip(frame, 1, dst=frame)
+        source = frame
+        if self._small is not None:
+            # INTER_AREA is ~10x slower at non-integer ratios; MediaPipe resamples bilinearly anyway
+            cv2.resize(frame, (self._small.shape[1], self._small.shape[0]), dst=self._small,
+                       interpolation=cv2.INTER_LINEAR)
+            source = self._small
+        cv2.cvtColor(source, cv2.COLOR_BGR2RGB, dst=self._rgb)
+        return self._rgb
+
+
+class LandmarkerPool:
+    """Fixed pool of IMAGE-mode landmarkers shared by all ingestion sessions.
+
+    IMAGE mode keeps no per-stream timestamps, so frames from different
+    browsers can be interleaved freely; the pool caps how many detections
+    run at once.
+    """
+
+    def __init__(self, model_path, size=2, num_hands=2, detect_width=DETECT_WIDTH):
+        self.model_path = model_path
+        self.size = size
+        self.num_hands = num_hands
+        self.detect_width = detect_width
+        self._inputs = {}   # landmarker -> its DetectionInput buffers
+        self._idle = queue.Queue()
+        self._created = 0
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def acquire(self, timeout=None):
+        try:
+            landmarker = self._idle.get_nowait()
+        except queue.Empty:
+            with self._lock:
+                can_create = self._created < self.size
+                if can_create:
+                    self._created += 1
+            if can_create:
+                try:
+                    landmarker = create_landmarker(self.model_path, 'IMAGE', self.num_hands)
+                except Exception:
+                    # Give the slot back, or every failure would shrink the pool for good
+                    with self._lock:
+                        self._created -= 1
+                    raise
+                self._inputs[landmarker] = DetectionInput(self.detect_width)
+            else:
+                landmarker = self._idle.get(timeout=timeout)
+        try:
+            yield landmarker
+        finally:
+            self._idle.put(landmarker)
+
+    def detect(self, frame, timeout=None):
+        """Mirror a BGR frame in place and detect its hands on a pooled landmarker."""
+        with self.acquire(timeout) as landmarker:
+            return landmarker.detect(to_mp_image(self._inputs[landmarker].prepare(frame)))
+
+
+class LiveStreamDetector:
+    """LIVE_STREAM-mode landmarker with at most one frame in flight.
+
+    submit() hands a frame to detect_async() and returns at once. Callers
+    check accepting() first, so a frame that arrives while MediaPipe is
+    still busy is dropped (counted in `dropped`), never queued behind
+    it. `on_result(result, timestamp_ms, latency_s)` runs on MediaPipe's
+    thread for each finished frame, before the next one is accepted.
+    A frame with no result after `stall_timeout` seconds (MediaPipe may
+    drop frames itself) no longer blocks new submissions.
+    """
+
+    def __init__(self, model_path, on_result, num_hands=2, stall_timeout=1.0):
+        self.on_result = on_result
+        self.stall_timeout = stall_timeout
+        self.submitted = 0
+        self.completed = 0
+        self.dropped = 0
+        self._submitted_at = 0.0
+        self._idle = threading.Event()
+        self._idle.set()
+        self.landmarker = create_landmarker(model_path, 'LIVE_STREAM', num_hands, result_callback=self._callback)
+
+    def accepting(self):
+        """True if a new frame would be detected; counts a drop otherwise."""
+        if self._idle.is_set() or time.perf_counter() - self._submitted_at > self.stall_timeout:
+            return True
+        self.dropped += 1
+        return False
+
+    def submit(self, rgb_frame, timestamp_ms):
+        # mp.Image copies the pixels, so the caller may reuse rgb_frame at once
+        self._idle.clear()
+        self._submitted_at = time.perf_counter()
+        try:
+            self.landmarker.detect_async(to_mp_image(rgb_frame), timestamp_ms)
+        except Exception:
+            self._idle.set()
+            raise
+        self.submitted += 1
+
+    def wait(self, timeout=None):
+        """Block until the frame in flight (if any) has been handled."""
+        return self._idle.wait(timeout)
+
+    def _callback(self, result, output_image, timestamp_ms):
+        try:
+            self.on_result(result, timestamp_ms, time.perf_counter() - self._submitted_at)
+        except Exception as e:
+            print(f"Live stream result error: {e}")
+        finally:
+            self.completed += 1
+            self._idle.set()
+
+    def stats(self):
+        return {'submitted': self.submitted, 'completed': self.completed, 'dropped': self.dropped,
+                'in_flight': not self._idle.is_set()}
+
+    def close(self):
+        self.landmarker.close()
+
+
+class RecognitionSession:
+    """Sentence-building state for one signer (letter decisions, spaces, feedback)."""
+
+    def __init__(self, channel='camera', decider=None):
+        self.channel = channel      # event channel for pushed updates (None = don't publish)
+        self.decider = make_decider(decider)   # when a held sign becomes a letter
+        self.prediction_cache = PredictionCache()   # skips the classifier while the hand is still
+        self.current_prediction = ""
+        self.sentence = ""
+        self.last_seen = time.time()
+        self.reset_tracking()
+
+    def reset_tracking(self):
+        """Reset the letter/space timers but keep the sentence (new connection)."""
+        self.decider.reset()
+        self.prediction_cache.clear()
+        self.last_detected_time = time.time()
+        self.space_added = False
+        self.has_new_char = False
+        self.feedback_start_time = 0
+
+    def update(self, best_prediction, hand_detected, now=None, proba=None, classes=None):
+        """Advance the state machine by one frame.
+
+        `proba` is the best hand's probability row (in `classes` order),
+        used by the voting decider. Returns the completed text when a word
+        was just finished (a space was added), otherwise None.
+        """
+        now = time.time() if now is None else now
+        self.last_seen = now
+
+        letter = self.decider.update(best_prediction, hand_detected, now, proba, classes)
+        if letter:
+            self.sentence += letter
+            print(f"Sentence updated: {self.sentence}")
+            self.has_new_char = True # Enable space addition
+
+        if hand_detected:
+            self.last_detected_time = now
+            self.space_added = False
+
+            # Update prediction state
+            if best_prediction:
+                self.current_prediction = best_prediction
+            return None
+
+        # No hand detected
+        self.current_prediction = "" # Clear display if no hand
+
+        # Timeout Logic for Space/TTS
+        if (now - self.last_detected_time > SPACE_TIMEOUT) and not self.space_added and self.has_new_char:
+            completed = self.sentence
+            self.sentence += " "
+            self.space_added = True
+            self.has_new_char = False # Reset flag so we don't add multiple spaces
+
+            # Trigger feedback
+            self.feedback_start_time = now
+            return completed
+        return None
+
+    def snapshot(self):
+        """State shown to the client: the current word and the sentence so far."""
+        return {'word': self.current_prediction, 'sentence': self.sentence}
+
+    def clear(self):
+        self.sentence = ""
+
+    def backspace(self):
+        self.sentence = self.sentence[:-1]
+
+
+def draw_hand(frame, hand_landmarks):
+    """Draw red landmark dots and green bones for one hand."""
+    h, w, _ = frame.shape
+
+    # Draw landmarks (Red dots)
+    for landmark in hand_landmarks:
+        cx, cy = int(landmark.x * w), int(landmark.y * h)
+        cv2.circle(frame, (cx, cy), 5, (0, 0, 255), -1)
+
+    # Draw connections using OpenCV
+    for start_idx, end_idx in HAND_CONNECTIONS:
+        start_point = hand_landmarks[start_idx]
+        end_point = hand_landmarks[end_idx]
+
+        # Convert normalized coordinates to pixel coordinates
+        start_x, start_y = int(start_point.x * w), int(start_point.y * h)
+        end_x, end_y = int(end_point.x * w), int(end_point.y * h)
+
+        # Draw green line with thickness 2
+        cv2.line(frame, (start_x, start_y), (end_x, end_y), (0, 255, 0), 2)
+
+
+def overlay_state(session, hand_detected, best_prediction, now=None):
+    """What the overlays show: (prediction or None, seconds without a hand to 0.1 s or -1, 'SPACE ADDED' shown).
+
+    Rounded like the drawn status text, so equal states draw identical overlays.
+    """
+    now = time.time() if now is None else now
+    prediction = best_prediction if hand_detected and best_prediction else None
+    no_hand_s = -1 if hand_detected else round(now - session.last_detected_time, 1)
+    feedback = now - session.feedback_start_time < FEEDBACK_DURATION
+    return prediction, no_hand_s, feedback
+
+
+def draw_overlays(frame, session, hand_detected, best_prediction, now=None):
+    """Draw the prediction, status and 'SPACE ADDED' overlays.
+
+    Returns overlay_state() for the same frame, so the encoder can tell
+    when the overlay actually changed.
+    """
+    now = time.time() if now is None else now
+    state = overlay_state(session, hand_detected, best_prediction, now)
+
+    if hand_detected and best_prediction:
+        display_text = f"Prediction: {best_prediction}"
+        cv2.putText(frame, display_text, (50, 50),
+                    cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2, cv2.LINE_AA)
+
+    # Debug Status
+    if hand_detected:
+        status_text = "Status: Hand Detected"
+        status_color = (0, 255, 0) # Green
+    else:
+        status_text = f"Status: No Hand ({state[1]:.1f}s)"
+        status_color = (0, 0, 255) # Red
+
+    cv2.putText(frame, status_text, (10, 30),
+                cv2.FONT_HERSHEY_SIMPLEX, 0.7, status_color, 2, cv2.LINE_AA)
+
+    # Feedback Overlay "SPACE ADDED"
+    if state[2]:
+        text = "SPACE ADDED"
+        font = cv2.FONT_HERSHEY_SIMPLEX
+        font_scale = 2
+        thickness = 3
+        text_size = cv2.getTextSize(text, font, font_scale, thickness)[0]
+        text_x = (frame.shape[1] - text_size[0]) // 2
+        text_y = (frame.shape[0] + text_size[1]) // 2
+
+        cv2.putText(frame, text, (text_x, text_y),
+                    font, font_scale, (0, 255, 255), thickness, cv2.LINE_AA)
+
+    return state
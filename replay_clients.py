@@ -0,0 +1,152 @@
+import argparse
+import glob
+import json
+import os
+import threading
+import time
+import uuid
+
+import cv2
+import numpy as np
+
+basedir = os.path.abspath(os.path.dirname(__file__))
+
+
+def http_sender(base_url):
+    """Send frames to a running server over a keep-alive connection."""
+    import requests
+    local = threading.local()
+
+    def send(method, path, body=None):
+        if not hasattr(local, 'session'):
+            local.session = requests.Session()
+        response = local.session.request(method, base_url.rstrip('/') + path, data=body,
+                                         headers={'Content-Type': 'image/jpeg'}, timeout=10)
+        return response.status_code, response.json()
+    return send
+
+
+def in_process_sender():
+    """Send frames straight into the Flask app, no server or browser needed."""
+    import app as signbridge
+    local = threading.local()
+
+    def send(method, path, body=None):
+        if not hasattr(local, 'client'):
+            local.client = signbridge.app.test_client()
+        response = local.client.open(path, method=method, data=body, content_type='image/jpeg')
+        return response.status_code, response.get_json()
+    return send
+
+
+def replay_clip(path, send, quality=70):
+    """Play one clip as a fake browser session and collect what it saw."""
+    session_id = f"replay-{uuid.uuid4().hex[:8]}"
+    cap = cv2.VideoCapture(path)
+    latencies = []
+    predictions = []
+    errors = 0
+    sentence = ""
+
+    while True:
+        success, frame = cap.read()
+        if not success:
+            break
+        ok, buffer = cv2.imencode('.jpg', frame, [cv2.IMWRITE_JPEG_QUALITY, quality])
+        if not ok:
+            continue
+
+        start = time.perf_counter()
+        status, data = send('POST', f'/ingest/{session_id}', buffer.tobytes())
+        latencies.append((time.perf_counter() - start) * 1000)
+
+        if status != 200:
+            errors += 1
+            continue
+        word = data.get('word')
+        if word and (not predictions or predictions[-1] != word):
+            predictions.append(word)
+        sentence = data.get('sentence', sentence)
+
+    cap.release()
+    send('DELETE', f'/ingest/{session_id}')
+
+    latency_ms = None   # no frames sent: nothing to report
+    if latencies:
+        latencies = np.array(latencies)
+        latency_ms = {
+            'p50': round(float(np.percentile(latencies, 50)), 2),
+            'p95': round(float(np.percentile(latencies, 95)), 2),
+            'max': round(float(latencies.max()), 2),
+        }
+    return {
+        'clip': os.path.basename(path),
+        'session': session_id,
+        'frames': len(latencies),
+        'errors': errors,
+        'predictions': predictions,
+        'sentence': sentence,
+        'latency_ms': latency_ms,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay ISL clips as concurrent /ingest clients.")
+    parser.add_argument('clips', nargs='*', help="video files (default: isl/*.mp4)")
+    parser.add_argument('--url', help="base URL of a running server; omit to run in-process")
+    parser.add_argument('--clients', type=int, default=4, help="number of concurrent clients")
+    parser.add_argument('--output', help="write the JSON report to this file")
+    args = parser.parse_args()
+
+    clips = args.clips or sorted(glob.glob(os.path.join(basedir, 'isl', '*.mp4')))
+    if not clips:
+        print("Error: no clips to replay.")
+        return
+
+    send = http_sender(args.url) if args.url else in_process_sender()
+    pending = list(clips)
+    results = []
+    lock = threading.Lock()
+
+    def worker():
+        while True:
+            with lock:
+                if not pending:
+                    return
+                clip = pending.pop(0)
+            result = replay_clip(clip, send)
+            with lock:
+                results.append(result)
+            p50 = f"{result['latency_ms']['p50']} ms" if result['latency_ms'] else '-'
+            print(f"{result['clip']}: {result['frames']} frames, "
+                  f"p50 {p50}, predictions {''.join(result['predictions'])}")
+
+    start = time.perf_counter()
+    threads = [threading.Thread(target=worker) for _ in range(max(1, args.clients))]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    elapsed = time.perf_counter() - start
+
+    total_frames = sum(r['frames'] for r in results)
+    report = {
+        'clients': args.clients,
+        'clips': len(results),
+        'frames': total_frames,
+        'errors': sum(r['errors'] for r in results),
+        'elapsed_s': round(elapsed, 2),
+        'aggregate_fps': round(total_frames / elapsed, 1) if elapsed else 0.0,
+        'sessions': sorted(results, key=lambda r: r['clip']),
+    }
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump(report, f, indent=2)
+        print(f"Report saved to '{args.output}'.")
+    else:
+        print(json.dumps(report, indent=2))
+
+
+if __name__ == "__main__":
+    main()
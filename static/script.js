@@ -145,25 +145,239 @@ document.addEventListener('DOMContentLoaded', () => {
     const speakOutputBtn = document.getElementById('btn-speak-output');
     const webcamVideo = document.getElementById('webcam-video');
     const webcamPlaceholder = document.getElementById('webcam-placeholder');
+    const browserVideo = document.getElementById('browser-video');
+    const cameraSourceSelect = document.getElementById('cameraSource');
+    const landmarkOverlay = document.getElementById('landmark-overlay');
 
     let isCameraRunning = false;
     let pollingInterval = null;
+    let predictionEvents = null;
+    let landmarkEvents = null;
+
+    // Browser camera mode: frames go to /ingest/<session> and the server
+    // answers with this signer's own prediction and sentence.
+    const ingestSessionId = (window.crypto && crypto.randomUUID)
+        ? crypto.randomUUID()
+        : `s-${Date.now()}-${Math.random().toString(16).slice(2)}`;
+    const ingestCanvas = document.createElement('canvas');
+    let browserStream = null;
+
+    function usingBrowserCamera() {
+        return cameraSourceSelect?.value === 'browser';
+    }
+
+    function usingLandmarkStream() {
+        return cameraSourceSelect?.value === 'landmarks';
+    }
+
+    // Same bones as HAND_CONNECTIONS in recognition.py (keep the two in sync)
+    const HAND_CONNECTIONS = [
+        [0, 1], [1, 2], [2, 3], [3, 4],         // Thumb
+        [0, 5], [5, 6], [6, 7], [7, 8],         // Index
+        [0, 9], [9, 10], [10, 11], [11, 12],    // Middle
+        [0, 13], [13, 14], [14, 15], [15, 16],  // Ring
+        [0, 17], [17, 18], [18, 19], [19, 20]   // Pinky
+    ];
+
+    // Draw hands (63 ints per hand, thousandths of the frame size) and the
+    // status overlays over the local preview, like the server draws on /video_feed.
+    function drawLandmarkOverlay(data) {
+        if (!landmarkOverlay) return;
+        const rect = landmarkOverlay.getBoundingClientRect();
+        landmarkOverlay.width = rect.width;
+        landmarkOverlay.height = rect.height;
+        const ctx = landmarkOverlay.getContext('2d');
+        ctx.clearRect(0, 0, rect.width, rect.height);
+
+        // Match the preview's object-fit: cover cropping
+        const vw = browserVideo?.videoWidth || rect.width;
+        const vh = browserVideo?.videoHeight || rect.height;
+        const scale = Math.max(rect.width / vw, rect.height / vh);
+        const offsetX = (rect.width - vw * scale) / 2;
+        const offsetY = (rect.height - vh * scale) / 2;
+        const point = (hand, i) => [
+            offsetX + hand[i * 3] / 1000 * vw * scale,
+            offsetY + hand[i * 3 + 1] / 1000 * vh * scale
+        ];
+
+        (data.hands || []).forEach(hand => {
+            ctx.strokeStyle = '#00ff00';
+            ctx.lineWidth = 2;
+            HAND_CONNECTIONS.forEach(([a, b]) => {
+                const [x1, y1] = point(hand, a);
+                const [x2, y2] = point(hand, b);
+                ctx.beginPath();
+                ctx.moveTo(x1, y1);
+                ctx.lineTo(x2, y2);
+                ctx.stroke();
+            });
+            ctx.fillStyle = '#ff0000';
+            for (let i = 0; i < 21; i++) {
+                const [x, y] = point(hand, i);
+                ctx.beginPath();
+                ctx.arc(x, y, 5, 0, 2 * Math.PI);
+                ctx.fill();
+            }
+        });
+
+        if (data.no_hand_s === undefined) return;
+        ctx.font = 'bold 18px sans-serif';
+        if (data.prediction) {
+            ctx.fillStyle = '#00ff00';
+            ctx.fillText(`Prediction: ${data.prediction}`, 50, 50);
+        }
+        ctx.fillStyle = data.no_hand_s < 0 ? '#00ff00' : '#ff0000';
+        ctx.fillText(data.no_hand_s < 0 ? 'Status: Hand Detected' : `Status: No Hand (${data.no_hand_s.toFixed(1)}s)`, 10, 25);
+        if (data.feedback) {
+            ctx.font = 'bold 40px sans-serif';
+            ctx.fillStyle = '#ffff00';
+            ctx.textAlign = 'center';
+            ctx.fillText('SPACE ADDED', rect.width / 2, rect.height / 2);
+            ctx.textAlign = 'start';
+        }
+    }
+
+    function clearLandmarkOverlay() {
+        if (!landmarkOverlay) return;
+        landmarkOverlay.getContext('2d').clearRect(0, 0, landmarkOverlay.width, landmarkOverlay.height);
+        landmarkOverlay.classList.add('hidden');
+    }
+
+    function sessionQuery() {
+        return usingBrowserCamera() ? `?session=${encodeURIComponent(ingestSessionId)}` : '';
+    }
+
+    function showPrediction(data) {
+        const detectedInput = document.getElementById('detectedWord');
+        const storedInput = document.getElementById('storedSentence');
+
+        if (data.word !== undefined && detectedInput) {
+            detectedInput.value = data.word;
+        }
+        if (data.sentence !== undefined && storedInput) {
+            storedInput.value = data.sentence;
+        }
+    }
+
+    const sleep = (ms) => new Promise(resolve => setTimeout(resolve, ms));
+
+    async function startBrowserCamera(sendFrames = true) {
+        browserStream = await navigator.mediaDevices.getUserMedia({
+            video: { width: 640, height: 480 },
+            audio: false
+        });
+        browserVideo.srcObject = browserStream;
+        browserVideo.classList.remove('hidden');
+        landmarkOverlay?.classList.remove('hidden');
+        if (sendFrames) sendBrowserFrames();
+    }
+
+    // Landmark-only mode: the server webcam is processed on the server,
+    // but the page shows this device's preview and draws the hands itself.
+    async function startLandmarkStream() {
+        try {
+            await startBrowserCamera(false);
+        } catch (err) {
+            // No local preview (e.g. camera busy): still draw the hands
+            console.error("Local preview unavailable:", err);
+            landmarkOverlay?.classList.remove('hidden');
+        }
+        landmarkEvents = new EventSource('/landmark_feed');
+        landmarkEvents.addEventListener('landmarks', (e) => drawLandmarkOverlay(JSON.parse(e.data)));
+    }
+
+    function stopLandmarkStream() {
+        if (landmarkEvents) {
+            landmarkEvents.close();
+            landmarkEvents = null;
+        }
+        clearLandmarkOverlay();
+    }
+
+    function stopBrowserCamera() {
+        if (browserStream) {
+            browserStream.getTracks().forEach(track => track.stop());
+            browserStream = null;
+        }
+        if (browserVideo) {
+            browserVideo.srcObject = null;
+            browserVideo.classList.add('hidden');
+        }
+    }
+
+    async function sendBrowserFrames() {
+        const ctx = ingestCanvas.getContext('2d');
+
+        // Only one frame in flight: a slow server lowers our frame rate
+        // instead of building up a backlog of stale frames.
+        while (isCameraRunning && browserStream) {
+            if (!browserVideo.videoWidth) {
+                await sleep(100);
+                continue;
+            }
+
+            ingestCanvas.width = browserVideo.videoWidth;
+            ingestCanvas.height = browserVideo.videoHeight;
+            ctx.drawImage(browserVideo, 0, 0);
+            const blob = await new Promise(resolve => ingestCanvas.toBlob(resolve, 'image/jpeg', 0.7));
+
+            try {
+                const response = await fetch(`/ingest/${encodeURIComponent(ingestSessionId)}`, {
+                    method: 'POST',
+                    headers: { 'Content-Type': 'image/jpeg' },
+                    body: blob
+                });
+                const data = await response.json();
+                if (response.ok) {
+                    showPrediction(data);
+                    drawLandmarkOverlay({ hands: data.landmarks });
+                } else {
+                    console.error("Ingestion error:", data.error);
+                    await sleep(500);
+                }
+            } catch (err) {
+                console.error("Error sending frame:", err);
+                await sleep(500);
+            }
+        }
+    }
 
     if (startCameraBtn) {
-        startCameraBtn.addEventListener('click', () => {
+        startCameraBtn.addEventListener('click', async () => {
             const placeholderContent = webcamPlaceholder?.querySelector('.placeholder-content');
 
             if (!isCameraRunning) {
-                webcamVideo.src = "/video_feed";
-                webcamVideo.classList.remove('hidden');
+                if (usingBrowserCamera()) {
+                    try {
+                        isCameraRunning = true;
+                        await startBrowserCamera();
+                        startPolling();
+                    } catch (err) {
+                        isCameraRunning = false;
+                        console.error("Error opening camera:", err);
+                        alert("Could not access the camera. Please allow camera access in your browser settings.");
+                        return;
+                    }
+                } else if (usingLandmarkStream()) {
+                    isCameraRunning = true;
+                    await startLandmarkStream();
+                    startPolling();
+                } else {
+                    webcamVideo.src = "/video_feed";
+                    webcamVideo.classList.remove('hidden');
+                    isCameraRunning = true;
+                    startPolling();
+                }
                 if (placeholderContent) placeholderContent.style.display = 'none';
+                if (cameraSourceSelect) cameraSourceSelect.disabled = true;
                 startCameraBtn.innerHTML = '<span class="btn-icon">⏹️</span> Stop Camera';
-                isCameraRunning = true;
-                startPolling();
             } else {
                 webcamVideo.src = "";
                 webcamVideo.classList.add('hidden');
+                stopBrowserCamera();
+                stopLandmarkStream();
                 if (placeholderContent) placeholderContent.style.display = 'block';
+                if (cameraSourceSelect) cameraSourceSelect.disabled = false;
                 startCameraBtn.innerHTML = '<span class="btn-icon">📷</span> Start Camera';
                 isCameraRunning = false;
                 stopPolling();
@@ -197,7 +411,7 @@ document.addEventListener('DOMContentLoaded', () => {
     if (clearBtn) {
         clearBtn.addEventListener('click', async () => {
             try {
-                const response = await fetch('/clear_sentence', { method: 'POST' });
+                const response = await fetch('/clear_sentence' + sessionQuery(), { method: 'POST' });
                 const data = await response.json();
                 document.getElementById('storedSentence').value = data.sentence;
             } catch (err) {
@@ -209,7 +423,7 @@ document.addEventListener('DOMContentLoaded', () => {
     if (backspaceBtn) {
         backspaceBtn.addEventListener('click', async () => {
             try {
-                const response = await fetch('/backspace_sentence', { method: 'POST' });
+                const response = await fetch('/backspace_sentence' + sessionQuery(), { method: 'POST' });
                 const data = await response.json();
                 document.getElementById('storedSentence').value = data.sentence;
             } catch (err) {
@@ -218,23 +432,30 @@ document.addEventListener('DOMContentLoaded', () => {
         });
     }
 
+    // The server pushes word/sentence changes over Server-Sent Events;
+    // polling /get_word is only the fallback for browsers without EventSource.
     function startPolling() {
-        if (pollingInterval) clearInterval(pollingInterval);
+        stopPolling();
+        if (window.EventSource) {
+            // Browser-camera signers listen on their own ingest session
+            const session = usingBrowserCamera() ? `&session=${encodeURIComponent(ingestSessionId)}` : '';
+            predictionEvents = new EventSource(`/events?topics=prediction${session}`);
+            predictionEvents.addEventListener('prediction', (e) => {
+                if (isCameraRunning) showPrediction(JSON.parse(e.data));
+            });
+            // Completed sentences, synthesized on the server
+            predictionEvents.addEventListener('speech', (e) => {
+                const data = JSON.parse(e.data);
+                new Audio(data.url).play().catch(err => console.error("Error playing speech:", err));
+            });
+            return;
+        }
         pollingInterval = setInterval(async () => {
             if (!isCameraRunning) return;
             try {
-                const response = await fetch('/get_word');
+                const response = await fetch('/get_word' + sessionQuery());
                 const data = await response.json();
-
-                const detectedInput = document.getElementById('detectedWord');
-                const storedInput = document.getElementById('storedSentence');
-
-                if (data.word !== undefined && detectedInput) {
-                    detectedInput.value = data.word;
-                }
-                if (data.sentence !== undefined && storedInput) {
-                    storedInput.value = data.sentence;
-                }
+                showPrediction(data);
             } catch (err) {
                 console.error("Error fetching prediction:", err);
             }
@@ -242,6 +463,10 @@ document.addEventListener('DOMContentLoaded', () => {
     }
 
     function stopPolling() {
+        if (predictionEvents) {
+            predictionEvents.close();
+            predictionEvents = null;
+        }
         if (pollingInterval) {
             clearInterval(pollingInterval);
             pollingInterval = null;
@@ -493,39 +718,83 @@ document.addEventListener('DOMContentLoaded', () => {
     // ===== HISTORY PAGE =====
     const historyDiv = document.getElementById('conversation-history');
     const clearHistoryBtn = document.getElementById('clearHistoryBtn');
+    const translateHistoryBtn = document.getElementById('translateHistoryBtn');
     let historyInterval = null;
+    let historyEvents = null;
+    let historyItems = [];
+    // sentence -> translation, kept across polls so refreshes don't wipe it
+    let historyTranslations = {};
 
     if (historyDiv) {
         function startHistoryPolling() {
+            if (window.EventSource) {
+                // Pushed on every change, starting with the current history
+                historyEvents = new EventSource('/events?topics=history');
+                historyEvents.addEventListener('history', (e) => {
+                    historyItems = JSON.parse(e.data).history || [];
+                    renderHistory();
+                });
+                return;
+            }
             if (historyInterval) clearInterval(historyInterval);
             historyInterval = setInterval(fetchHistory, 1000);
             fetchHistory();
         }
 
+        function renderHistory() {
+            if (historyItems.length > 0) {
+                historyDiv.innerHTML = historyItems.map((sentence, index) => `
+                    <div class="history-item">
+                        <span class="history-number">#${historyItems.length - index}</span>
+                        <span class="history-text">${escapeHtml(sentence)}</span>
+                        ${historyTranslations[sentence] ? `<span class="history-translation">${escapeHtml(historyTranslations[sentence])}</span>` : ''}
+                    </div>
+                `).join('');
+            } else {
+                historyDiv.innerHTML = '<p class="empty-state">No conversations yet...</p>';
+            }
+        }
+
         async function fetchHistory() {
             try {
                 const response = await fetch('/get_history');
                 const data = await response.json();
-
-                if (data.history && data.history.length > 0) {
-                    historyDiv.innerHTML = data.history.map((sentence, index) => `
-                        <div class="history-item">
-                            <span class="history-number">#${data.history.length - index}</span>
-                            <span class="history-text">${escapeHtml(sentence)}</span>
-                        </div>
-                    `).join('');
-                } else {
-                    historyDiv.innerHTML = '<p class="empty-state">No conversations yet...</p>';
-                }
+                historyItems = data.history || [];
+                renderHistory();
             } catch (err) {
                 console.error("Error fetching history:", err);
             }
         }
 
+        if (translateHistoryBtn) {
+            translateHistoryBtn.addEventListener('click', async () => {
+                if (historyItems.length === 0) return;
+                const targetLang = document.getElementById('historyLanguageSelect')?.value || 'hi';
+
+                try {
+                    // One request for the whole history instead of one per sentence
+                    const response = await fetch('/translate_batch', {
+                        method: 'POST',
+                        headers: { 'Content-Type': 'application/json' },
+                        body: JSON.stringify({ texts: historyItems, lang: targetLang })
+                    });
+                    const data = await response.json();
+                    historyTranslations = {};
+                    (data.translations || []).forEach(item => {
+                        historyTranslations[item.text] = item.translated_text;
+                    });
+                    renderHistory();
+                } catch (err) {
+                    console.error("Error translating history:", err);
+                }
+            });
+        }
+
         if (clearHistoryBtn) {
             clearHistoryBtn.addEventListener('click', async () => {
                 try {
                     await fetch('/clear_history', { method: 'POST' });
+                    historyTranslations = {};
                     fetchHistory();
                 } catch (err) {
                     console.error("Error clearing history:", err);
@@ -0,0 +1,53 @@
+import json
+import os
+import sys
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+# The modules live at the repository root
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+class StubTranslator(BaseHTTPRequestHandler):
+    """Answers like translate_a/single: 'FAIL*' -> 500, 'SLOW*' after a delay, else each line reversed.
+
+    A multi-line query containing 'MERGE' comes back as one line, like a
+    provider that joins sentences.
+    """
+
+    calls = []
+    lock = threading.Lock()
+
+    def do_GET(self):
+        text = parse_qs(urlparse(self.path).query)['q'][0]
+        with self.lock:
+            self.calls.append(text)
+        if text.startswith('FAIL'):
+            self.send_response(500)
+            self.end_headers()
+            return
+        if text.startswith('SLOW'):
+            time.sleep(0.3)
+        lines = [line[::-1] for line in text.split('\n')]
+        translated = (' ' if 'MERGE' in text else '\n').join(lines)
+        body = json.dumps([[[translated, text, None, None, 1]], None, 'en']).encode()
+        self.send_response(200)
+        self.send_header('Content-Type', 'application/json')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, *args):
+        pass
+
+
+server = ThreadingHTTPServer(('127.0.0.1', 0), StubTranslator)
+threading.Thread(target=server.serve_forever, daemon=True).start()
+
+# Read by translation.py at import time, before any test module imports it
+os.environ['SIGNBRIDGE_TRANSLATE_URL'] = f'http://127.0.0.1:{server.server_port}/translate_a/single'
+os.environ.setdefault('SIGNBRIDGE_TRANSLATION_CACHE_PATH', '')
+# Tests that import app load no model in the background
+os.environ.setdefault('SIGNBRIDGE_WARMUP', '0')
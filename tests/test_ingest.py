@@ -0,0 +1,50 @@
+import json
+
+import pytest
+
+import app as signbridge
+
+
+@pytest.fixture
+def client(monkeypatch):
+    """A test client with recognition marked ready and no model loaded."""
+    monkeypatch.setitem(signbridge.warmup_state, 'status', 'ready')
+    monkeypatch.setattr(signbridge, 'model', None)
+    signbridge.resources_ready.set()
+    signbridge.warmup_finished.set()
+    yield signbridge.app.test_client()
+    with signbridge.ingest_sessions_lock:
+        signbridge.ingest_sessions.clear()
+
+
+def hand(value=0.5):
+    return [[value, value, 0.0]] * 21
+
+
+def test_landmarks_without_hands(client):
+    response = client.post('/ingest/s1', json={'landmarks': []})
+
+    assert response.status_code == 200
+    assert response.get_json()['hands'] == 0
+
+
+def test_rejects_non_object_json(client):
+    assert client.post('/ingest/s1', json=[hand()]).status_code == 400
+
+
+@pytest.mark.parametrize('landmarks', [
+    [[[0.5, 0.5]] * 21],       # missing z
+    [[[0.5, 0.5, 0.0]] * 20],  # missing a landmark
+    [['x'] * 63],
+])
+def test_rejects_malformed_landmarks(client, landmarks):
+    assert client.post('/ingest/s1', json={'landmarks': landmarks}).status_code == 400
+
+
+def test_rejects_non_finite_landmarks(client):
+    # Python's json emits NaN/Infinity, which Flask parses back to floats
+    for value in (float('nan'), float('inf')):
+        body = json.dumps({'landmarks': [hand(), hand(value)]})
+        response = client.post('/ingest/s1', data=body, content_type='application/json')
+        assert response.status_code == 400
+        assert 'finite' in response.get_json()['error']
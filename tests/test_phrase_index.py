@@ -0,0 +1,60 @@
+import os
+
+from phrase_index import PhraseIndex
+
+
+def make_library(folder, *names):
+    for name in names:
+        (folder / name).write_bytes(b'')
+    return PhraseIndex(str(folder))
+
+
+def test_longest_phrase_wins(tmp_path):
+    index = make_library(tmp_path, 'Good.mp4', 'Good Morning.mp4', 'Good Morning Everyone.avi', 'notes.txt')
+
+    assert index.segment('good morning everyone') == [
+        {'type': 'video', 'filename': 'Good Morning Everyone.avi', 'text': 'good morning everyone'},
+    ]
+    assert index.segment('Good Morning friend') == [
+        {'type': 'video', 'filename': 'Good Morning.mp4', 'text': 'Good Morning'},
+        {'type': 'letters', 'letters': ['F', 'R', 'I', 'E', 'N', 'D'], 'text': 'friend'},
+    ]
+    assert index.videos == ['Good Morning Everyone.avi', 'Good Morning.mp4', 'Good.mp4']
+
+
+def test_partial_phrase_falls_back_to_last_full_match(tmp_path):
+    index = make_library(tmp_path, 'Good.mp4', 'Good Morning Everyone.mp4')
+
+    # 'good morning' is a prefix of a phrase but not a video itself
+    assert index.segment('good morning') == [
+        {'type': 'video', 'filename': 'Good.mp4', 'text': 'good'},
+        {'type': 'letters', 'letters': ['M', 'O', 'R', 'N', 'I', 'N', 'G'], 'text': 'morning'},
+    ]
+
+
+def test_unknown_words_become_letters(tmp_path):
+    index = make_library(tmp_path, 'Hello.mp4')
+
+    assert index.segment('hi, 2 you') == [
+        {'type': 'letters', 'letters': ['H', 'I'], 'text': 'hi,'},
+        {'type': 'letters', 'letters': ['Y', 'O', 'U'], 'text': 'you'},
+    ]
+
+
+def test_missing_folder_spells_everything(tmp_path):
+    index = PhraseIndex(str(tmp_path / 'missing'))
+
+    assert index.segment('hello') == [{'type': 'letters', 'letters': ['H', 'E', 'L', 'L', 'O'], 'text': 'hello'}]
+    assert index.videos == []
+
+
+def test_rebuilds_when_the_folder_changes(tmp_path):
+    index = make_library(tmp_path, 'Hello.mp4')
+    assert index.segment('thanks')[0]['type'] == 'letters'
+
+    (tmp_path / 'Thanks.mp4').write_bytes(b'')
+    # Coarse filesystem timestamps could hide the change; move the mtime on explicitly
+    stat = os.stat(tmp_path)
+    os.utime(tmp_path, ns=(stat.st_atime_ns, stat.st_mtime_ns + 1_000_000_000))
+
+    assert index.segment('thanks') == [{'type': 'video', 'filename': 'Thanks.mp4', 'text': 'thanks'}]
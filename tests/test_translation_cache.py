@@ -0,0 +1,141 @@
+import threading
+from urllib.parse import quote
+
+import pytest
+
+import app as signbridge
+import translation
+from conftest import StubTranslator
+
+
+@pytest.fixture(autouse=True)
+def fresh_client(monkeypatch):
+    """A new upstream client (closed circuit) and an empty call log per test."""
+    monkeypatch.setattr(translation, 'client', translation.UpstreamClient())
+    StubTranslator.calls.clear()
+
+
+def calls_for(text):
+    return StubTranslator.calls.count(text)
+
+
+def test_miss_then_hit(tmp_path):
+    cache = translation.TranslationCache(path=str(tmp_path / 'cache.sqlite3'))
+
+    assert cache.translate('HELLO', 'en', 'hi') == ('OLLEH', 'en')
+    assert cache.translate('HELLO', 'en', 'hi') == ('OLLEH', 'en')
+
+    assert calls_for('HELLO') == 1
+    stats = cache.get_stats()
+    assert stats['misses'] == 1
+    assert stats['hits'] == 1
+
+
+def test_sqlite_cache_survives_reopen(tmp_path):
+    path = str(tmp_path / 'cache.sqlite3')
+    translation.TranslationCache(path=path).translate('CAT', 'en', 'gu')
+
+    reopened = translation.TranslationCache(path=path)
+    assert reopened.translate('CAT', 'en', 'gu') == ('TAC', 'en')
+
+    assert calls_for('CAT') == 1
+    assert reopened.get_stats()['disk_hits'] == 1
+
+
+def test_concurrent_requests_share_one_upstream_call(tmp_path):
+    cache = translation.TranslationCache(path=str(tmp_path / 'cache.sqlite3'))
+    results = []
+
+    def worker():
+        results.append(cache.translate('SLOW TEXT', 'en', 'hi'))
+
+    threads = [threading.Thread(target=worker) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join(5)
+
+    assert results == [('TXET WOLS', 'en')] * 8
+    assert calls_for('SLOW TEXT') == 1
+    assert cache.get_stats()['coalesced'] == 7
+
+
+def test_breaker_opens_after_upstream_failures(tmp_path):
+    cache = translation.TranslationCache(path=str(tmp_path / 'cache.sqlite3'))
+
+    for i in range(translation.BREAKER_THRESHOLD):
+        with pytest.raises(translation.TranslationError):
+            cache.translate(f'FAIL {i}', 'en', 'hi')
+    assert translation.client.breaker.state == 'open'
+
+    # Open circuit: fails fast without reaching the provider
+    with pytest.raises(translation.TranslationUnavailable):
+        cache.translate('HELLO', 'en', 'hi')
+    assert calls_for('HELLO') == 0
+    assert translation.client.get_stats()['rejected_open'] == 1
+
+
+@pytest.fixture
+def batch_cache(monkeypatch, tmp_path):
+    """translate_batch() goes through the module-level cache; give it a fresh one."""
+    fresh = translation.TranslationCache(path=str(tmp_path / 'cache.sqlite3'))
+    monkeypatch.setattr(translation, 'cache', fresh)
+    return fresh
+
+
+def test_batch_joins_texts_into_one_call(batch_cache):
+    results = translation.translate_batch(['CAT', 'DOG', '', 'CAT', 'BIRD'], 'en', 'hi')
+
+    assert results == [('TAC', True), ('GOD', True), ('', True), ('TAC', True), ('DRIB', True)]
+    assert StubTranslator.calls == ['CAT\nDOG\nBIRD']
+    assert batch_cache.get_stats()['batch_calls'] == 1
+
+
+def test_batch_splits_long_queries_into_chunks(batch_cache):
+    texts = [f'WORD{i:03d} ' + 'x' * 190 for i in range(30)]
+
+    results = translation.translate_batch(texts, 'en', 'hi')
+
+    assert results == [(text[::-1], True) for text in texts]
+    assert len(StubTranslator.calls) == 2
+    assert all(len(quote(call)) <= translation.MAX_BATCH_QUERY_CHARS for call in StubTranslator.calls)
+    assert [line for call in StubTranslator.calls for line in call.split('\n')] == texts
+
+
+def test_batch_falls_back_to_single_calls_when_lines_merge(batch_cache):
+    results = translation.translate_batch(['MERGE ONE', 'MERGE TWO'], 'en', 'hi')
+
+    # The joined call came back as one line, so each text was sent on its own
+    assert results == [('ENO EGREM', True), ('OWT EGREM', True)]
+    assert StubTranslator.calls == ['MERGE ONE\nMERGE TWO', 'MERGE ONE', 'MERGE TWO']
+
+
+def test_batch_answers_cached_texts_without_upstream_calls(batch_cache):
+    batch_cache.translate('CAT', 'en', 'hi')
+    translation.translate_batch(['DOG', 'BIRD'], 'en', 'hi')
+    StubTranslator.calls.clear()
+
+    results = translation.translate_batch(['CAT', 'DOG', 'BIRD'], 'en', 'hi')
+
+    assert results == [('TAC', True), ('GOD', True), ('DRIB', True)]
+    assert StubTranslator.calls == []
+
+
+def test_batch_keeps_originals_for_failed_texts(batch_cache):
+    results = translation.translate_batch(['FAIL A', 'FAIL B'], 'en', 'hi')
+
+    assert results == [('FAIL A', False), ('FAIL B', False)]
+
+
+def test_translate_batch_route(batch_cache):
+    response = signbridge.app.test_client().post('/translate_batch', json={'texts': [' CAT ', 'DOG'], 'lang': 'hi'})
+
+    assert response.status_code == 200
+    assert response.get_json() == {
+        'translations': [
+            {'text': 'CAT', 'translated_text': 'TAC', 'fallback': False},
+            {'text': 'DOG', 'translated_text': 'GOD', 'fallback': False},
+        ],
+        'dest': 'hi',
+    }
+    assert signbridge.app.test_client().post('/translate_batch', json={'texts': 'CAT'}).status_code == 400
@@ -0,0 +1,287 @@
+import argparse
+import io
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from sklearn.model_selection import StratifiedKFold
+from sklearn.preprocessing import StandardScaler
+
+from classifier_engine import (ARTIFACT_FILE, ARTIFACT_VERSION, ENGINE_FILE, META_FILE, MODEL_FILE, FusedEngine,
+                               engine_from_model, load_artifact, save_artifact)
+from features import NORMALIZERS, NUM_FEATURES, NUM_LANDMARKS, predict_best
+from landmark_store import load_dataset
+
+# Candidate grid: classifier kind -> (engine backend, list of hyperparameter sets).
+# Every entry is tried with each feature normalization, unscaled and standardized.
+GRID = {
+    'knn': ('kdtree', [{'n_neighbors': k} for k in (1, 3, 5, 7)]),
+    'logreg': ('linear', [{'C': c} for c in (0.1, 1.0, 10.0)]),
+    'mlp': ('mlp', [{'hidden_layer_sizes': h, 'alpha': a}
+                    for h in ((64,), (128,), (64, 64)) for a in (1e-4, 1e-2)]),
+}
+
+LATENCY_SAMPLES = 500
+CHECK_ROWS = 16   # rows stored in the artifact for its load-time self-check
+
+# Per-worker state set by _init_worker (sent once per process, not per task)
+_X = _y = _folds = None
+
+
+def build_estimator(kind, params):
+    if kind == 'knn':
+        from sklearn.neighbors import KNeighborsClassifier
+        return KNeighborsClassifier(**params)
+    if kind == 'logreg':
+        from sklearn.linear_model import LogisticRegression
+        return LogisticRegression(max_iter=1000, **params)
+    if kind == 'mlp':
+        from sklearn.neural_network import MLPClassifier
+        return MLPClassifier(max_iter=500, random_state=42, **params)
+    raise ValueError(f"Unknown classifier kind '{kind}', expected one of {tuple(GRID)}")
+
+
+def candidate_grid(kinds=None, normalizations=tuple(NORMALIZERS)):
+    """Every (kind, backend, params, normalization, scale) combination to cross-validate."""
+    candidates = []
+    for kind, (backend, param_sets) in GRID.items():
+        if kinds and kind not in kinds:
+            continue
+        for params in param_sets:
+            for normalization in normalizations:
+                for scale in (False, True):
+                    candidates.append({'kind': kind, 'backend': backend, 'params': params,
+                                       'normalization': normalization, 'scale': scale})
+    return candidates
+
+
+def candidate_name(candidate):
+    params = ', '.join(f"{k}={v}" for k, v in candidate['params'].items())
+    return (f"{candidate['kind']}({params})"
+            + (f" +{candidate['normalization']}" if candidate['normalization'] != 'none' else "")
+            + (" +scaler" if candidate['scale'] else ""))
+
+
+def fit_candidate(candidate, X, y):
+    """Fit one candidate on raw landmarks; returns (FusedEngine, scaler or None)."""
+    X_fit = NORMALIZERS[candidate['normalization']](X)
+    scaler = StandardScaler().fit(X_fit) if candidate['scale'] else None
+    if scaler is not None:
+        X_fit = scaler.transform(X_fit).astype(np.float32)
+    model = build_estimator(candidate['kind'], candidate['params']).fit(X_fit, y)
+    engine = engine_from_model(model, candidate['backend'])
+    if scaler is None:
+        return FusedEngine(engine, candidate['normalization']), None
+    return FusedEngine.with_scaler(engine, candidate['normalization'], scaler.mean_, scaler.scale_), scaler
+
+
+def artifact_bytes(fused, check_input):
+    buffer = io.BytesIO()
+    save_artifact(fused, buffer, check_input[:CHECK_ROWS])
+    return buffer.getvalue()
+
+
+def _init_worker(X, y, n_folds):
+    global _X, _y, _folds
+    # One BLAS thread per process: the pool already uses every core
+    from threadpoolctl import threadpool_limits
+    threadpool_limits(1)
+    _X, _y = X, y
+    _folds = list(StratifiedKFold(n_splits=n_folds, shuffle=True, random_state=42).split(X, y))
+
+
+def _run_fold(index, candidate, fold):
+    """Train on one fold in a worker process; returns (index, fold, accuracy, fit_s, artifact).
+
+    The artifact is only sent back for fold 0, where the parent measures
+    its size and latency one candidate at a time instead of under contention.
+    """
+    train_idx, test_idx = _folds[fold]
+    start = time.perf_counter()
+    engine, _ = fit_candidate(candidate, _X[train_idx], _y[train_idx])
+    fit_s = time.perf_counter() - start
+
+    proba = engine.predict_proba(_X[test_idx])
+    accuracy = float(np.mean(engine.classes_[np.argmax(proba, axis=1)] == _y[test_idx]))
+    blob = artifact_bytes(engine, _X[test_idx]) if fold == 0 else None
+    return index, fold, accuracy, fit_s, blob
+
+
+def latency_profile(engine, X, n=LATENCY_SAMPLES):
+    """Single-hand predict_best latency in ms, as the app calls it per frame."""
+    samples = X[np.arange(n) % len(X)]
+    for row in samples[:10]:   # warm-up
+        predict_best(engine, row[None, :])
+    latencies = []
+    for row in samples:
+        start = time.perf_counter()
+        predict_best(engine, row[None, :])
+        latencies.append((time.perf_counter() - start) * 1000)
+    return {
+        'p50': round(float(np.percentile(latencies, 50)), 4),
+        'p95': round(float(np.percentile(latencies, 95)), 4),
+        'p99': round(float(np.percentile(latencies, 99)), 4),
+        'mean': round(float(np.mean(latencies)), 4),
+    }
+
+
+def cross_validate(X, y, candidates, n_folds=5, jobs=None):
+    """k-fold CV of every candidate in a process pool; returns one result dict per candidate."""
+    results = [{'name': candidate_name(c), **c, 'fold_accuracy': [None] * n_folds, 'fit_s': 0.0}
+               for c in candidates]
+    blobs = {}
+    jobs = jobs or os.cpu_count() or 1
+    print(f"Cross-validating {len(candidates)} candidates x {n_folds} folds on {jobs} processes...")
+
+    with ProcessPoolExecutor(max_workers=jobs, initializer=_init_worker,
+                             initargs=(X, y, n_folds)) as pool:
+        futures = [pool.submit(_run_fold, i, c, fold)
+                   for i, c in enumerate(candidates) for fold in range(n_folds)]
+        for done, future in enumerate(futures, 1):
+            index, fold, accuracy, fit_s, blob = future.result()
+            results[index]['fold_accuracy'][fold] = round(accuracy, 4)
+            results[index]['fit_s'] += fit_s
+            if blob is not None:
+                blobs[index] = blob
+            if done % n_folds == 0:
+                print(f"  {done}/{len(futures)} fits done")
+
+    # Same split as fold 0 in the workers, for the latency measurements
+    _, test_idx = next(StratifiedKFold(n_splits=n_folds, shuffle=True, random_state=42).split(X, y))
+    for index, result in enumerate(results):
+        engine = load_artifact(io.BytesIO(blobs[index]))
+        result['accuracy'] = round(float(np.mean(result['fold_accuracy'])), 4)
+        result['accuracy_std'] = round(float(np.std(result['fold_accuracy'])), 4)
+        result['fit_s'] = round(result['fit_s'], 2)
+        result['model_bytes'] = len(blobs[index])
+        result['latency_ms'] = latency_profile(engine, X[test_idx])
+    return results
+
+
+def select_best(results, max_latency_ms=None, max_size_mb=None, accuracy_tolerance=0.005):
+    """Most accurate candidate within the budgets; near-ties go to the faster one.
+
+    Candidates within `accuracy_tolerance` of the best CV accuracy count as
+    equally good, and among those the lowest p99 latency (then size) wins.
+    """
+    eligible = [r for r in results
+                if (max_latency_ms is None or r['latency_ms']['p99'] <= max_latency_ms)
+                and (max_size_mb is None or r['model_bytes'] <= max_size_mb * 1024 * 1024)]
+    if not eligible:
+        print("Warning: no candidate fits the latency/size budget, ignoring it.")
+        eligible = results
+    top = max(r['accuracy'] for r in eligible)
+    shortlist = [r for r in eligible if r['accuracy'] >= top - accuracy_tolerance]
+    return min(shortlist, key=lambda r: (r['latency_ms']['p99'], r['model_bytes']))
+
+
+def print_leaderboard(results, best):
+    print(f"\n{'candidate':<44}{'accuracy':>10}{'± std':>8}{'p99 ms':>10}{'size KB':>10}{'fit s':>8}")
+    for r in sorted(results, key=lambda r: -r['accuracy']):
+        marker = ' *' if r is best else ''
+        print(f"{r['name']:<44}{r['accuracy']:>10.4f}{r['accuracy_std']:>8.4f}"
+              f"{r['latency_ms']['p99']:>10.4f}{r['model_bytes'] / 1024:>10.1f}{r['fit_s']:>8.1f}{marker}")
+
+
+def save_best(best, X, y, dataset, n_folds, output_dir='.'):
+    """Refit the winner on all data; write the inference artifact and its metadata sidecar."""
+    print(f"\nRefitting {best['name']} on all {len(X)} samples...")
+    engine, scaler = fit_candidate(best, X, y)
+
+    artifact_path = os.path.join(output_dir, ARTIFACT_FILE)
+    save_artifact(engine, artifact_path, X[:CHECK_ROWS])
+    load_artifact(artifact_path)   # same self-check the app runs at startup
+
+    # Raw-landmark pickles from predict_live.py are an older model the
+    # artifact replaces; drop them rather than leave them next to it
+    for stale in (MODEL_FILE, ENGINE_FILE):
+        stale_path = os.path.join(output_dir, stale)
+        if os.path.exists(stale_path):
+            os.remove(stale_path)
+            print(f"Removed '{stale}' from an earlier training.")
+
+    meta = {
+        'format': 1,
+        'artifact': ARTIFACT_FILE,
+        'artifact_version': ARTIFACT_VERSION,
+        'trained_at': time.strftime('%Y-%m-%dT%H:%M:%S%z'),
+        'model': {
+            'kind': best['kind'],
+            'params': best['params'],
+            'backend': engine.backend,
+            'classes': [str(c) for c in engine.classes_],
+        },
+        'features': {
+            'count': NUM_FEATURES,
+            'dtype': 'float32',
+            'layout': [f"{axis}{i}" for i in range(NUM_LANDMARKS) for axis in 'xyz'],
+            'source': 'MediaPipe hand landmarks, image-normalized x/y and relative z',
+            'normalization': best['normalization'],
+        },
+        # Folded into the artifact's weights (or query transform); recorded for reference
+        'scaler': None if scaler is None else {
+            'type': 'StandardScaler',
+            'mean': [round(float(v), 8) for v in scaler.mean_],
+            'scale': [round(float(v), 8) for v in scaler.scale_],
+        },
+        'training': {'dataset': dataset, 'samples': int(len(X)), 'folds': n_folds},
+        'metrics': {
+            'cv_accuracy': best['accuracy'],
+            'cv_accuracy_std': best['accuracy_std'],
+            'fold_accuracy': best['fold_accuracy'],
+        },
+        # Measured on the fold-0 model; the refit model has the same shape
+        'latency_ms': best['latency_ms'],
+        'model_bytes': os.path.getsize(artifact_path),
+    }
+    with open(os.path.join(output_dir, META_FILE), 'w') as f:
+        json.dump(meta, f, indent=2)
+    print(f"Saved '{ARTIFACT_FILE}' and '{META_FILE}'.")
+    return meta
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Pick the classifier by parallel k-fold cross-validation, accuracy and latency.")
+    parser.add_argument('dataset', nargs='?', help="dataset.lmk or a CSV (default: dataset.lmk, else dataset.csv)")
+    parser.add_argument('--kinds', nargs='+', choices=tuple(GRID), help="classifier kinds to try (default: all)")
+    parser.add_argument('--normalizations', nargs='+', choices=tuple(NORMALIZERS), default=list(NORMALIZERS),
+                        help="feature normalizations to try (default: all)")
+    parser.add_argument('--folds', type=int, default=5)
+    parser.add_argument('--jobs', type=int, help="worker processes (default: all cores)")
+    parser.add_argument('--max-latency-ms', type=float, help="p99 single-hand latency budget")
+    parser.add_argument('--max-size-mb', type=float, help="model artifact size budget")
+    parser.add_argument('--accuracy-tolerance', type=float, default=0.005,
+                        help="accuracy gap treated as a tie, broken by latency")
+    parser.add_argument('--output', help="write the full JSON leaderboard to this file")
+    parser.add_argument('--dry-run', action='store_true', help="report only, do not overwrite the model artifact")
+    args = parser.parse_args()
+
+    print("Loading dataset...")
+    try:
+        X, y = load_dataset(args.dataset)
+    except (FileNotFoundError, ValueError) as e:
+        print(f"Error: {e}")
+        return
+    X = np.ascontiguousarray(X, dtype=np.float32)
+    y = np.asarray(y)
+
+    start = time.perf_counter()
+    results = cross_validate(X, y, candidate_grid(args.kinds, args.normalizations), args.folds, args.jobs)
+    print(f"Cross-validation took {time.perf_counter() - start:.1f} s.")
+
+    best = select_best(results, args.max_latency_ms, args.max_size_mb, args.accuracy_tolerance)
+    print_leaderboard(results, best)
+
+    if args.output:
+        with open(args.output, 'w') as f:
+            json.dump({'best': best['name'], 'results': results}, f, indent=2)
+        print(f"\nLeaderboard saved to '{args.output}'.")
+
+    if not args.dry_run:
+        save_best(best, X, y, args.dataset or 'default', args.folds)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,448 @@
+import os
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+
+import requests
+from requests.adapters import HTTPAdapter
+from urllib.parse import quote, urlparse
+
+from metrics import TRANSLATION_UPSTREAM_SECONDS
+
+# Upstream endpoint (override to point tests at a local stub server)
+TRANSLATE_URL = os.environ.get('SIGNBRIDGE_TRANSLATE_URL',
+                               'https://translate.googleapis.com/translate_a/single')
+UPSTREAM_TIMEOUT = float(os.environ.get('SIGNBRIDGE_TRANSLATE_TIMEOUT', 3.0))
+
+# Upstream protection: at most this many calls per host at once, and a
+# circuit breaker that stops calling a provider that keeps failing or is slow.
+MAX_PER_HOST = int(os.environ.get('SIGNBRIDGE_TRANSLATE_MAX_PER_HOST', 4))
+SLOT_WAIT = 0.5          # seconds to wait for a free per-host slot
+SLOW_CALL = 1.5          # seconds; slower successful calls count as failures
+BREAKER_THRESHOLD = 3    # consecutive failures before the circuit opens
+BREAKER_COOLDOWN = 30.0  # seconds the circuit stays open before a trial call
+
+# Add User-Agent to avoid being blocked/throttled by Google
+HEADERS = {
+    'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/91.0.4472.124 Safari/537.36'
+}
+
+# Batches are packed into one query joined by newlines, kept under a safe URL length
+BATCH_SEPARATOR = '\n'
+MAX_BATCH_QUERY_CHARS = 4000   # URL-encoded characters per upstream call
+
+CACHE_SIZE = int(os.environ.get('SIGNBRIDGE_TRANSLATION_CACHE_SIZE', 1024))
+CACHE_TTL = float(os.environ.get('SIGNBRIDGE_TRANSLATION_CACHE_TTL', 7 * 24 * 3600))
+CACHE_PATH = os.environ.get(
+    'SIGNBRIDGE_TRANSLATION_CACHE_PATH',
+    os.path.join(os.path.abspath(os.path.dirname(__file__)), 'translation_cache.sqlite3'))
+
+
+class TranslationError(Exception):
+    """The upstream translation service failed or returned something unusable."""
+
+
+class TranslationUnavailable(TranslationError):
+    """The upstream was not called: circuit open or too many calls in flight."""
+
+
+class CircuitBreaker:
+    """Opens after repeated failures so a dead or slow provider fails fast."""
+
+    def __init__(self, threshold=BREAKER_THRESHOLD, cooldown=BREAKER_COOLDOWN):
+        self.threshold = threshold
+        self.cooldown = cooldown
+        self.failures = 0
+        self.opened_at = None
+        self.trial_in_flight = False
+        self.times_opened = 0
+        self._lock = threading.Lock()
+
+    @property
+    def state(self):
+        if self.opened_at is None:
+            return 'closed'
+        if time.time() - self.opened_at < self.cooldown:
+            return 'open'
+        return 'half-open'
+
+    def allow(self):
+        with self._lock:
+            state = self.state
+            if state == 'closed':
+                return True
+            if state == 'half-open' and not self.trial_in_flight:
+                # Let a single trial call through to probe the provider
+                self.trial_in_flight = True
+                return True
+            return False
+
+    def record_success(self):
+        with self._lock:
+            self.failures = 0
+            self.opened_at = None
+            self.trial_in_flight = False
+
+    def release_trial(self):
+        """Give up a half-open trial that never reached the provider."""
+        with self._lock:
+            self.trial_in_flight = False
+
+    def record_failure(self):
+        with self._lock:
+            self.failures += 1
+            self.trial_in_flight = False
+            if self.failures >= self.threshold or self.opened_at is not None:
+                if self.state != 'open':
+                    self.times_opened += 1
+                self.opened_at = time.time()
+
+
+class UpstreamClient:
+    """Shared keep-alive HTTP client with a per-host concurrency cap and circuit breaker."""
+
+    def __init__(self, timeout=UPSTREAM_TIMEOUT, max_per_host=MAX_PER_HOST, slot_wait=SLOT_WAIT,
+                 slow_call=SLOW_CALL, breaker=None):
+        self.timeout = timeout
+        self.max_per_host = max_per_host
+        self.slot_wait = slot_wait
+        self.slow_call = slow_call
+        self.breaker = breaker or CircuitBreaker()
+        self.session = requests.Session()
+        self.session.headers.update(HEADERS)
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=max_per_host)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        self.stats = {'calls': 0, 'failures': 0, 'slow_calls': 0, 'rejected_busy': 0, 'rejected_open': 0}
+        self._slots = {}
+        self._lock = threading.Lock()
+
+    def _slot(self, url):
+        host = urlparse(url).netloc
+        with self._lock:
+            if host not in self._slots:
+                self._slots[host] = threading.BoundedSemaphore(self.max_per_host)
+            return self._slots[host]
+
+    def get_json(self, url, params):
+        if not self.breaker.allow():
+            self.stats['rejected_open'] += 1
+            raise TranslationUnavailable("Translation service unavailable (circuit open)")
+
+        slot = self._slot(url)
+        if not slot.acquire(timeout=self.slot_wait):
+            self.stats['rejected_busy'] += 1
+            # Busy is not the provider's fault; release a half-open trial
+            self.breaker.release_trial()
+            raise TranslationUnavailable("Too many translation requests in flight")
+
+        start = time.perf_counter()
+        try:
+            self.stats['calls'] += 1
+            response = self.session.get(url, params=params, timeout=self.timeout)
+        except requests.RequestException as e:
+            TRANSLATION_UPSTREAM_SECONDS.labels('network_error').observe(time.perf_counter() - start)
+            self._record_failure()
+            raise TranslationError(str(e)) from e
+        finally:
+            slot.release()
+
+        elapsed = time.perf_counter() - start
+        TRANSLATION_UPSTREAM_SECONDS.labels('ok' if response.status_code == 200 else 'http_error').observe(elapsed)
+        print(f"DEBUG: Translation API URL: {response.url}")
+        if response.status_code != 200:
+            # Throttling and server errors are the provider's problem; other
+            # 4xx responses mean it is up but disliked this request.
+            if response.status_code == 429 or response.status_code >= 500:
+                self._record_failure()
+            else:
+                self.breaker.record_success()
+            raise TranslationError(f"Translation API returned {response.status_code}: {response.text[:200]}")
+
+        if elapsed > self.slow_call:
+            # Answered, but too slowly to keep sending users' requests there
+            self.stats['slow_calls'] += 1
+            self.breaker.record_failure()
+        else:
+            self.breaker.record_success()
+
+        try:
+            return response.json()
+        except ValueError as e:
+            raise TranslationError(f"Invalid translation response: {e}") from e
+
+    def _record_failure(self):
+        self.stats['failures'] += 1
+        self.breaker.record_failure()
+
+    def get_stats(self):
+        stats = dict(self.stats)
+        stats['circuit'] = self.breaker.state
+        stats['circuit_opened'] = self.breaker.times_opened
+        return stats
+
+
+# Shared pooled client for every translation route
+client = UpstreamClient()
+
+
+def fetch_translation(text, source_lang, target_lang):
+    """Call the Google Translate endpoint once (through the pooled client).
+
+    Returns (translated_text, detected_source); detected_source is None
+    when the response does not include it.
+    """
+    # dt=t means "translate", sl/tl are the source/target languages, q is the text
+    params = {
+        'client': 'gtx',
+        'sl': source_lang,
+        'tl': target_lang,
+        'dt': 't',
+        'q': text
+    }
+    # Response format: [[["translated_text", "source_text", null, null, 1]], null, "en", ...]
+    result = client.get_json(TRANSLATE_URL, params)
+    if not (result and isinstance(result, list) and len(result) > 0):
+        raise TranslationError("Unexpected translation response")
+
+    translated_text = ""
+    # Sometimes it splits into multiple sentences
+    for sentence in result[0] or []:
+        if sentence and isinstance(sentence, list) and len(sentence) > 0:
+            translated_text += sentence[0]
+    detected_source = result[2] if len(result) > 2 else None
+    return translated_text, detected_source
+
+
+class TranslationCache:
+    """LRU + TTL cache in front of fetch_translation.
+
+    Entries are also written to a small SQLite file so they survive
+    restarts, and concurrent requests for the same key share a single
+    upstream call.
+    """
+
+    def __init__(self, fetch=fetch_translation, max_entries=CACHE_SIZE, ttl=CACHE_TTL, path=CACHE_PATH):
+        self.fetch = fetch
+        self.max_entries = max_entries
+        self.ttl = ttl
+        self.path = path
+        self.stats = {'hits': 0, 'disk_hits': 0, 'misses': 0, 'coalesced': 0,
+                      'upstream_calls': 0, 'errors': 0, 'batch_calls': 0}
+        self._entries = OrderedDict()   # key -> (created, value)
+        self._in_flight = {}            # key -> (Event, result holder)
+        self._lock = threading.Lock()
+        self._db = None
+        if path:
+            try:
+                self._db = sqlite3.connect(path, check_same_thread=False)
+                self._db.execute(
+                    "CREATE TABLE IF NOT EXISTS translations ("
+                    "text TEXT, source TEXT, target TEXT, translated TEXT, detected TEXT, created REAL, "
+                    "PRIMARY KEY (text, source, target))")
+                self._db.commit()
+            except sqlite3.Error as e:
+                print(f"Warning: Translation cache store unavailable: {e}")
+                self._db = None
+
+    # --- Storage ---
+    def _get_memory(self, key, now):
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        created, value = entry
+        if now - created > self.ttl:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return value
+
+    def _put_memory(self, key, value, created):
+        self._entries[key] = (created, value)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def _get_disk(self, key, now):
+        if self._db is None:
+            return None
+        row = self._db.execute(
+            "SELECT translated, detected, created FROM translations WHERE text=? AND source=? AND target=?",
+            key).fetchone()
+        if row is None or now - row[2] > self.ttl:
+            return None
+        return (row[0], row[1]), row[2]
+
+    def _put_disk(self, key, value, created):
+        if self._db is None:
+            return
+        try:
+            self._db.execute("INSERT OR REPLACE INTO translations VALUES (?, ?, ?, ?, ?, ?)",
+                             (*key, value[0], value[1], created))
+            self._db.commit()
+        except sqlite3.Error as e:
+            print(f"Warning: Could not persist translation: {e}")
+
+    # --- Lookup ---
+    def lookup(self, text, source_lang, target_lang):
+        """Return a cached (translated_text, detected_source) or None, without going upstream."""
+        key = (text, source_lang, target_lang)
+        now = time.time()
+        with self._lock:
+            value = self._get_memory(key, now)
+            if value is not None:
+                self.stats['hits'] += 1
+                return value
+            disk = self._get_disk(key, now)
+            if disk is not None:
+                value, created = disk
+                self._put_memory(key, value, created)
+                self.stats['disk_hits'] += 1
+                return value
+        return None
+
+    def store(self, text, source_lang, target_lang, value):
+        key = (text, source_lang, target_lang)
+        created = time.time()
+        with self._lock:
+            self._put_memory(key, value, created)
+            self._put_disk(key, value, created)
+
+    def translate(self, text, source_lang, target_lang):
+        """Return (translated_text, detected_source), going upstream at most once per key."""
+        value = self.lookup(text, source_lang, target_lang)
+        if value is not None:
+            return value
+
+        key = (text, source_lang, target_lang)
+        with self._lock:
+            # Another request may have filled the entry since our lookup
+            value = self._get_memory(key, time.time())
+            if value is not None:
+                self.stats['hits'] += 1
+                return value
+
+            waiter = self._in_flight.get(key)
+            if waiter is None:
+                # We are the leader for this key; others wait on our result
+                waiter = self._in_flight[key] = (threading.Event(), {})
+                leader = True
+                self.stats['misses'] += 1
+                self.stats['upstream_calls'] += 1
+            else:
+                leader = False
+                self.stats['coalesced'] += 1
+
+        event, holder = waiter
+        if not leader:
+            event.wait()
+            if 'error' in holder:
+                raise holder['error']
+            return holder['value']
+
+        try:
+            value = self.fetch(text, source_lang, target_lang)
+            self.store(text, source_lang, target_lang, value)
+            holder['value'] = value
+            return value
+        except Exception as e:
+            with self._lock:
+                self.stats['errors'] += 1
+            holder['error'] = e if isinstance(e, TranslationError) else TranslationError(str(e))
+            raise holder['error']
+        finally:
+            with self._lock:
+                self._in_flight.pop(key, None)
+            event.set()
+
+    def get_stats(self):
+        with self._lock:
+            stats = dict(self.stats)
+            stats['size'] = len(self._entries)
+        lookups = stats['hits'] + stats['disk_hits'] + stats['misses'] + stats['coalesced']
+        stats['hit_rate'] = round((lookups - stats['misses']) / lookups, 4) if lookups else 0.0
+        stats['upstream'] = client.get_stats()
+        return stats
+
+
+# Shared cache used by the Flask routes
+cache = TranslationCache()
+
+
+def translate(text, source_lang, target_lang):
+    """Translate through the shared cache. Raises TranslationError on failure."""
+    return cache.translate(text, source_lang, target_lang)
+
+
+def _pack(texts, max_chars=MAX_BATCH_QUERY_CHARS):
+    """Group texts into chunks whose joined, URL-encoded query stays under max_chars."""
+    chunks, current, size = [], [], 0
+    separator_size = len(quote(BATCH_SEPARATOR))
+    for text in texts:
+        text_size = len(quote(text))
+        if current and size + separator_size + text_size > max_chars:
+            chunks.append(current)
+            current, size = [], 0
+        size += text_size + (separator_size if current else 0)
+        current.append(text)
+    if current:
+        chunks.append(current)
+    return chunks
+
+
+def translate_batch(texts, source_lang, target_lang):
+    """Translate many short strings, in order, with as few upstream calls as possible.
+
+    Cached strings are answered locally; the rest are joined with newlines
+    into as few queries as fit and split back apart. Returns a list of
+    (translated_text, ok) pairs; failed items carry the original text.
+    """
+    results = {}
+    singles, packable = [], []
+    for text in dict.fromkeys(texts):
+        if not text:
+            results[text] = ('', True)
+            continue
+        value = cache.lookup(text, source_lang, target_lang)
+        if value is not None:
+            results[text] = (value[0], True)
+        elif BATCH_SEPARATOR in text:
+            # Would be split apart with the rest of the batch; send it on its own
+            singles.append(text)
+        else:
+            packable.append(text)
+
+    for chunk in [[text] for text in singles] + _pack(packable):
+        if len(chunk) == 1:
+            try:
+                results[chunk[0]] = (cache.translate(chunk[0], source_lang, target_lang)[0], True)
+            except TranslationError:
+                results[chunk[0]] = (chunk[0], False)
+            continue
+
+        with cache._lock:
+            cache.stats['batch_calls'] += 1
+        try:
+            translated, detected = fetch_translation(BATCH_SEPARATOR.join(chunk), source_lang, target_lang)
+        except TranslationError:
+            for text in chunk:
+                results[text] = (text, False)
+            continue
+
+        parts = translated.split(BATCH_SEPARATOR)
+        if len(parts) != len(chunk):
+            # The provider merged or split lines; translate this chunk one by one
+            for text in chunk:
+                try:
+                    results[text] = (cache.translate(text, source_lang, target_lang)[0], True)
+                except TranslationError:
+                    results[text] = (text, False)
+            continue
+
+        for text, part in zip(chunk, parts):
+            part = part.strip()
+            cache.store(text, source_lang, target_lang, (part, detected))
+            results[text] = (part, True)
+
+    return [results[text] for text in texts]
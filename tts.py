@@ -0,0 +1,245 @@
+import hashlib
+import os
+import struct
+import threading
+import wave
+from collections import OrderedDict
+
+TTS_CACHE_MAX_BYTES = int(os.environ.get('SIGNBRIDGE_TTS_CACHE_MB', 64)) * 1024 * 1024
+TTS_QUEUE_SIZE = 4   # pending utterances; older ones are dropped when speech falls behind
+
+
+def audio_format(path):
+    """'wav' or 'aiff' from the file header, else None.
+
+    pyttsx3 writes whatever its driver produces: macOS (nsss) writes AIFF
+    whatever the file extension says.
+    """
+    with open(path, 'rb') as f:
+        header = f.read(12)
+    if header[:4] == b'RIFF' and header[8:12] == b'WAVE':
+        return 'wav'
+    if header[:4] == b'FORM' and header[8:12] in (b'AIFF', b'AIFC'):
+        return 'aiff'
+    return None
+
+
+MIMETYPES = {'wav': 'audio/wav', 'aiff': 'audio/aiff'}
+
+
+def _extended_to_float(data):
+    """80-bit IEEE extended float (AIFF sample rate) -> float."""
+    exponent = ((data[0] & 0x7F) << 8) | data[1]
+    mantissa = int.from_bytes(data[2:10], 'big')
+    if exponent == 0 and mantissa == 0:
+        return 0.0
+    return (-1 if data[0] & 0x80 else 1) * mantissa * 2.0 ** (exponent - 16383 - 63)
+
+
+def aiff_to_wav(src, dst):
+    """Rewrite an uncompressed AIFF/AIFC file as WAV (raises ValueError for compressed audio)."""
+    import numpy as np
+
+    with open(src, 'rb') as f:
+        data = f.read()
+    comm = sound = None
+    pos = 12
+    while pos + 8 <= len(data):
+        chunk_id, size = data[pos:pos + 4], struct.unpack('>I', data[pos + 4:pos + 8])[0]
+        body = data[pos + 8:pos + 8 + size]
+        if chunk_id == b'COMM':
+            comm = body
+        elif chunk_id == b'SSND':
+            offset = struct.unpack('>I', body[:4])[0]
+            sound = body[8 + offset:]
+        pos += 8 + size + (size & 1)
+    if comm is None or sound is None:
+        raise ValueError(f"{src}: no COMM/SSND chunk")
+
+    channels, frames, bits = struct.unpack('>hIh', comm[:8])
+    rate = _extended_to_float(comm[8:18])
+    compression = comm[18:22] if data[8:12] == b'AIFC' else b'NONE'
+    if compression not in (b'NONE', b'twos', b'sowt'):
+        raise ValueError(f"{src}: unsupported AIFF compression {compression!r}")
+
+    width = (bits + 7) // 8
+    samples = np.frombuffer(sound[:frames * channels * width], dtype=np.uint8).reshape(-1, width)
+    if compression != b'sowt':
+        samples = samples[:, ::-1]   # big-endian -> little-endian
+    if width == 1:
+        samples = samples ^ 0x80   # WAV 8-bit audio is unsigned
+    with wave.open(dst, 'wb') as out:
+        out.setnchannels(channels)
+        out.setsampwidth(width)
+        out.setframerate(int(round(rate)))
+        out.writeframes(np.ascontiguousarray(samples).tobytes())
+
+
+def _default_engine():
+    import pyttsx3
+    return pyttsx3.init()
+
+
+class SpeechCache:
+    """Directory of synthesized WAV files named by text hash, evicted least-recently-used by total size."""
+
+    def __init__(self, folder, max_bytes=TTS_CACHE_MAX_BYTES):
+        self.folder = folder
+        self.max_bytes = max_bytes
+        self._files = OrderedDict()   # filename -> size, oldest first
+        self._bytes = 0
+        self._lock = threading.Lock()
+        os.makedirs(folder, exist_ok=True)
+
+        # Pick up files from a previous run, oldest first
+        entries = []
+        for f in os.listdir(folder):
+            if f.endswith('.wav'):
+                stat = os.stat(os.path.join(folder, f))
+                entries.append((stat.st_mtime, f, stat.st_size))
+        for _, f, size in sorted(entries):
+            self._files[f] = size
+            self._bytes += size
+
+    @staticmethod
+    def filename_for(text):
+        return hashlib.sha1(text.encode('utf-8')).hexdigest()[:20] + '.wav'
+
+    def path(self, filename):
+        return os.path.join(self.folder, filename)
+
+    def get(self, text):
+        """Return the cached filename for `text`, or None."""
+        filename = self.filename_for(text)
+        with self._lock:
+            if filename not in self._files:
+                return None
+            self._files.move_to_end(filename)
+        return filename
+
+    def add(self, filename):
+        size = os.path.getsize(self.path(filename))
+        with self._lock:
+            self._bytes += size - self._files.get(filename, 0)
+            self._files[filename] = size
+            self._files.move_to_end(filename)
+            evicted = []
+            # Keep the newest file even if it alone exceeds the budget
+            while self._bytes > self.max_bytes and len(self._files) > 1:
+                f, old_size = self._files.popitem(last=False)
+                self._bytes -= old_size
+                evicted.append(f)
+        for f in evicted:
+            try:
+                os.remove(self.path(f))
+            except OSError:
+                pass
+
+    def get_stats(self):
+        with self._lock:
+            return {'files': len(self._files), 'bytes': self._bytes, 'max_bytes': self.max_bytes}
+
+
+class SpeechWorker:
+    """Synthesizes speech to WAV on its own thread so callers never wait on the TTS engine.
+
+    speak(text, on_ready) returns immediately; on_ready(text, filename) is
+    called once the audio file exists - straight away for cached text.
+    pyttsx3 engines are not thread-safe, so the engine is created and used
+    only on the worker thread.
+    """
+
+    def __init__(self, cache, engine_factory=_default_engine, queue_size=TTS_QUEUE_SIZE):
+        self.cache = cache
+        self.engine_factory = engine_factory
+        self.queue_size = queue_size
+        self.available = True
+        # Queued texts in arrival order -> callbacks waiting for that audio
+        self._pending = OrderedDict()
+        self._cond = threading.Condition()
+        self._stopped = False
+        self.stats = {'requests': 0, 'cache_hits': 0, 'synthesized': 0, 'dropped': 0, 'errors': 0}
+        self._thread = threading.Thread(target=self._run, name='tts-worker', daemon=True)
+        self._thread.start()
+
+    def speak(self, text, on_ready=None):
+        """Queue `text` for synthesis; returns the cached filename if it is already available."""
+        text = ' '.join(text.split())
+        if not text or not self.available:
+            return None
+        self.stats['requests'] += 1
+
+        filename = self.cache.get(text)
+        if filename is not None:
+            self.stats['cache_hits'] += 1
+            if on_ready:
+                on_ready(text, filename)
+            return filename
+
+        with self._cond:
+            waiting = self._pending.setdefault(text, [])
+            if on_ready:
+                waiting.append(on_ready)
+            # A stale sentence is not worth speaking once newer ones are waiting
+            while len(self._pending) > self.queue_size:
+                self._pending.popitem(last=False)
+                self.stats['dropped'] += 1
+            self._cond.notify()
+        return None
+
+    def _run(self):
+        try:
+            engine = self.engine_factory()
+        except Exception as e:
+            print(f"Warning: Could not initialize TTS engine: {e}")
+            self.available = False
+            return
+
+        while True:
+            with self._cond:
+                while not self._pending and not self._stopped:
+                    self._cond.wait()
+                if self._stopped:
+                    return
+                text, callbacks = self._pending.popitem(last=False)
+
+            filename = self.cache.filename_for(text)
+            path = self.cache.path(filename)
+            tmp_path = path + '.part'
+            print(f"Speaking: {text}")
+            try:
+                engine.save_to_file(text, tmp_path)
+                engine.runAndWait()
+                if audio_format(tmp_path) == 'aiff':
+                    self._convert_aiff(tmp_path)
+                os.replace(tmp_path, path)
+                self.cache.add(filename)
+                self.stats['synthesized'] += 1
+            except Exception as e:
+                print(f"TTS Error: {e}")
+                self.stats['errors'] += 1
+                continue
+
+            for callback in callbacks:
+                try:
+                    callback(text, filename)
+                except Exception as e:
+                    print(f"TTS callback error: {e}")
+
+    @staticmethod
+    def _convert_aiff(path):
+        """Make the cached file the WAV it is named as; keep the AIFF if it cannot be converted."""
+        try:
+            aiff_to_wav(path, path + '.wav')
+            os.replace(path + '.wav', path)
+        except (ValueError, struct.error, wave.Error) as e:
+            print(f"TTS: keeping AIFF audio ({e})")
+
+    def stop(self):
+        with self._cond:
+            self._stopped = True
+            self._cond.notify_all()
+
+    def get_stats(self):
+        return {**self.stats, 'available': self.available, 'queued': len(self._pending),
+                'cache': self.cache.get_stats()}